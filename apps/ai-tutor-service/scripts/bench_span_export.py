@@ -0,0 +1,95 @@
+"""Measure the per-request cost of span export on the request path.
+
+Simulates requests that each produce a small trace (one root span with nested
+children, roughly what one solve emits) against an exporter that takes
+``--export-ms`` per export call, like a remote collector. Compares the previous
+synchronous export with the batched, background export from ``app.core.tracing``.
+
+Usage:
+    uv run python scripts/bench_span_export.py [--requests 200] [--spans 12] [--export-ms 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from collections.abc import Sequence
+
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor, SpanExporter, SpanExportResult
+
+from app.core.settings import Settings
+from app.core.tracing import ErrorKeepingSampler, build_span_processor
+
+
+class SlowExporter(SpanExporter):
+    def __init__(self, export_ms: float) -> None:
+        self.export_ms = export_ms
+        self.exported = 0
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        time.sleep(self.export_ms / 1000)
+        self.exported += len(spans)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def _settings(sample_ratio: float) -> Settings:
+    # Only the tracing fields are read; skip validation of the unrelated required ones.
+    return Settings.model_construct(otel_trace_sample_ratio=sample_ratio)
+
+
+def run(label: str, processor: SpanProcessor, sample_ratio: float, args: argparse.Namespace):
+    provider = TracerProvider(sampler=ErrorKeepingSampler(sample_ratio), shutdown_on_exit=False)
+    provider.add_span_processor(processor)
+    tracer = provider.get_tracer(__name__)
+
+    durations: list[float] = []
+    for _ in range(args.requests):
+        started = time.perf_counter()
+        with tracer.start_as_current_span("request"):
+            for _ in range(args.spans - 1):
+                with tracer.start_as_current_span("step"):
+                    pass
+        durations.append((time.perf_counter() - started) * 1000)
+
+    provider.shutdown()
+    durations.sort()
+    p99 = durations[max(round(0.99 * len(durations)) - 1, 0)]
+    print(
+        f"{label:<34} mean={statistics.fmean(durations):8.3f}ms "
+        f"p50={statistics.median(durations):8.3f}ms p99={p99:8.3f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--spans", type=int, default=12, help="Spans per request")
+    parser.add_argument("--export-ms", type=float, default=5.0, help="Latency of one export")
+    args = parser.parse_args()
+
+    print(
+        f"{args.requests} requests x {args.spans} spans, exporter latency {args.export_ms}ms "
+        "(per-request overhead of tracing):"
+    )
+    run(
+        "before: synchronous export",
+        SimpleSpanProcessor(SlowExporter(args.export_ms)),
+        1.0,
+        args,
+    )
+    for ratio in (1.0, 0.1):
+        run(
+            f"after: batched, sample ratio {ratio}",
+            build_span_processor(SlowExporter(args.export_ms), _settings(ratio)),
+            ratio,
+            args,
+        )
+
+
+if __name__ == "__main__":
+    main()
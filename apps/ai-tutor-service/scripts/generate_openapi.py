@@ -15,11 +15,13 @@ from pathlib import Path
 from fastapi import FastAPI
 
 from app.api.routes.physics import router as physics_router
+from app.api.routes.programs import router as programs_router
 
 
 def build_spec() -> dict:
     app = FastAPI(title="AI Tutor Service", version="0.1.0")
     app.include_router(physics_router, prefix="/api/v1")
+    app.include_router(programs_router, prefix="/api/v1")
 
     spec = app.openapi()
     spec["servers"] = [
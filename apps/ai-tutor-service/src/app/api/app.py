@@ -1,13 +1,56 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator, Callable
+
+from fastapi import FastAPI
+
+from app.api.routes.health import router as health_router
+from app.api.routes.metrics import router as metrics_router
 from app.api.routes.physics import router as physics_router
+from app.api.routes.programs import router as programs_router
 from app.api.state import AppState, TutorApp
+from app.application.ports.program_port import ProgramPort
 from app.application.services.physics_service import PhysicsService
 from app.core.settings import Settings
+from app.core.warmup import Readiness, WarmupReport
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    state: AppState = app.state
+    # Warm up in the background: /health answers meanwhile and /ready turns 200 after.
+    task = (
+        asyncio.create_task(state.readiness.warm_up(state.warmup))
+        if state.warmup is not None
+        else None
+    )
+    try:
+        yield
+    finally:
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
 
 
-def create_app(physics_service: PhysicsService, settings: Settings) -> TutorApp:
-    app = TutorApp(title="AI Tutor Service", version="0.1.0")
-    app.state = AppState(physics_service=physics_service, settings=settings)
+def create_app(
+    physics_service: PhysicsService,
+    settings: Settings,
+    program_manager: ProgramPort | None = None,
+    warmup: Callable[[], WarmupReport] | None = None,
+) -> TutorApp:
+    app = TutorApp(title="AI Tutor Service", version="0.1.0", lifespan=_lifespan)
+    app.state = AppState(
+        physics_service=physics_service,
+        settings=settings,
+        program_manager=program_manager,
+        warmup=warmup,
+        readiness=Readiness(status="starting" if warmup is not None else "ready"),
+    )
     app.include_router(physics_router, prefix="/api/v1")
+    app.include_router(programs_router, prefix="/api/v1")
+    app.include_router(health_router)
+    app.include_router(metrics_router)
     return app
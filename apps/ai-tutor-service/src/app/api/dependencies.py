@@ -7,6 +7,7 @@ from fastapi import Depends, HTTPException, Request, Security
 from fastapi.security import APIKeyHeader
 
 from app.api.state import AppState
+from app.application.ports.program_port import ProgramPort
 from app.application.services.physics_service import PhysicsService
 
 _api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
@@ -22,6 +23,14 @@ def get_physics_service(
     return state.physics_service
 
 
+def get_program_manager(
+    state: Annotated[AppState, Depends(get_app_state)],
+) -> ProgramPort:
+    if state.program_manager is None:
+        raise HTTPException(status_code=404, detail="Program management is not enabled")
+    return state.program_manager
+
+
 def verify_api_key(
     state: Annotated[AppState, Depends(get_app_state)],
     api_key: str | None = Security(_api_key_header),
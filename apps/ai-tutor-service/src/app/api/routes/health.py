@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+
+from app.api.dependencies import get_app_state
+from app.api.state import AppState
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/health")
+async def health() -> dict[str, str]:
+    """Liveness: the process is up and serving; does no work."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready(state: Annotated[AppState, Depends(get_app_state)]) -> JSONResponse:
+    """Readiness: 200 once the startup warm-up finished and its self-test passed."""
+    readiness = state.readiness
+    body: dict[str, Any] = {"status": readiness.status}
+    if readiness.report is not None:
+        body["warmup"] = asdict(readiness.report)
+    if readiness.error is not None:
+        body["error"] = readiness.error
+    return JSONResponse(body, status_code=200 if readiness.ready else 503)
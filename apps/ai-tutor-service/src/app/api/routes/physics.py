@@ -2,18 +2,69 @@ from __future__ import annotations
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from opentelemetry import trace
 
-from app.api.dependencies import get_physics_service, verify_api_key
+from app.api.cancellation import ClientDisconnected, cancel_on_disconnect
+from app.api.dependencies import get_app_state, get_physics_service, verify_api_key
+from app.api.state import AppState
 from app.application.services.physics_service import PhysicsService
+from app.core.deadline import DeadlineExceeded
+from app.core.observability_contract import AttrKey
+from app.core.run_metrics import RunMetrics, collect_run_metrics, set_usage_attributes
 from app.domain.models.physics import PhysicsQuestion, PhysicsSolution
 
 router = APIRouter(prefix="/physics", tags=["physics"], dependencies=[Depends(verify_api_key)])
 
+# Non-standard (nginx) status for "client closed request"; nobody reads it.
+CLIENT_CLOSED_REQUEST = 499
 
-@router.post("/solve", response_model=PhysicsSolution)
+
+def usage_headers(metrics: RunMetrics) -> dict[str, str]:
+    headers = {
+        "X-Usage-LM-Calls": str(metrics.lm_calls),
+        "X-Usage-Prompt-Tokens": str(metrics.prompt_tokens),
+        "X-Usage-Completion-Tokens": str(metrics.completion_tokens),
+        "X-Usage-Cached-Tokens": str(metrics.cached_tokens),
+    }
+    if metrics.estimated_cost_usd is not None:
+        headers["X-Usage-Cost-USD"] = f"{metrics.estimated_cost_usd:.6f}"
+    return headers
+
+
+@router.post(
+    "/solve",
+    response_model=PhysicsSolution,
+    responses={504: {"description": "The solve deadline was exceeded"}},
+)
 async def solve_physics(
     question: PhysicsQuestion,
+    request: Request,
+    response: Response,
     service: Annotated[PhysicsService, Depends(get_physics_service)],
-) -> PhysicsSolution:
-    return await service.solve_once(question)
+    state: Annotated[AppState, Depends(get_app_state)],
+    deadline_ms: Annotated[int | None, Header(alias="X-Request-Deadline-Ms", gt=0)] = None,
+) -> PhysicsSolution | Response:
+    settings = state.settings
+    timeout_ms = min(deadline_ms or settings.solve_deadline_ms, settings.solve_max_deadline_ms)
+    span = trace.get_current_span()
+
+    def headers() -> dict[str, str] | None:
+        # Failed solves paid for their LM calls too, so their responses carry usage.
+        return usage_headers(metrics) if settings.usage_response_headers else None
+
+    with collect_run_metrics() as metrics:
+        try:
+            solution = await cancel_on_disconnect(
+                request, service.solve_once(question, timeout_s=timeout_ms / 1000)
+            )
+        except DeadlineExceeded as exc:
+            span.set_attribute(AttrKey.ERROR_TYPE, type(exc).__name__)
+            raise HTTPException(status_code=504, detail=str(exc), headers=headers()) from exc
+        except ClientDisconnected:
+            span.set_attribute(AttrKey.ERROR_TYPE, "ClientDisconnected")
+            return Response(status_code=CLIENT_CLOSED_REQUEST, headers=headers())
+        finally:
+            set_usage_attributes(span, metrics)
+        response.headers.update(headers() or {})
+        return solution
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.api.dependencies import get_program_manager, verify_api_key
+from app.application.ports.program_port import ProgramPort
+from app.domain.models.program import ProgramVersion
+
+router = APIRouter(prefix="/programs", tags=["programs"], dependencies=[Depends(verify_api_key)])
+
+
+@router.get("", response_model=list[ProgramVersion])
+async def list_programs(
+    manager: Annotated[ProgramPort, Depends(get_program_manager)],
+) -> list[ProgramVersion]:
+    return manager.list_versions()
+
+
+@router.post("/{version}/activate", response_model=ProgramVersion)
+async def activate_program(
+    version: str,
+    manager: Annotated[ProgramPort, Depends(get_program_manager)],
+) -> ProgramVersion:
+    try:
+        return manager.activate(version)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc.args[0])) from exc
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc.args[0])) from exc
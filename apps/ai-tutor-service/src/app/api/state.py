@@ -1,17 +1,24 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Callable
+from dataclasses import dataclass, field
 
 from fastapi import FastAPI
 
+from app.application.ports.program_port import ProgramPort
 from app.application.services.physics_service import PhysicsService
 from app.core.settings import Settings
+from app.core.warmup import Readiness, WarmupReport
 
 
 @dataclass
 class AppState:
     physics_service: PhysicsService
     settings: Settings
+    program_manager: ProgramPort | None = None
+    # Run at startup before the service reports ready; None means ready right away.
+    warmup: Callable[[], WarmupReport] | None = None
+    readiness: Readiness = field(default_factory=Readiness)
 
 
 class TutorApp(FastAPI):
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from typing import Protocol
+
+from app.domain.models.eval import EvalCacheReport, EvalCase
+from app.domain.models.physics import PhysicsSolution
+
+
+class EvalCachePort(Protocol):
+    """Solver predictions cached per eval case for one model and program."""
+
+    def get(self, case: EvalCase, sample_index: int = 0) -> PhysicsSolution | None: ...
+
+    def put(self, case: EvalCase, solution: PhysicsSolution, sample_index: int = 0) -> None: ...
+
+    def report(self) -> EvalCacheReport: ...
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from typing import Protocol
+
+from app.domain.models.program import ProgramVersion
+
+
+class ProgramPort(Protocol):
+    def active_version(self) -> str: ...
+
+    def list_versions(self) -> list[ProgramVersion]: ...
+
+    def activate(self, version: str) -> ProgramVersion: ...
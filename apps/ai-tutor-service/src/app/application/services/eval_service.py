@@ -1,14 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
 import json
+import math
+import random
+import time
+from collections.abc import Callable, Coroutine, Iterable, Iterator, Mapping, Sequence
+from dataclasses import asdict, dataclass
+from fnmatch import fnmatchcase
+from itertools import islice
 from pathlib import Path
+from typing import Any
+
+import numpy as np
+from pydantic import TypeAdapter
 
+from app.application.ports.eval_cache_port import EvalCachePort
 from app.application.ports.physics_port import PhysicsPort
+from app.application.services.eval_statistics import (
+    mean_interval,
+    pass_at_k,
+    percentile,
+    wilson_interval,
+)
+from app.core.profiling import SCORING_PHASE, phase
+from app.core.run_metrics import collect_run_metrics
+from app.core.sampling import sample_scope
 from app.core.unit_registry import UnitQuantity
-from app.domain.models.eval import EvalCase, EvalCaseScore, EvalRunSummary
+from app.domain.models.eval import (
+    EvalCase,
+    EvalCaseMetrics,
+    EvalCaseSampleStats,
+    EvalCaseScore,
+    EvalRunSummary,
+    result_key,
+)
 from app.domain.models.physics import PhysicsQuestion, PhysicsSolution
 
+_EVAL_CASE_ADAPTER = TypeAdapter(EvalCase)
+
+
+@dataclass(frozen=True)
+class EvalShard:
+    """Shard ``index`` (1-based) of ``count``; cases are assigned by a stable hash of the id."""
+
+    index: int
+    count: int
+
+    def __post_init__(self) -> None:
+        if self.count < 1 or not 1 <= self.index <= self.count:
+            raise ValueError(f"Invalid shard {self.index}/{self.count}")
+
+    @classmethod
+    def parse(cls, spec: str) -> EvalShard:
+        index, _, count = spec.partition("/")
+        try:
+            return cls(index=int(index), count=int(count))
+        except ValueError:
+            raise ValueError(f"Invalid shard '{spec}', expected 'i/n' with 1 <= i <= n") from None
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    def contains(self, case_id: str) -> bool:
+        digest = hashlib.sha256(case_id.encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") % self.count == self.index - 1
+
+
+@dataclass(frozen=True)
+class EvalCaseFilter:
+    """Case selection applied to the raw JSON, before pydantic validation.
+
+    Empty fields select everything; ``topics`` matches cases sharing any topic and
+    ``id_patterns`` are ``fnmatch`` globs.
+    """
+
+    splits: frozenset[str] = frozenset()
+    topics: frozenset[str] = frozenset()
+    difficulties: frozenset[str] = frozenset()
+    years: frozenset[int] = frozenset()
+    id_patterns: tuple[str, ...] = ()
+    case_ids: frozenset[str] = frozenset()
+
+    def matches(self, raw_case: Mapping[str, Any]) -> bool:
+        if self.splits and raw_case.get("split") not in self.splits:
+            return False
+        if self.difficulties and raw_case.get("difficulty") not in self.difficulties:
+            return False
+        if self.topics and self.topics.isdisjoint(raw_case.get("topics") or ()):
+            return False
+        if self.years:
+            source = raw_case.get("source")
+            if not isinstance(source, Mapping) or source.get("year") not in self.years:
+                return False
+        if self.case_ids and raw_case.get("id") not in self.case_ids:
+            return False
+        if self.id_patterns:
+            case_id = str(raw_case.get("id", ""))
+            if not any(fnmatchcase(case_id, pattern) for pattern in self.id_patterns):
+                return False
+        return True
+
 
-def load_cases(dataset_path: Path, max_cases: int | None = None):
-    eval_cases: list[EvalCase] = []
+def iter_cases(dataset_path: Path, case_filter: EvalCaseFilter | None = None) -> Iterator[EvalCase]:
+    """Stream validated cases from a JSONL dataset, skipping filtered-out lines unvalidated."""
     with open(dataset_path, encoding="utf-8") as dataset:
         for index, line in enumerate(dataset):
             try:
@@ -18,57 +115,217 @@ def load_cases(dataset_path: Path, max_cases: int | None = None):
                 case = json.loads(line)
                 if not case:
                     continue
-                if max_cases is not None and len(eval_cases) >= max_cases:
-                    break
+                if case_filter is not None and not case_filter.matches(case):
+                    continue
 
-                eval_case = EvalCase(**case)
-                eval_cases.append(eval_case)
+                yield _EVAL_CASE_ADAPTER.validate_python(case)
 
             except Exception as e:
                 raise ValueError(f"Error loading eval case {index + 1}: {line}") from e
 
-    return eval_cases
+
+def sample_cases(cases: Iterable[EvalCase], size: int, seed: int = 0) -> list[EvalCase]:
+    """Deterministic reservoir sample of ``size`` cases, returned in dataset order.
+
+    Holds only ``size`` cases in memory, whatever the dataset length.
+    """
+    if size < 0:
+        raise ValueError("sample size must be >= 0")
+    rng = random.Random(seed)
+    reservoir: list[tuple[int, EvalCase]] = []
+    for index, case in enumerate(cases):
+        if index < size:
+            reservoir.append((index, case))
+            continue
+        slot = rng.randint(0, index)
+        if slot < size:
+            reservoir[slot] = (index, case)
+    return [case for _, case in sorted(reservoir, key=lambda item: item[0])]
+
+
+def load_cases(
+    dataset_path: Path,
+    max_cases: int | None = None,
+    case_filter: EvalCaseFilter | None = None,
+    sample: int | None = None,
+    seed: int = 0,
+    shard: EvalShard | None = None,
+) -> list[EvalCase]:
+    """Filter, sample and cap the dataset, then keep ``shard``'s part of the result, so
+    the shards of a run together cover exactly the unsharded selection."""
+    cases: Iterable[EvalCase] = iter_cases(dataset_path, case_filter)
+    if sample is not None:
+        cases = sample_cases(cases, size=sample, seed=seed)
+    selected = list(islice(cases, max_cases))
+    if shard is None:
+        return selected
+    return [case for case in selected if shard.contains(case.id)]
+
+
+@functools.lru_cache(maxsize=1024)
+def _plain_units(unit: str) -> Any | None:
+    """Units of ``unit`` when ``f"{value} {unit}"`` always parses to exactly ``value``
+    of them and pint subtracts them by plain scaling; None otherwise (numeric factors
+    in the unit string, offset or delta units, unparsable units)."""
+    try:
+        quantity = UnitQuantity(f"1 {unit}")
+    except Exception:
+        return None
+    if quantity.magnitude != 1:
+        return None
+    # Delta units follow their own add/sub rules; offset units (degC) do not map 0 to
+    # 0 in base units, and compound ones refuse the conversion.
+    if any(name.startswith("delta_") for name, _ in quantity.unit_items()):
+        return None
+    try:
+        if UnitQuantity(0, quantity.units).to_base_units().magnitude != 0:
+            return None
+    except Exception:
+        return None
+    return quantity.units
+
+
+@functools.lru_cache(maxsize=4096)
+def _conversion_factor(unit: str, target_unit: str) -> float | None:
+    """Factor pint multiplies a magnitude by to convert ``unit`` into ``target_unit``;
+    None when the pair needs full pint arithmetic (or is incompatible)."""
+    units = _plain_units(unit)
+    target = _plain_units(target_unit)
+    if units is None or target is None:
+        return None
+    # pint converts by the base-unit factor of ``units / target``, as here.
+    ratio = (UnitQuantity(1, units) / UnitQuantity(1, target)).to_base_units()
+    if not ratio.dimensionless:
+        return None
+    return float(ratio.magnitude)
+
+
+@dataclass(frozen=True)
+class ExpectedQuantity:
+    """A case's expected quantity and absolute tolerance, parsed once and reused
+    across every sample scored against it.
+
+    Comparisons run on magnitudes in the expected quantity's own units, which is
+    what pint's ``expected - predicted`` does, so the fast path matches it exactly.
+    """
+
+    display: str
+    quantity: Any | None = None
+    abs_tolerance: Any | None = None
+    units: str | None = None
+    magnitude: float = 0.0
+    tolerance_band: float = 0.0
+
+
+def prepare_expected(case: EvalCase) -> ExpectedQuantity:
+    expected_value = case.expected.value
+    expected_unit = case.expected.unit
+
+    try:
+        quantity = UnitQuantity(f"{expected_value} {expected_unit}")
+        abs_tolerance = UnitQuantity(f"{case.tolerance.abs} {expected_unit}")
+    except Exception:
+        return ExpectedQuantity(display=f"{expected_value} {expected_unit}")
+    return ExpectedQuantity(
+        display=f"{quantity}",
+        quantity=quantity,
+        abs_tolerance=abs_tolerance,
+        units=f"{quantity.units}",
+        magnitude=quantity.magnitude,
+        tolerance_band=abs_tolerance.magnitude + case.tolerance.rel * abs(quantity.magnitude),
+    )
+
+
+def _fast_factor(expected: ExpectedQuantity, predicted_value: float, predicted_unit: str):
+    """Conversion factor for the float/NumPy comparison, or None to use pint."""
+    if expected.units is None or not math.isfinite(predicted_value):
+        return None
+    if not math.isfinite(expected.magnitude) or not math.isfinite(expected.tolerance_band):
+        return None
+    return _conversion_factor(predicted_unit, expected.units)
 
 
 def check_result(
     case: EvalCase,
     predicted_value: int | float,
     predicted_unit: str,
+    expected: ExpectedQuantity | None = None,
 ) -> bool:
     try:
-        expected_value = case.expected.value
-        expected_unit = case.expected.unit
+        expected = expected or prepare_expected(case)
+        if expected.quantity is None:
+            return False
+
+        factor = _fast_factor(expected, predicted_value, predicted_unit)
+        if factor is not None:
+            diff = abs(expected.magnitude - predicted_value * factor)
+            return bool(diff <= expected.tolerance_band)
 
-        normalized_expected = UnitQuantity(f"{expected_value} {expected_unit}")
         normalized_predicted = UnitQuantity(f"{predicted_value} {predicted_unit}")
-        diff = abs(normalized_expected - normalized_predicted)
-        abs_tolerance = UnitQuantity(f"{case.tolerance.abs} {expected_unit}")
-        tolerance_band = abs_tolerance + case.tolerance.rel * abs(normalized_expected)
+        diff = abs(expected.quantity - normalized_predicted)
+        tolerance_band = expected.abs_tolerance + case.tolerance.rel * abs(expected.quantity)
 
         return bool(diff <= tolerance_band)
     except Exception:
         return False
 
 
-def score_case(case: EvalCase, predicted: PhysicsSolution) -> EvalCaseScore:
-    expected_value = case.expected.value
-    expected_unit = case.expected.unit
+def check_results_batch(
+    cases: Sequence[EvalCase],
+    predictions: Sequence[PhysicsSolution],
+    expected: Sequence[ExpectedQuantity] | None = None,
+) -> list[bool]:
+    """``check_result`` for many predictions at once.
 
-    try:
-        expected_str = f"{UnitQuantity(f'{expected_value} {expected_unit}')}"
-    except Exception:
-        expected_str = f"{expected_value} {expected_unit}"
+    Pairs with plain multiplicative units are compared in one NumPy pass; the rest
+    (offset units, numeric factors in the unit string, non-finite values) go
+    through the per-case pint logic.
+    """
+    expected = expected if expected is not None else [prepare_expected(case) for case in cases]
+    results = [False] * len(predictions)
+    fast_indices: list[int] = []
+    factors: list[float] = []
+    for index, (case, prediction, case_expected) in enumerate(
+        zip(cases, predictions, expected, strict=True)
+    ):
+        if case_expected.quantity is None:
+            continue
+        factor = _fast_factor(case_expected, prediction.value, prediction.unit)
+        if factor is None:
+            results[index] = check_result(
+                case, prediction.value, prediction.unit, expected=case_expected
+            )
+            continue
+        fast_indices.append(index)
+        factors.append(factor)
+
+    if fast_indices:
+        magnitudes = np.fromiter((expected[i].magnitude for i in fast_indices), dtype=np.float64)
+        bands = np.fromiter((expected[i].tolerance_band for i in fast_indices), dtype=np.float64)
+        values = np.fromiter((predictions[i].value for i in fast_indices), dtype=np.float64)
+        within = np.abs(magnitudes - values * np.asarray(factors, dtype=np.float64)) <= bands
+        for index, ok in zip(fast_indices, within.tolist(), strict=True):
+            results[index] = ok
+    return results
 
+
+def _display_predicted(predicted: PhysicsSolution) -> str:
+    units = _plain_units(predicted.unit) if math.isfinite(predicted.value) else None
     try:
-        predicted_str = f"{UnitQuantity(f'{predicted.value} {predicted.unit}')}"
+        if units is not None:
+            return f"{UnitQuantity(predicted.value, units)}"
+        return f"{UnitQuantity(f'{predicted.value} {predicted.unit}')}"
     except Exception:
-        predicted_str = f"{predicted.value} {predicted.unit}"
+        return f"{predicted.value} {predicted.unit}"
 
-    result_ok = check_result(
-        case=case,
-        predicted_value=predicted.value,
-        predicted_unit=predicted.unit,
-    )
+
+def _build_score(
+    case: EvalCase,
+    predicted: PhysicsSolution,
+    expected: ExpectedQuantity,
+    sample_index: int,
+    result_ok: bool,
+) -> EvalCaseScore:
     result_score = 1.0 if result_ok else 0.0
 
     normalized_reasoning = predicted.reasoning.strip()
@@ -81,8 +338,12 @@ def score_case(case: EvalCase, predicted: PhysicsSolution) -> EvalCaseScore:
     total_score = 0.4 * result_score + 0.6 * reasoning_score
 
     return EvalCaseScore(
-        expected=expected_str,
-        predicted=predicted_str,
+        case_id=case.id,
+        sample_index=sample_index,
+        expected=expected.display,
+        predicted=_display_predicted(predicted),
+        predicted_value=predicted.value,
+        predicted_unit=predicted.unit,
         reasoning=normalized_reasoning,
         result_ok=result_ok,
         reasoning_score=reasoning_score,
@@ -91,55 +352,360 @@ def score_case(case: EvalCase, predicted: PhysicsSolution) -> EvalCaseScore:
     )
 
 
-class EvalService:
-    def __init__(self, cases: list[EvalCase], solver: PhysicsPort):
-        self.solver = solver
-        self.cases = cases
+def score_case(
+    case: EvalCase,
+    predicted: PhysicsSolution,
+    expected: ExpectedQuantity | None = None,
+    sample_index: int = 0,
+) -> EvalCaseScore:
+    expected = expected or prepare_expected(case)
+    result_ok = check_result(
+        case=case,
+        predicted_value=predicted.value,
+        predicted_unit=predicted.unit,
+        expected=expected,
+    )
+    return _build_score(case, predicted, expected, sample_index, result_ok)
 
-    async def run(self) -> EvalRunSummary:
-        case_results: list[EvalCaseScore] = []
 
-        total_cases = len(self.cases)
-        passed_cases = 0
-        reasoning_sum = 0.0
-        result_sum = 0.0
-        total_sum = 0.0
+def score_cases(
+    cases: Sequence[EvalCase],
+    predictions: Sequence[PhysicsSolution],
+    expected: Sequence[ExpectedQuantity],
+    sample_indices: Sequence[int],
+) -> list[EvalCaseScore]:
+    """``score_case`` for many predictions, with the value check batched."""
+    results_ok = check_results_batch(cases, predictions, expected)
+    return [
+        _build_score(case, prediction, case_expected, sample_index, result_ok)
+        for case, prediction, case_expected, sample_index, result_ok in zip(
+            cases, predictions, expected, sample_indices, results_ok, strict=True
+        )
+    ]
 
-        for case in self.cases:
-            try:
-                question = PhysicsQuestion(
-                    text=case.question_text, reference_data=case.reference_data
+
+def stored_prediction(case_score: EvalCaseScore) -> PhysicsSolution | None:
+    """Rebuild the solver output recorded in a score, or None when there is none.
+
+    Artifacts written before ``predicted_value``/``predicted_unit`` existed only have
+    the normalized ``predicted`` string, which is parsed back into value and unit.
+    """
+    if case_score.error is not None or not case_score.reasoning:
+        return None
+    if case_score.predicted_value is not None and case_score.predicted_unit:
+        value, unit = case_score.predicted_value, case_score.predicted_unit
+    elif case_score.predicted:
+        try:
+            quantity = UnitQuantity(case_score.predicted)
+        except Exception:
+            return None
+        value, unit = float(quantity.magnitude), f"{quantity.units}" or "dimensionless"
+    else:
+        return None
+    return PhysicsSolution(reasoning=case_score.reasoning, value=value, unit=unit)
+
+
+def rescore(
+    cases: Iterable[EvalCase], case_results: list[EvalCaseScore]
+) -> tuple[list[EvalCaseScore], list[str]]:
+    """Re-apply the current scoring to stored predictions.
+
+    Returns the new results (same order) and the ids of results kept unchanged
+    because their case or prediction is missing. Errored results stay errored.
+    """
+    by_id = {case.id: case for case in cases}
+    expected_by_id: dict[str, ExpectedQuantity] = {}
+    rescored: list[EvalCaseScore] = list(case_results)
+    skipped: list[str] = []
+
+    positions: list[int] = []
+    batch_cases: list[EvalCase] = []
+    batch_predictions: list[PhysicsSolution] = []
+    for position, case_score in enumerate(case_results):
+        if case_score.error is not None:
+            continue
+        case = by_id.get(case_score.case_id) if case_score.case_id is not None else None
+        prediction = stored_prediction(case_score)
+        if case is None or prediction is None:
+            skipped.append(case_score.result_key or "?")
+            continue
+        if case.id not in expected_by_id:
+            expected_by_id[case.id] = prepare_expected(case)
+        positions.append(position)
+        batch_cases.append(case)
+        batch_predictions.append(prediction)
+
+    new_scores = score_cases(
+        batch_cases,
+        batch_predictions,
+        [expected_by_id[case.id] for case in batch_cases],
+        [case_results[position].sample_index for position in positions],
+    )
+    for position, new_score in zip(positions, new_scores, strict=True):
+        new_score.metrics = case_results[position].metrics
+        rescored[position] = new_score
+    return rescored, skipped
+
+
+def _sample_stats(case_id: str, samples: list[EvalCaseScore]) -> EvalCaseSampleStats:
+    passed_samples = sum(1 for sample in samples if sample.passed)
+    answers = {sample.predicted for sample in samples if sample.error is None}
+    return EvalCaseSampleStats(
+        case_id=case_id,
+        samples=len(samples),
+        passed_samples=passed_samples,
+        agreement=max(passed_samples, len(samples) - passed_samples) / len(samples),
+        distinct_answers=len(answers),
+    )
+
+
+def summarize(case_results: list[EvalCaseScore]) -> EvalRunSummary:
+    total_cases = len(case_results)
+    passed_cases = sum(1 for case_score in case_results if case_score.passed)
+    reasoning_sum = sum(case_score.reasoning_score for case_score in case_results)
+    result_sum = sum(case_score.result_ok for case_score in case_results)
+    total_sum = sum(case_score.total_score for case_score in case_results)
+
+    # Group samples per case (first-seen order); results without a case id stand alone.
+    by_case: dict[str, list[EvalCaseScore]] = {}
+    for index, case_score in enumerate(case_results):
+        by_case.setdefault(case_score.case_id or f"#{index}", []).append(case_score)
+    samples_per_case = max((len(samples) for samples in by_case.values()), default=1)
+    case_pass_rates = [
+        sum(sample.passed for sample in samples) / len(samples) for samples in by_case.values()
+    ]
+    solved_metrics = [
+        case_score.metrics
+        for case_score in case_results
+        if case_score.metrics is not None and not case_score.metrics.cached
+    ]
+    latencies = [metrics.latency_ms for metrics in solved_metrics]
+    costs = [metrics.estimated_cost_usd for metrics in solved_metrics]
+    case_total_scores = [
+        sum(sample.total_score for sample in samples) / len(samples) for samples in by_case.values()
+    ]
+
+    return EvalRunSummary(
+        case_results=case_results,
+        total_cases=total_cases,
+        passed_cases=passed_cases,
+        pass_rate=passed_cases / total_cases if total_cases > 0 else 0.0,
+        avg_reasoning_score=reasoning_sum / total_cases if total_cases > 0 else 0.0,
+        avg_value_score=result_sum / total_cases if total_cases > 0 else 0.0,
+        avg_total_score=total_sum / total_cases if total_cases > 0 else 0.0,
+        samples_per_case=samples_per_case,
+        pass_at_1=sum(case_pass_rates) / len(by_case) if by_case else None,
+        pass_at_k=(
+            sum(
+                pass_at_k(
+                    samples=len(samples),
+                    passed=sum(sample.passed for sample in samples),
+                    k=min(samples_per_case, len(samples)),
                 )
+                for samples in by_case.values()
+            )
+            / len(by_case)
+            if by_case
+            else None
+        ),
+        # Samples of one case are correlated, so with k > 1 the interval is taken over
+        # per-case means rather than over all samples.
+        pass_rate_ci=(
+            wilson_interval(passed_cases, total_cases)
+            if samples_per_case == 1
+            else mean_interval(case_pass_rates)
+        ),
+        avg_total_score_ci=mean_interval(case_total_scores),
+        case_sample_stats=(
+            [_sample_stats(case_id, samples) for case_id, samples in by_case.items()]
+            if samples_per_case > 1
+            else []
+        ),
+        latency_p50_ms=percentile(latencies, 0.50),
+        latency_p90_ms=percentile(latencies, 0.90),
+        latency_p99_ms=percentile(latencies, 0.99),
+        total_lm_calls=sum(metrics.lm_calls for metrics in solved_metrics),
+        total_prompt_tokens=sum(metrics.prompt_tokens for metrics in solved_metrics),
+        total_completion_tokens=sum(metrics.completion_tokens for metrics in solved_metrics),
+        estimated_cost_usd=(
+            sum(cost for cost in costs if cost is not None) if costs and None not in costs else None
+        ),
+    )
 
-                prediction = await self.solver.solve(question=question)
-                case_score = score_case(case=case, predicted=prediction)
 
-                case_results.append(case_score)
+class _CoalescingScorer:
+    """Scores the predictions that complete in the same event-loop iteration with one
+    ``score_cases`` call, so the live path uses the batched comparison without
+    holding finished cases back (checkpoints are still written case by case). Runs
+    served from the eval cache complete many cases per iteration."""
 
-                passed_cases = passed_cases + 1 if case_score.passed else passed_cases
-                reasoning_sum += case_score.reasoning_score
-                result_sum += case_score.result_ok
-                total_sum += case_score.total_score
-            except Exception as e:
-                case_results.append(
-                    EvalCaseScore(
+    def __init__(self) -> None:
+        self._pending: list[
+            tuple[EvalCase, PhysicsSolution, ExpectedQuantity, int, asyncio.Future[EvalCaseScore]]
+        ] = []
+
+    def score(
+        self,
+        case: EvalCase,
+        prediction: PhysicsSolution,
+        expected: ExpectedQuantity,
+        sample_index: int,
+    ) -> asyncio.Future[EvalCaseScore]:
+        loop = asyncio.get_running_loop()
+        if not self._pending:
+            loop.call_soon(self._flush)
+        future: asyncio.Future[EvalCaseScore] = loop.create_future()
+        self._pending.append((case, prediction, expected, sample_index, future))
+        return future
+
+    def _flush(self) -> None:
+        pending, self._pending = self._pending, []
+        try:
+            with phase(SCORING_PHASE):
+                scores = score_cases(
+                    [case for case, *_ in pending],
+                    [prediction for _, prediction, *_ in pending],
+                    [expected for _, _, expected, *_ in pending],
+                    [sample_index for *_, sample_index, _ in pending],
+                )
+        except Exception as exc:
+            for *_, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (*_, future), case_score in zip(pending, scores, strict=True):
+            if not future.done():
+                future.set_result(case_score)
+
+
+class EvalService:
+    def __init__(
+        self,
+        cases: list[EvalCase],
+        solver: PhysicsPort,
+        concurrency: int = 1,
+        completed: Mapping[str, EvalCaseScore] | None = None,
+        on_case_done: Callable[[EvalCaseScore], None] | None = None,
+        cache: EvalCachePort | None = None,
+        samples: int = 1,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        if samples < 1:
+            raise ValueError("samples must be >= 1")
+        self.solver = solver
+        self.cases = cases
+        self.concurrency = concurrency
+        # Results from a previous (interrupted) run, keyed by ``result_key``; those
+        # samples are not solved again.
+        self.completed = completed or {}
+        self.on_case_done = on_case_done
+        self.cache = cache
+        self.samples = samples
+        self._scorer = _CoalescingScorer()
+
+    async def _run_case(
+        self,
+        case: EvalCase,
+        sample_index: int,
+        expected: ExpectedQuantity,
+        semaphore: asyncio.Semaphore,
+    ) -> EvalCaseScore:
+        previous = self.completed.get(result_key(case.id, sample_index))
+        if previous is not None:
+            return previous
+
+        case_score = await self._solve_case(case, sample_index, expected, semaphore)
+        if self.on_case_done is not None:
+            self.on_case_done(case_score)
+        return case_score
+
+    async def _solve_case(
+        self,
+        case: EvalCase,
+        sample_index: int,
+        expected: ExpectedQuantity,
+        semaphore: asyncio.Semaphore,
+    ) -> EvalCaseScore:
+        async with semaphore:
+            cached = False
+            started = time.perf_counter()
+            with collect_run_metrics() as run_metrics:
+                try:
+                    question = PhysicsQuestion(
+                        text=case.question_text, reference_data=case.reference_data
+                    )
+
+                    cache = self.cache
+                    prediction = cache.get(case, sample_index) if cache is not None else None
+                    cached = prediction is not None
+                    if prediction is None:
+                        with sample_scope(sample_index):
+                            prediction = await self.solver.solve(question=question)
+                        if cache is not None:
+                            cache.put(case, prediction, sample_index)
+                    case_score = await self._scorer.score(case, prediction, expected, sample_index)
+                except Exception as e:
+                    case_score = EvalCaseScore(
+                        case_id=case.id,
+                        sample_index=sample_index,
                         passed=False,
                         reasoning_score=0.0,
                         result_ok=False,
                         total_score=0.0,
                         error=str(e),
                     )
-                )
-                reasoning_sum += 0.0
-                result_sum += 0.0
-                total_sum += 0.0
-
-        return EvalRunSummary(
-            case_results=case_results,
-            total_cases=total_cases,
-            passed_cases=passed_cases,
-            pass_rate=passed_cases / total_cases if total_cases > 0 else 0.0,
-            avg_reasoning_score=reasoning_sum / total_cases if total_cases > 0 else 0.0,
-            avg_value_score=result_sum / total_cases if total_cases > 0 else 0.0,
-            avg_total_score=total_sum / total_cases if total_cases > 0 else 0.0,
-        )
+
+            case_score.metrics = EvalCaseMetrics(
+                cached=cached,
+                latency_ms=(time.perf_counter() - started) * 1000,
+                **asdict(run_metrics),
+            )
+            return case_score
+
+    def case_runs(self, semaphore: asyncio.Semaphore) -> list[Coroutine[Any, Any, EvalCaseScore]]:
+        """One coroutine per (case, sample), in dataset then sample order."""
+        return [
+            self._run_case(case, sample_index, expected, semaphore)
+            for case in self.cases
+            for expected in (prepare_expected(case),)
+            for sample_index in range(self.samples)
+        ]
+
+    async def run(self) -> EvalRunSummary:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # gather keeps dataset order (then sample order) regardless of completion order.
+        case_results = await asyncio.gather(*self.case_runs(semaphore))
+        return summarize(list(case_results))
+
+
+class EvalMatrixService:
+    """Evaluates the same cases against several models under one concurrency budget.
+
+    Each model has its own ``EvalService`` (solver, rate limiter, cache); their case
+    runs are interleaved case by case so every model progresses at the same pace.
+    """
+
+    def __init__(self, services: Mapping[str, EvalService], concurrency: int = 1):
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        if not services:
+            raise ValueError("EvalMatrixService needs at least one model")
+        self.services = dict(services)
+        self.concurrency = concurrency
+
+    async def run(self) -> dict[str, EvalRunSummary]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        runs = {model: service.case_runs(semaphore) for model, service in self.services.items()}
+        order = [
+            (model, index)
+            for index in range(max(len(model_runs) for model_runs in runs.values()))
+            for model, model_runs in runs.items()
+            if index < len(model_runs)
+        ]
+        results = await asyncio.gather(*(runs[model][index] for model, index in order))
+
+        by_model: dict[str, list[EvalCaseScore]] = {model: [] for model in runs}
+        for (model, _), case_score in zip(order, results, strict=True):
+            by_model[model].append(case_score)
+        return {model: summarize(case_results) for model, case_results in by_model.items()}
@@ -0,0 +1,57 @@
+"""Sampling statistics for eval runs with one or more samples per case."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+
+from app.domain.models.eval import ConfidenceInterval
+
+Z_95 = 1.959963984540054
+
+
+def pass_at_k(samples: int, passed: int, k: int) -> float:
+    """Unbiased pass@k estimate for one case: P(at least one of k draws passes).
+
+    Uses ``1 - C(n - c, k) / C(n, k)`` (Chen et al., 2021) without large binomials.
+    """
+    if not 0 < k <= samples:
+        raise ValueError("k must be in 1..samples")
+    if samples - passed < k:
+        return 1.0
+    return 1.0 - math.prod(1.0 - k / n for n in range(samples - passed + 1, samples + 1))
+
+
+def wilson_interval(successes: float, trials: int, z: float = Z_95) -> ConfidenceInterval:
+    """Wilson score interval for a binomial proportion (sane for small n and p near 0/1)."""
+    if trials == 0:
+        return ConfidenceInterval(low=0.0, high=1.0)
+    p = successes / trials
+    denominator = 1 + z**2 / trials
+    center = (p + z**2 / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z**2 / (4 * trials**2)) / denominator
+    return ConfidenceInterval(low=max(0.0, center - margin), high=min(1.0, center + margin))
+
+
+def mean_interval(
+    values: Sequence[float], z: float = Z_95, bounds: tuple[float, float] = (0.0, 1.0)
+) -> ConfidenceInterval:
+    """Normal-approximation interval for the mean of ``values``, clipped to ``bounds``."""
+    n = len(values)
+    if n == 0:
+        return ConfidenceInterval(low=bounds[0], high=bounds[1])
+    mean = sum(values) / n
+    if n == 1:
+        return ConfidenceInterval(low=mean, high=mean)
+    variance = sum((value - mean) ** 2 for value in values) / (n - 1)
+    margin = z * math.sqrt(variance / n)
+    return ConfidenceInterval(low=max(bounds[0], mean - margin), high=min(bounds[1], mean + margin))
+
+
+def percentile(values: Sequence[float], q: float) -> float | None:
+    """Nearest-rank percentile (``q`` in 0..1) of ``values``; None when empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(q * len(ordered)) - 1, 0)
+    return ordered[rank]
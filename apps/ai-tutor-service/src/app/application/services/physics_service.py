@@ -1,13 +1,213 @@
+import asyncio
+import logging
+import math
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Literal
+
+from opentelemetry import trace
+
 from app.application.ports.physics_port import PhysicsPort
+from app.core.deadline import DeadlineExceeded, deadline_scope
+from app.core.observability_contract import AttrKey, SpanName
+from app.core.service_metrics import track_solve
+from app.core.unit_registry import UnitQuantity
 from app.domain.models.physics import PhysicsQuestion, PhysicsSolution
 
+logger = logging.getLogger(__name__)
+
+HedgeStrategy = Literal["first_valid", "vote"]
+
+
+@dataclass(frozen=True)
+class HedgeConfig:
+    """Speculative parallel solving.
+
+    ``attempts`` concurrent solves are launched (``stagger_ms`` apart, so a fast
+    first attempt avoids paying for the others).  With ``first_valid`` the first
+    locally valid solution wins; with ``vote`` the first value agreed on by
+    ``vote_quorum`` attempts (within ``rel_tolerance``) wins.  Remaining attempts
+    are cancelled.
+    """
+
+    attempts: int = 1
+    strategy: HedgeStrategy = "first_valid"
+    stagger_ms: int = 0
+    vote_quorum: int = 2
+    rel_tolerance: float = 0.02
+
+    @property
+    def enabled(self) -> bool:
+        return self.attempts > 1
+
+
+def is_valid_solution(solution: PhysicsSolution) -> bool:
+    if not math.isfinite(solution.value) or not solution.reasoning.strip():
+        return False
+    try:
+        UnitQuantity(1, solution.unit)
+    except Exception:
+        return False
+    return True
+
+
+def solutions_agree(a: PhysicsSolution, b: PhysicsSolution, rel_tolerance: float) -> bool:
+    try:
+        qa = UnitQuantity(a.value, a.unit)
+        qb = UnitQuantity(b.value, b.unit).to(qa.units)
+    except Exception:
+        return False
+    scale = max(abs(qa.magnitude), abs(qb.magnitude))
+    return bool(abs(qa.magnitude - qb.magnitude) <= rel_tolerance * scale)
+
 
 class PhysicsService:
-    def __init__(self, solver: PhysicsPort):
+    def __init__(
+        self,
+        solver: PhysicsPort,
+        hedge: HedgeConfig | None = None,
+        hedge_solvers: Sequence[PhysicsPort] | None = None,
+    ):
         self._solver = solver
+        self._hedge = hedge or HedgeConfig()
+        # Attempt ``i`` runs on ``_attempt_solvers[i % len]``, so hedge solvers can use
+        # different temperatures or models than the primary one.
+        self._attempt_solvers: list[PhysicsPort] = [solver, *(hedge_solvers or [])]
 
     async def solve_once(
         self,
         question: PhysicsQuestion,
+        timeout_s: float | None = None,
     ) -> PhysicsSolution:
-        return await self._solver.solve(question)
+        """Solve ``question``; with ``timeout_s`` the whole solve (every hedge attempt
+        and LM call) is cancelled at the deadline and ``DeadlineExceeded`` is raised."""
+        with track_solve():
+            if timeout_s is None:
+                return await self._solve(question)
+
+            trace.get_current_span().set_attribute(AttrKey.DEADLINE_MS, round(timeout_s * 1000))
+            deadline = time.monotonic() + timeout_s
+            try:
+                async with asyncio.timeout(timeout_s) as scope:
+                    with deadline_scope(timeout_s):
+                        return await self._solve(question)
+            except DeadlineExceeded:
+                raise
+            except Exception as exc:
+                # Past the deadline, an error racing the cancellation (an LM client's
+                # own timeout, a blocking call that overran) is the deadline too.
+                if not scope.expired() and time.monotonic() < deadline:
+                    raise
+                raise DeadlineExceeded(
+                    f"Solve deadline of {round(timeout_s * 1000)}ms exceeded"
+                ) from exc
+
+    async def _solve(self, question: PhysicsQuestion) -> PhysicsSolution:
+        if not self._hedge.enabled:
+            return await self._solver.solve(question)
+
+        tracer = trace.get_tracer(__name__)
+        with tracer.start_as_current_span(SpanName.SERVICE_SOLVE_HEDGED):
+            return await self._solve_hedged(question)
+
+    def _pick_winner(self, candidates: list[PhysicsSolution]) -> int | None:
+        if not candidates:
+            return None
+        if self._hedge.strategy == "first_valid":
+            return 0
+
+        quorum = min(self._hedge.vote_quorum, self._hedge.attempts)
+        for index, candidate in enumerate(candidates):
+            votes = sum(
+                1
+                for other in candidates
+                if solutions_agree(candidate, other, self._hedge.rel_tolerance)
+            )
+            if votes >= quorum:
+                return index
+        return None
+
+    async def _solve_hedged(self, question: PhysicsQuestion) -> PhysicsSolution:
+        hedge = self._hedge
+        span = trace.get_current_span()
+        started = time.perf_counter()
+
+        pending: set[asyncio.Task[PhysicsSolution]] = set()
+        attempt_index: dict[asyncio.Task[PhysicsSolution], int] = {}
+        candidates: list[PhysicsSolution] = []
+        candidate_attempts: list[int] = []
+        completed: list[PhysicsSolution] = []
+        errors: list[BaseException] = []
+        winner: int | None = None
+
+        def launch() -> None:
+            index = len(attempt_index)
+            solver = self._attempt_solvers[index % len(self._attempt_solvers)]
+            task = asyncio.create_task(solver.solve(question))
+            attempt_index[task] = index
+            pending.add(task)
+
+        stagger = hedge.stagger_ms / 1000
+        try:
+            launch()
+            while stagger == 0 and len(attempt_index) < hedge.attempts:
+                launch()
+
+            while pending:
+                timeout = stagger if len(attempt_index) < hedge.attempts else None
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in sorted(done, key=attempt_index.__getitem__):
+                    exc = task.exception()
+                    if exc is not None:
+                        errors.append(exc)
+                        continue
+                    solution = task.result()
+                    completed.append(solution)
+                    if is_valid_solution(solution):
+                        candidates.append(solution)
+                        candidate_attempts.append(attempt_index[task])
+
+                winner = self._pick_winner(candidates)
+                if winner is not None:
+                    break
+                if len(attempt_index) < hedge.attempts:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+            # Wait for the losers to unwind, so their cleanup and usage accounting
+            # happen within this solve rather than after the response.
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if winner is None and candidates:
+            # Vote without quorum: fall back to the first valid answer.
+            winner = 0
+
+        winner_attempt = candidate_attempts[winner] if winner is not None else None
+        span.set_attribute(AttrKey.HEDGE_STRATEGY, hedge.strategy)
+        span.set_attribute(AttrKey.HEDGE_ATTEMPTS_LAUNCHED, len(attempt_index))
+        span.set_attribute(AttrKey.HEDGE_ATTEMPTS_COMPLETED, len(completed) + len(errors))
+        span.set_attribute(AttrKey.HEDGE_ATTEMPTS_CANCELLED, len(pending))
+        span.set_attribute(AttrKey.HEDGE_ATTEMPTS_FAILED, len(errors))
+        if winner_attempt is not None:
+            span.set_attribute(AttrKey.HEDGE_WINNER_ATTEMPT, winner_attempt)
+        logger.info(
+            "[hedge] strategy=%s launched=%s completed=%s failed=%s cancelled=%s winner=%s elapsed_ms=%s",
+            hedge.strategy,
+            len(attempt_index),
+            len(completed) + len(errors),
+            len(errors),
+            len(pending),
+            winner_attempt,
+            round((time.perf_counter() - started) * 1000),
+        )
+
+        if winner is not None:
+            return candidates[winner]
+        if completed:
+            # Nothing passed local validation; keep the non-hedged behaviour.
+            return completed[0]
+        raise errors[0]
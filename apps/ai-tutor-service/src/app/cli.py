@@ -2,63 +2,369 @@ from __future__ import annotations
 
 import argparse
 import logging
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import Any
 
+from app.application.services.eval_service import EvalCaseFilter, EvalShard
+from app.runner.artifact_store import ArtifactQuery
+from app.runner.eval_compare import DEFAULT_NOISE_RATIO
+from app.runner.query_artifacts import compare_evals, eval_trend, query_artifacts
+from app.runner.run_batch import run_batch
 from app.runner.run_case import run_case
-from app.runner.run_eval import run_eval
+from app.runner.run_eval import merge_eval, rescore_eval, run_eval, run_eval_matrix
+
+DEFAULT_DATASET = "evals/physics/fuvest_descriptive_dev.jsonl"
+DEFAULT_AGENT = "physics_descriptive"
 
 
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="ai-tutor-service")
     # Keep an optional "run-case" positional for backwards compatibility, but default to it
     # so `python -m cli --question "..."` works.
-    parser.add_argument("command", nargs="?", choices=["run-case", "eval"], default="run-case")
-    parser.add_argument("--agent", choices=["physics_descriptive"], default="physics_descriptive")
     parser.add_argument(
+        "command",
+        nargs="?",
+        choices=[
+            "run-case",
+            "run-batch",
+            "eval",
+            "eval-merge",
+            "eval-rescore",
+            "eval-compare",
+            "artifacts",
+        ],
+        default="run-case",
+    )
+    parser.add_argument(
+        "--agent",
+        choices=[DEFAULT_AGENT],
+        default=None,
+        help=f"Agent to run (default: {DEFAULT_AGENT}); for artifacts, filter by agent",
+    )
+    llm_mode = parser.add_mutually_exclusive_group()
+    llm_mode.add_argument(
         "--offline",
         action="store_true",
         help="Run without network by using a dummy LLM (best-effort for supported question patterns).",
     )
+    llm_mode.add_argument(
+        "--record-cassette",
+        type=Path,
+        default=None,
+        help="Call the real LLM and record every prompt/completion into this cassette file.",
+    )
+    llm_mode.add_argument(
+        "--replay-cassette",
+        type=Path,
+        default=None,
+        help="Serve every LLM call from this cassette file, without network.",
+    )
     parser.add_argument("--question", help="Question text")
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=None,
+        help='run-batch: JSONL file of {"id", "question", "reference_data"} items (default: stdin)',
+    )
     parser.add_argument(
         "--print", action="store_true", help="Also print validated output JSON to stdout"
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="run-case/eval: save a cProfile profile and a per-phase time breakdown next to "
+        "the artifact and print a summary",
+    )
     parser.add_argument(
         "--dataset",
-        default="evals/physics/fuvest_descriptive_dev.jsonl",
-        help="JSONL dataset path for eval",
+        default=None,
+        help=f"JSONL dataset path for eval (default: {DEFAULT_DATASET}; for eval-rescore, "
+        "the dataset of the re-scored run; for artifact queries, a filter)",
     )
     parser.add_argument(
         "--max-cases", type=int, default=None, help="Maximum number of cases to evaluate"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of eval cases (or run-batch items) solved concurrently",
+    )
+    parser.add_argument(
+        "--max-lm-calls-per-minute",
+        type=float,
+        default=None,
+        help="eval/run-batch: make at most this many LM calls per minute (provider rate "
+        "limits); applies to each model with --models",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="TRACE_ID",
+        default=None,
+        help="Resume an interrupted eval run from its checkpoint, skipping finished cases",
+    )
+    parser.add_argument(
+        "--models",
+        type=_model_list,
+        default=None,
+        metavar="A,B,...",
+        help="Evaluate every listed model on the same cases and write one comparison artifact",
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=1,
+        metavar="K",
+        help="Solve each eval case K times and report pass@k and confidence intervals",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse cached predictions for unchanged cases (same model and program)",
+    )
+    selection = parser.add_argument_group(
+        "eval case selection (repeat a flag to allow more values)"
+    )
+    selection.add_argument("--split", action="append", choices=["dev", "test", "train"])
+    selection.add_argument("--topic", action="append")
+    selection.add_argument("--difficulty", action="append", choices=["easy", "medium", "hard"])
+    selection.add_argument("--year", action="append", type=int)
+    selection.add_argument("--case-id", action="append", help="Case id glob, e.g. 'fuvest-2016-*'")
+    selection.add_argument(
+        "--sample-size",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Evaluate a random subset of N selected cases (not to be confused with --samples)",
+    )
+    selection.add_argument("--seed", type=int, default=0, help="Random seed for --sample-size")
+    parser.add_argument(
+        "--shard",
+        type=_shard,
+        default=None,
+        metavar="I/N",
+        help="Evaluate only shard I of N (cases assigned by a stable hash of their id)",
+    )
+    parser.add_argument(
+        "--parent-trace-id",
+        default=None,
+        help="Trace id shared by all shards of one sharded eval run",
+    )
+    parser.add_argument(
+        "--artifacts",
+        nargs="+",
+        default=[],
+        metavar="TRACE_ID",
+        help="Shard eval artifacts to combine (eval-merge), the artifact to re-score "
+        "(eval-rescore) or the baseline followed by the runs to compare (eval-compare), "
+        "by trace id or legacy JSON path",
+    )
+    parser.add_argument(
+        "--trend",
+        action="store_true",
+        help="eval-compare: table of pass rate and p90 latency over past eval runs "
+        "(filtered by the artifact query flags and --dataset)",
+    )
+    parser.add_argument(
+        "--noise-ratio",
+        type=float,
+        default=DEFAULT_NOISE_RATIO,
+        metavar="R",
+        help="eval-compare: latency or token changes within this fraction of the baseline "
+        f"are noise, not a changed case (default {DEFAULT_NOISE_RATIO})",
+    )
+    query = parser.add_argument_group("artifact query (artifacts and eval-compare --trend)")
+    query.add_argument("--kind", choices=["run", "eval", "eval_matrix"])
+    query.add_argument(
+        "--since", type=_day, default=None, help="First day (YYYY-MM-DD, 'today', 'yesterday')"
+    )
+    query.add_argument("--until", type=_day, default=None, help="Last day, inclusive")
+    query.add_argument("--llm-name", default=None, help="Model name, e.g. 'openai/gpt-4o-mini'")
+    outcome = query.add_mutually_exclusive_group()
+    outcome.add_argument("--failed", action="store_true", help="Only runs that recorded an error")
+    outcome.add_argument("--succeeded", action="store_true", help="Only runs without errors")
+    query.add_argument("--error-type", default=None, help="Only runs failing with this error type")
+    query.add_argument("--min-duration-ms", type=int, default=None)
+    query.add_argument("--limit", type=int, default=50, help="Maximum rows (newest first)")
+    query.add_argument("--show", action="store_true", help="Print full artifact JSON payloads")
 
     return parser
 
 
+def _cassette_args(args: argparse.Namespace) -> dict[str, Any]:
+    if args.record_cassette is not None:
+        return {"cassette": args.record_cassette, "cassette_mode": "record"}
+    if args.replay_cassette is not None:
+        return {"cassette": args.replay_cassette, "cassette_mode": "replay"}
+    return {}
+
+
+def _model_list(value: str) -> list[str]:
+    models = [model.strip() for model in value.split(",") if model.strip()]
+    if not models:
+        raise argparse.ArgumentTypeError("expected a comma-separated list of models")
+    return list(dict.fromkeys(models))
+
+
+def _shard(spec: str) -> EvalShard:
+    try:
+        return EvalShard.parse(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
+def _day(value: str) -> date:
+    today = datetime.now(tz=UTC).date()
+    if value == "today":
+        return today
+    if value == "yesterday":
+        return today - timedelta(days=1)
+    try:
+        return date.fromisoformat(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(
+            f"expected YYYY-MM-DD, 'today' or 'yesterday': {value}"
+        ) from e
+
+
+def _artifact_query(args: argparse.Namespace) -> ArtifactQuery:
+    failed = True if args.failed else False if args.succeeded else None
+    return ArtifactQuery(
+        kind=args.kind,
+        since=args.since,
+        until=args.until,
+        agent=args.agent,
+        llm_name=args.llm_name,
+        failed=failed,
+        error_type=args.error_type,
+        min_duration_ms=args.min_duration_ms,
+        dataset_path=args.dataset,
+        limit=args.limit,
+    )
+
+
+def _case_filter(args: argparse.Namespace) -> EvalCaseFilter:
+    return EvalCaseFilter(
+        splits=frozenset(args.split or ()),
+        topics=frozenset(args.topic or ()),
+        difficulties=frozenset(args.difficulty or ()),
+        years=frozenset(args.year or ()),
+        id_patterns=tuple(args.case_id or ()),
+    )
+
+
 def main() -> None:
     logging.basicConfig(level=logging.INFO)
     parser = _build_parser()
     args = parser.parse_args()
 
+    if args.command == "eval" and args.models is not None:
+        incompatible = {
+            "--offline": args.offline,
+            "--record-cassette": args.record_cassette is not None,
+            "--replay-cassette": args.replay_cassette is not None,
+            "--resume": args.resume is not None,
+            "--shard": args.shard is not None,
+            "--profile": args.profile,
+        }
+        used = [flag for flag, is_set in incompatible.items() if is_set]
+        if used:
+            parser.error(f"--models cannot be combined with {', '.join(used)}")
+        raise SystemExit(
+            run_eval_matrix(
+                dataset=args.dataset or DEFAULT_DATASET,
+                models=args.models,
+                max_cases=args.max_cases,
+                print_output=args.print,
+                concurrency=args.concurrency,
+                max_lm_calls_per_minute=args.max_lm_calls_per_minute,
+                use_cache=args.cache,
+                case_filter=_case_filter(args),
+                sample=args.sample_size,
+                seed=args.seed,
+                samples_per_case=args.samples,
+            )
+        )
+
     if args.command == "eval":
         raise SystemExit(
             run_eval(
-                dataset=args.dataset,
+                dataset=args.dataset or DEFAULT_DATASET,
                 max_cases=args.max_cases,
                 offline=args.offline,
                 print_output=args.print,
+                concurrency=args.concurrency,
+                max_lm_calls_per_minute=args.max_lm_calls_per_minute,
+                resume=args.resume,
+                use_cache=args.cache,
+                case_filter=_case_filter(args),
+                sample=args.sample_size,
+                seed=args.seed,
+                shard=args.shard,
+                parent_trace_id=args.parent_trace_id,
+                samples_per_case=args.samples,
+                profile=args.profile,
+                **_cassette_args(args),
+            )
+        )
+
+    if args.command == "eval-merge":
+        if not args.artifacts:
+            parser.error("--artifacts is required for eval-merge")
+        raise SystemExit(merge_eval(artifact_refs=args.artifacts, print_output=args.print))
+
+    if args.command == "eval-rescore":
+        if len(args.artifacts) != 1:
+            parser.error("eval-rescore takes exactly one artifact in --artifacts")
+        raise SystemExit(
+            rescore_eval(
+                artifact_ref=args.artifacts[0],
+                dataset=args.dataset,
+                print_output=args.print,
             )
         )
 
+    if args.command == "eval-compare":
+        if args.trend:
+            raise SystemExit(eval_trend(query=_artifact_query(args)))
+        if len(args.artifacts) < 2:
+            parser.error("eval-compare takes a baseline and at least one run in --artifacts")
+        raise SystemExit(
+            compare_evals(
+                artifact_refs=args.artifacts,
+                print_output=args.print,
+                noise_ratio=args.noise_ratio,
+            )
+        )
+
+    if args.command == "run-batch":
+        raise SystemExit(
+            run_batch(
+                agent=args.agent or DEFAULT_AGENT,
+                input_path=None if args.input == Path("-") else args.input,
+                offline=args.offline,
+                concurrency=args.concurrency,
+                max_lm_calls_per_minute=args.max_lm_calls_per_minute,
+                **_cassette_args(args),
+            )
+        )
+
+    if args.command == "artifacts":
+        raise SystemExit(query_artifacts(query=_artifact_query(args), show=args.show))
+
     if not args.question:
         parser.error("--question is required for run-case")
 
     if args.command == "run-case":
         raise SystemExit(
             run_case(
-                agent=args.agent,
+                agent=args.agent or DEFAULT_AGENT,
                 question=args.question,
                 offline=args.offline,
                 print_output=args.print,
+                profile=args.profile,
+                **_cassette_args(args),
             )
         )
 
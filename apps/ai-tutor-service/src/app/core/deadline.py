@@ -0,0 +1,47 @@
+"""Per-request deadlines.
+
+``deadline_scope()`` binds an absolute deadline to the current context, so code
+deeper in the call stack (the agent, before it starts paying for LM calls) can
+read the remaining budget with ``remaining_s()``. Enforcement is the caller's
+``asyncio.timeout``: cancelling the solve also cancels the LM call being awaited.
+Nested scopes can only shorten the deadline.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(timeout_s: float) -> Iterator[float]:
+    deadline = time.monotonic() + timeout_s
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_s() -> float | None:
+    """Seconds left before the current deadline (negative once passed), or None."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def check_deadline() -> None:
+    remaining = remaining_s()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceeded("Solve deadline exceeded")
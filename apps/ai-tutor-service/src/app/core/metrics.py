@@ -0,0 +1,305 @@
+"""In-process metric primitives, readable without a trace collector.
+
+Counters, gauges and histograms aggregate per thread: each thread writes only to
+its own shard, so recording takes no lock (one is taken only the first time a
+thread records). Readers (``snapshot()``, ``value()``, a ``/metrics`` scrape) sum
+the shards. A reader may see an update that is half applied, e.g. a histogram
+bucket counted before its sum; such skew is bounded by one observation per
+thread, which is fine for monitoring.
+
+``MetricsRegistry.render()`` produces the Prometheus text exposition format.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Generic, Literal, TypeVar
+
+# Upper bounds (ms) of the latency buckets; the last bucket is unbounded.
+DEFAULT_LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10_000,
+    30_000,
+    60_000,
+)
+
+# The same buckets in seconds, the unit Prometheus metrics use.
+DEFAULT_LATENCY_BUCKETS_S: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+)
+
+Labels = tuple[str, ...]
+S = TypeVar("S")
+
+
+class _ThreadShards(Generic[S]):
+    def __init__(self, factory: Callable[[], S]) -> None:
+        self._factory = factory
+        self._local = threading.local()
+        # Shards of finished threads are kept: their counts are part of the totals.
+        self._shards: list[S] = []
+        self._lock = threading.Lock()
+
+    def local(self) -> S:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._factory()
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def all(self) -> list[S]:
+        with self._lock:
+            return list(self._shards)
+
+
+class Counter:
+    """Monotonic counter, optionally split by a tuple of label values."""
+
+    def __init__(self) -> None:
+        self._shards: _ThreadShards[dict[Labels, float]] = _ThreadShards(dict)
+
+    def inc(self, amount: float = 1.0, labels: Labels = ()) -> None:
+        shard = self._shards.local()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def values(self) -> dict[Labels, float]:
+        totals: dict[Labels, float] = {}
+        for shard in self._shards.all():
+            # dict.copy() is atomic, the owning thread may be inserting meanwhile.
+            for labels, value in shard.copy().items():
+                totals[labels] = totals.get(labels, 0.0) + value
+        return totals
+
+    def value(self, labels: Labels = ()) -> float:
+        return self.values().get(labels, 0.0)
+
+
+class Gauge:
+    """Value that goes up and down, e.g. requests in flight."""
+
+    def __init__(self) -> None:
+        self._shards: _ThreadShards[list[float]] = _ThreadShards(lambda: [0.0])
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._shards.local()[0] += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._shards.local()[0] -= amount
+
+    def value(self) -> float:
+        return sum(shard[0] for shard in self._shards.all())
+
+
+@dataclass(frozen=True)
+class HistogramSnapshot:
+    bounds: tuple[float, ...]
+    # Non-cumulative count per bucket; one more entry than ``bounds`` (overflow bucket).
+    counts: tuple[int, ...]
+    count: int
+    total: float
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate by linear interpolation inside the bucket holding the q-th value."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                if index == len(self.bounds):
+                    return lower
+                fraction = (rank - seen) / bucket_count
+                return lower + (self.bounds[index] - lower) * fraction
+            seen += bucket_count
+        return self.bounds[-1]
+
+    def scaled(self, factor: float) -> HistogramSnapshot:
+        """The same distribution in another unit, e.g. ``scaled(1e-3)`` for ms to s."""
+        return HistogramSnapshot(
+            bounds=tuple(bound * factor for bound in self.bounds),
+            counts=self.counts,
+            count=self.count,
+            total=self.total * factor,
+        )
+
+
+class _HistogramShard:
+    __slots__ = ("counts", "total")
+
+    def __init__(self, buckets: int) -> None:
+        self.counts = [0] * buckets
+        self.total = 0.0
+
+
+class Histogram:
+    def __init__(self, bounds: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS) -> None:
+        self._bounds = tuple(bounds)
+        buckets = len(self._bounds) + 1
+        self._shards = _ThreadShards(lambda: _HistogramShard(buckets))
+
+    def observe(self, value: float) -> None:
+        shard = self._shards.local()
+        shard.counts[bisect.bisect_left(self._bounds, value)] += 1
+        shard.total += value
+
+    def snapshot(self) -> HistogramSnapshot:
+        counts = [0] * (len(self._bounds) + 1)
+        total = 0.0
+        for shard in self._shards.all():
+            for index, bucket_count in enumerate(tuple(shard.counts)):
+                counts[index] += bucket_count
+            total += shard.total
+        return HistogramSnapshot(
+            bounds=self._bounds, counts=tuple(counts), count=sum(counts), total=total
+        )
+
+
+# --- Prometheus text exposition ---------------------------------------------------
+
+MetricType = Literal["counter", "gauge", "histogram"]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def format_sample(name: str, labels: Mapping[str, str], value: float) -> str:
+    if not labels:
+        return f"{name} {_number(value)}"
+    rendered = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+    return f"{name}{{{rendered}}} {_number(value)}"
+
+
+def format_header(name: str, help_text: str, metric_type: MetricType) -> list[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+
+
+def format_histogram(
+    name: str, snapshot: HistogramSnapshot, labels: Mapping[str, str] | None = None
+) -> list[str]:
+    labels = dict(labels or {})
+    lines: list[str] = []
+    cumulative = 0
+    for bound, bucket_count in zip((*snapshot.bounds, math.inf), snapshot.counts, strict=True):
+        cumulative += bucket_count
+        lines.append(format_sample(f"{name}_bucket", {**labels, "le": _number(bound)}, cumulative))
+    lines.append(format_sample(f"{name}_sum", labels, snapshot.total))
+    lines.append(format_sample(f"{name}_count", labels, snapshot.count))
+    return lines
+
+
+@dataclass(frozen=True)
+class _Family:
+    name: str
+    help_text: str
+    metric_type: MetricType
+    metric: Counter | Gauge | Histogram
+    label_names: tuple[str, ...] = ()
+
+    def render(self) -> list[str]:
+        lines = format_header(self.name, self.help_text, self.metric_type)
+        if isinstance(self.metric, Histogram):
+            lines.extend(format_histogram(self.name, self.metric.snapshot()))
+        elif isinstance(self.metric, Gauge):
+            lines.append(format_sample(self.name, {}, self.metric.value()))
+        else:
+            for labels, value in sorted(self.metric.values().items()):
+                lines.append(
+                    format_sample(
+                        self.name, dict(zip(self.label_names, labels, strict=True)), value
+                    )
+                )
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._families: dict[str, _Family] = {}
+        self._collectors: list[Callable[[], Iterable[str]]] = []
+
+    def _register(self, family: _Family) -> None:
+        if family.name in self._families:
+            raise ValueError(f"Metric already registered: {family.name}")
+        self._families[family.name] = family
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+        counter = Counter()
+        self._register(_Family(name, help_text, "counter", counter, tuple(label_names)))
+        return counter
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        gauge = Gauge()
+        self._register(_Family(name, help_text, "gauge", gauge))
+        return gauge
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        bounds: Sequence[float] = DEFAULT_LATENCY_BUCKETS_S,
+    ) -> Histogram:
+        histogram = Histogram(bounds)
+        self._register(_Family(name, help_text, "histogram", histogram))
+        return histogram
+
+    def register_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+        """Add exposition lines computed at scrape time (metrics kept elsewhere)."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for family in self._families.values():
+            lines.extend(family.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
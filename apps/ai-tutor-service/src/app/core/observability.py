@@ -1,18 +1,34 @@
 from functools import lru_cache
 
-from phoenix.otel import register
+from openinference.instrumentation.dspy import DSPyInstrumentor
+from openinference.semconv.resource import ResourceAttributes
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from phoenix.otel import HTTPSpanExporter
 
-from app.core.settings import get_settings
+from app.core.settings import get_runtime_settings
+from app.core.tracing import ErrorKeepingSampler, build_span_processor
 
 
 @lru_cache(maxsize=1)
 def init_observability():
-    settings = get_settings()
+    settings = get_runtime_settings()
 
-    tracer_provider = register(
-        project_name=settings.otel_project_name,
-        auto_instrument=True,
-        batch=False,
+    tracer_provider = TracerProvider(
+        resource=Resource.create({ResourceAttributes.PROJECT_NAME: settings.otel_project_name}),
+        sampler=ErrorKeepingSampler(
+            settings.otel_trace_sample_ratio, keep_errors=settings.otel_keep_error_traces
+        ),
     )
+    # Without a collector (a cassette replay in CI) spans still get trace ids, which
+    # name the run artifacts, but are not exported.
+    if settings.phoenix_collector_endpoint is not None:
+        exporter = HTTPSpanExporter(
+            endpoint=f"{settings.phoenix_collector_endpoint.rstrip('/')}/v1/traces"
+        )
+        tracer_provider.add_span_processor(build_span_processor(exporter, settings))
+    trace.set_tracer_provider(tracer_provider)
+    DSPyInstrumentor().instrument(tracer_provider=tracer_provider)
 
     return tracer_provider
@@ -3,20 +3,61 @@ from enum import StrEnum
 
 class SpanName(StrEnum):
     RUNNER_RUN_CASE = "runner.run_case"
+    RUNNER_RUN_BATCH = "runner.run_batch"
     SERVICE_SOLVE_ONCE = "service.solve_once"
+    SERVICE_SOLVE_HEDGED = "service.solve_hedged"
     AGENT_SOLVE = "agent.solve"
+    TOOL_CALL = "agent.tool"
     EVAL_RUN = "runner.run_eval"
+    EVAL_MERGE = "runner.merge_eval"
+    EVAL_MATRIX = "runner.run_eval_matrix"
+    EVAL_RESCORE = "runner.rescore_eval"
 
 
 class AttrKey(StrEnum):
     TRACE_ID = "app.trace_id"
     OFFLINE = "offline"
+    LLM_CASSETTE_MODE = "llm.cassette_mode"
     DATASET_PATH = "eval.dataset_path"
     EVAL_TOTAL_CASES = "eval.total_cases"
     EVAL_MAX_CASES = "eval.max_cases"
+    EVAL_CONCURRENCY = "eval.concurrency"
+    EVAL_SAMPLES_PER_CASE = "eval.samples_per_case"
+    EVAL_RESUMED_FROM = "eval.resumed_from"
+    EVAL_RESCORED_FROM = "eval.rescored_from"
+    EVAL_CHANGED_CASES = "eval.changed_cases"
+    EVAL_SHARD = "eval.shard"
+    EVAL_MODELS = "eval.models"
+    EVAL_PARENT_TRACE_ID = "eval.parent_trace_id"
+    EVAL_SHARD_TRACE_IDS = "eval.shard_trace_ids"
     EVAL_ERROR_CASES = "eval.error_cases"
+    BATCH_CONCURRENCY = "batch.concurrency"
+    BATCH_ITEM_INDEX = "batch.item_index"
+    BATCH_TOTAL_ITEMS = "batch.total_items"
+    BATCH_FAILED_ITEMS = "batch.failed_items"
+    TOOL_NAME = "tool.name"
+    TOOL_OPERATION = "tool.operation"
+    TOOL_FORMULA_HASH = "tool.formula_hash"
+    TOOL_CACHE_HIT = "tool.cache_hit"
+    TOOL_DURATION_MS = "tool.duration_ms"
+    USAGE_LM_CALLS = "usage.lm_calls"
+    USAGE_PROMPT_TOKENS = "usage.prompt_tokens"
+    USAGE_COMPLETION_TOKENS = "usage.completion_tokens"
+    USAGE_CACHED_TOKENS = "usage.cached_tokens"
+    USAGE_COST_USD = "usage.estimated_cost_usd"
+    DEADLINE_MS = "request.deadline_ms"
+    DEADLINE_REMAINING_MS = "request.deadline_remaining_ms"
     ERROR_TYPE = "error.type"
     ERROR_MESSAGE = "error.message"
+    PROGRAM_VERSION = "agent.program_version"
+    TRAJECTORY_TOKENS_ORIGINAL = "agent.trajectory.tokens_original"
+    TRAJECTORY_TOKENS_SAVED = "agent.trajectory.tokens_saved"
+    HEDGE_STRATEGY = "hedge.strategy"
+    HEDGE_ATTEMPTS_LAUNCHED = "hedge.attempts_launched"
+    HEDGE_ATTEMPTS_COMPLETED = "hedge.attempts_completed"
+    HEDGE_ATTEMPTS_CANCELLED = "hedge.attempts_cancelled"
+    HEDGE_ATTEMPTS_FAILED = "hedge.attempts_failed"
+    HEDGE_WINNER_ATTEMPT = "hedge.winner_attempt"
 
 
 class SpanKind(StrEnum):
@@ -0,0 +1,73 @@
+"""Approximate LLM list prices, used to estimate the cost of solves and eval runs.
+
+The built-in table can be extended or overridden per model with the ``LLM_PRICES``
+setting (see ``configure_prices``).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ModelPrice:
+    """USD per million tokens."""
+
+    input_per_mtok: float
+    output_per_mtok: float
+    # Prompt tokens served from the provider's prompt cache; None bills them as input.
+    cached_input_per_mtok: float | None = None
+
+
+# Keyed by model name without the provider prefix.
+DEFAULT_PRICES: dict[str, ModelPrice] = {
+    "gemini-flash-lite-latest": ModelPrice(0.10, 0.40, 0.025),
+    "gemini-2.0-flash": ModelPrice(0.10, 0.40, 0.025),
+    "gemini-2.0-flash-lite": ModelPrice(0.075, 0.30),
+    "gemini-2.5-flash": ModelPrice(0.30, 2.50, 0.075),
+    "gemini-2.5-flash-lite": ModelPrice(0.10, 0.40, 0.025),
+    "gemini-2.5-pro": ModelPrice(1.25, 10.00, 0.31),
+    "gpt-4o": ModelPrice(2.50, 10.00, 1.25),
+    "gpt-4o-mini": ModelPrice(0.15, 0.60, 0.075),
+    "gpt-4.1-mini": ModelPrice(0.40, 1.60, 0.10),
+}
+
+_prices: dict[str, ModelPrice] = dict(DEFAULT_PRICES)
+
+
+def configure_prices(overrides: Mapping[str, ModelPrice]) -> None:
+    """Use ``DEFAULT_PRICES`` updated with ``overrides`` (keyed by ``llm_name`` or
+    bare model name) as the price table of ``estimate_cost``."""
+    global _prices
+    _prices = {**DEFAULT_PRICES, **overrides}
+
+
+def model_price(model: str, prices: Mapping[str, ModelPrice] | None = None) -> ModelPrice | None:
+    prices = _prices if prices is None else prices
+    return prices.get(model) or prices.get(model.split("/", 1)[-1])
+
+
+def estimate_cost(
+    model: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    prices: Mapping[str, ModelPrice] | None = None,
+    cached_tokens: int = 0,
+) -> float | None:
+    """Estimated USD cost, or None when the model has no known price.
+
+    ``cached_tokens`` are the part of ``prompt_tokens`` read from the prompt cache.
+    """
+    price = model_price(model, prices)
+    if price is None:
+        return None
+    cached_tokens = min(cached_tokens, prompt_tokens)
+    cached_rate = (
+        price.input_per_mtok if price.cached_input_per_mtok is None else price.cached_input_per_mtok
+    )
+    return (
+        (prompt_tokens - cached_tokens) * price.input_per_mtok
+        + cached_tokens * cached_rate
+        + completion_tokens * price.output_per_mtok
+    ) / 1_000_000
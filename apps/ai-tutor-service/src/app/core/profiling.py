@@ -0,0 +1,133 @@
+"""Opt-in profiling of a whole CLI run (``--profile``).
+
+``RunProfiler`` combines a cProfile profile of the main thread with a wall-clock
+breakdown by phase. Phases are recorded through ``phase()``/``record_phase()``,
+which are no-ops unless a profiler is active, so instrumented code costs nothing in
+normal runs. Phase times are cumulative: with concurrent solves they can add up
+to more than the run's wall clock.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import pstats
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+LLM_SETUP_PHASE = "llm_setup"
+LM_CALL_PHASE = "lm_call"
+SCORING_PHASE = "scoring"
+ARTIFACT_WRITE_PHASE = "artifact_write"
+
+
+def tool_phase(tool_name: str) -> str:
+    return f"tool.{tool_name}"
+
+
+@dataclass
+class PhaseStats:
+    calls: int = 0
+    total_ms: float = 0.0
+
+
+@dataclass
+class PhaseTimings:
+    phases: dict[str, PhaseStats] = field(default_factory=dict)
+
+    def record(self, name: str, elapsed_ms: float) -> None:
+        stats = self.phases.setdefault(name, PhaseStats())
+        stats.calls += 1
+        stats.total_ms += elapsed_ms
+
+
+_current: ContextVar[PhaseTimings | None] = ContextVar("phase_timings", default=None)
+
+
+def record_phase(name: str, elapsed_ms: float) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.record(name, elapsed_ms)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    if _current.get() is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, (time.perf_counter() - started) * 1000)
+
+
+class RunProfiler:
+    def __init__(self) -> None:
+        self.timings = PhaseTimings()
+        self.wall_ms = 0.0
+        self._profile = cProfile.Profile()
+        self._token: Token[PhaseTimings | None] | None = None
+        self._started = 0.0
+
+    def start(self) -> None:
+        self._token = _current.set(self.timings)
+        self._started = time.perf_counter()
+        self._profile.enable()
+
+    def stop(self) -> None:
+        if self._token is None:
+            return
+        self._profile.disable()
+        self.wall_ms += (time.perf_counter() - self._started) * 1000
+        _current.reset(self._token)
+        self._token = None
+
+    @contextmanager
+    def running(self) -> Iterator[RunProfiler]:
+        self.start()
+        try:
+            yield self
+        finally:
+            self.stop()
+
+    def save(self, profile_path: Path) -> Path:
+        """Write ``<name>.prof`` (pstats/snakeviz format) and ``<name>.phases.json``."""
+        profile_path.parent.mkdir(parents=True, exist_ok=True)
+        self._profile.dump_stats(str(profile_path))
+        phases_path = profile_path.with_suffix(".phases.json")
+        phases_path.write_text(
+            json.dumps(
+                {"wall_ms": self.wall_ms, "phases": asdict(self.timings)["phases"]}, indent=2
+            ),
+            encoding="utf-8",
+        )
+        return phases_path
+
+    def phase_table(self) -> list[str]:
+        rows = [f"{'phase':<32} {'calls':>7} {'total_ms':>11} {'% wall':>7}"]
+        ordered = sorted(self.timings.phases.items(), key=lambda item: -item[1].total_ms)
+        for name, stats in ordered:
+            share = 100 * stats.total_ms / self.wall_ms if self.wall_ms else 0.0
+            rows.append(f"{name:<32} {stats.calls:>7} {stats.total_ms:>11.1f} {share:>6.1f}%")
+        rows.append(f"{'wall clock':<32} {'':>7} {self.wall_ms:>11.1f} {100.0:>6.1f}%")
+        return rows
+
+    def top_functions(self, limit: int = 20) -> str:
+        """The ``limit`` functions with the highest cumulative time."""
+        out = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=out)
+        stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        return out.getvalue()
+
+
+def print_profile_report(profiler: RunProfiler, profile_path: Path, top: int = 20) -> None:
+    print(f"Profile saved to: {profile_path}")
+    for row in profiler.phase_table():
+        print(row)
+    print(profiler.top_functions(top))
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+
+class AsyncRateLimiter:
+    """Spaces out acquisitions to at most ``per_minute`` per minute.
+
+    Evenly spaced (no bursts), which is what provider RPM limits tolerate best.
+    Slots are shared by async callers (``acquire``) and worker threads (``wait``).
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self._interval = 60.0 / per_minute
+        self._next_slot = 0.0
+        # Held only to book a slot, never while waiting for it.
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Book the next slot; returns how long to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval
+        return wait
+
+    async def acquire(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def wait(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
@@ -0,0 +1,160 @@
+"""Per-solve cost metrics (LM calls, tokens, iterations, tool time).
+
+A collector is bound to the current context with ``collect_run_metrics()``; code
+deeper in the call stack (tools, LM callbacks, the agent) records into it through
+the module functions, which are no-ops when nothing is collecting.
+"""
+
+from __future__ import annotations
+
+import functools
+import time
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from opentelemetry.trace import Span
+
+from app.core.observability_contract import AttrKey
+from app.core.pricing import estimate_cost
+from app.core.profiling import LM_CALL_PHASE, record_phase, tool_phase
+from app.core.service_metrics import LM_CALL_DURATION_S, LM_CALLS, LM_TOKENS
+from app.core.tool_telemetry import tool_call
+from app.domain.models.usage import LMCallUsage
+
+
+@dataclass
+class RunMetrics:
+    lm_calls: int = 0
+    lm_time_ms: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    # None once any LM call used a model without a known price.
+    estimated_cost_usd: float | None = 0.0
+    iterations: int = 0
+    tool_calls: dict[str, int] = field(default_factory=dict)
+    tool_time_ms: dict[str, float] = field(default_factory=dict)
+    # One entry per LM call that reported usage, in call order (one per ReAct step,
+    # plus the final extraction).
+    lm_usage: list[LMCallUsage] = field(default_factory=list)
+
+
+_current: ContextVar[RunMetrics | None] = ContextVar("run_metrics", default=None)
+
+
+@contextmanager
+def collect_run_metrics() -> Iterator[RunMetrics]:
+    metrics = RunMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+def current_run_metrics() -> RunMetrics | None:
+    return _current.get()
+
+
+def record_lm_call(elapsed_ms: float) -> None:
+    record_phase(LM_CALL_PHASE, elapsed_ms)
+    LM_CALLS.inc()
+    LM_CALL_DURATION_S.observe(elapsed_ms / 1000)
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.lm_calls += 1
+        metrics.lm_time_ms += elapsed_ms
+
+
+def record_token_usage(
+    model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0
+) -> None:
+    LM_TOKENS.inc(prompt_tokens, labels=(model, "prompt"))
+    LM_TOKENS.inc(completion_tokens, labels=(model, "completion"))
+    if cached_tokens:
+        LM_TOKENS.inc(cached_tokens, labels=(model, "cached"))
+    metrics = _current.get()
+    if metrics is None:
+        return
+    metrics.prompt_tokens += prompt_tokens
+    metrics.completion_tokens += completion_tokens
+    metrics.cached_tokens += cached_tokens
+    cost = estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens=cached_tokens)
+    metrics.lm_usage.append(
+        LMCallUsage(
+            model=model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached_tokens=cached_tokens,
+            estimated_cost_usd=cost,
+        )
+    )
+    if metrics.estimated_cost_usd is not None:
+        metrics.estimated_cost_usd = None if cost is None else metrics.estimated_cost_usd + cost
+
+
+def _cached_tokens(usage: Mapping[str, Any]) -> int:
+    details = usage.get("prompt_tokens_details")
+    if isinstance(details, Mapping) and details.get("cached_tokens"):
+        return int(details["cached_tokens"])
+    # Anthropic reports cache reads separately instead.
+    return int(usage.get("cache_read_input_tokens") or 0)
+
+
+def record_usage_entry(model: str, usage: Mapping[str, Any]) -> None:
+    """Record one LM call from its usage dict, as reported by litellm."""
+    record_token_usage(
+        model,
+        prompt_tokens=int(usage.get("prompt_tokens") or 0),
+        completion_tokens=int(usage.get("completion_tokens") or 0),
+        cached_tokens=_cached_tokens(usage),
+    )
+
+
+def set_usage_attributes(span: Span, metrics: RunMetrics) -> None:
+    span.set_attribute(AttrKey.USAGE_LM_CALLS, metrics.lm_calls)
+    span.set_attribute(AttrKey.USAGE_PROMPT_TOKENS, metrics.prompt_tokens)
+    span.set_attribute(AttrKey.USAGE_COMPLETION_TOKENS, metrics.completion_tokens)
+    span.set_attribute(AttrKey.USAGE_CACHED_TOKENS, metrics.cached_tokens)
+    if metrics.estimated_cost_usd is not None:
+        span.set_attribute(AttrKey.USAGE_COST_USD, metrics.estimated_cost_usd)
+
+
+def record_iterations(iterations: int) -> None:
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.iterations += iterations
+
+
+def record_tool_call(name: str, elapsed_ms: float) -> None:
+    record_phase(tool_phase(name), elapsed_ms)
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.tool_calls[name] = metrics.tool_calls.get(name, 0) + 1
+        metrics.tool_time_ms[name] = metrics.tool_time_ms.get(name, 0.0) + elapsed_ms
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def instrument_tool(func: F) -> F:
+    """Time every call of an agent tool into the current run metrics, in its own
+    span and in the process-wide tool statistics.
+
+    ``functools.wraps`` keeps the name, docstring and signature the agent builds
+    the tool description from.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            with tool_call(func.__name__):
+                return func(*args, **kwargs)
+        finally:
+            record_tool_call(func.__name__, (time.perf_counter() - started) * 1000)
+
+    return wrapper  # type: ignore[return-value]
@@ -0,0 +1,26 @@
+"""Index of the repeated sample being solved (``eval --samples K``).
+
+Samples of a case send the same prompts; layers that key LM calls by prompt, such
+as the cassette, read ``current_sample_index()`` to keep them apart.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_sample_index: ContextVar[int] = ContextVar("sample_index", default=0)
+
+
+@contextmanager
+def sample_scope(index: int) -> Iterator[None]:
+    token = _sample_index.set(index)
+    try:
+        yield
+    finally:
+        _sample_index.reset(token)
+
+
+def current_sample_index() -> int:
+    return _sample_index.get()
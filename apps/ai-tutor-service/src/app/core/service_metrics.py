@@ -0,0 +1,97 @@
+"""The service's always-on metrics, exposed by ``GET /metrics``.
+
+Solves are recorded by ``PhysicsService`` (``track_solve``), LM calls and tokens
+by ``run_metrics`` and tools by ``tool_telemetry``, whose per-tool statistics are
+rendered at scrape time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from app.core.deadline import DeadlineExceeded
+from app.core.metrics import REGISTRY, format_header, format_histogram, format_sample
+from app.core.tool_telemetry import TOOL_STATS
+
+SOLVE_REQUESTS = REGISTRY.counter(
+    "tutor_solve_requests_total",
+    "Solves finished, by outcome (ok, error, timeout, cancelled).",
+    ["outcome"],
+)
+SOLVE_DURATION_S = REGISTRY.histogram(
+    "tutor_solve_duration_seconds", "Wall time of PhysicsService.solve_once."
+)
+SOLVES_IN_FLIGHT = REGISTRY.gauge("tutor_solves_in_flight", "Solves currently running.")
+LM_CALLS = REGISTRY.counter("tutor_lm_calls_total", "LM calls made by the agent.")
+LM_CALL_DURATION_S = REGISTRY.histogram(
+    "tutor_lm_call_duration_seconds", "Wall time of one LM call."
+)
+LM_TOKENS = REGISTRY.counter(
+    "tutor_lm_tokens_total", "LM tokens used, by model and kind.", ["model", "kind"]
+)
+
+
+@contextmanager
+def track_solve() -> Iterator[None]:
+    SOLVES_IN_FLIGHT.inc()
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    except DeadlineExceeded:
+        outcome = "timeout"
+        raise
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        raise
+    finally:
+        SOLVES_IN_FLIGHT.dec()
+        SOLVE_DURATION_S.observe(time.perf_counter() - started)
+        SOLVE_REQUESTS.inc(labels=(outcome,))
+
+
+def _tool_metrics() -> list[str]:
+    summary = TOOL_STATS.summary()
+    calls = format_header("tutor_tool_calls_total", "Agent tool calls.", "counter")
+    errors = format_header(
+        "tutor_tool_errors_total", "Failed agent tool calls, by error type.", "counter"
+    )
+    cache = format_header(
+        "tutor_tool_cache_lookups_total", "Formula cache lookups by tools.", "counter"
+    )
+    latency = format_header(
+        "tutor_tool_duration_seconds", "Wall time of one tool call.", "histogram"
+    )
+    for tool, stats in summary.items():
+        calls.append(format_sample("tutor_tool_calls_total", {"tool": tool}, stats.calls))
+        for error_type, count in sorted(stats.errors.items()):
+            errors.append(
+                format_sample(
+                    "tutor_tool_errors_total", {"tool": tool, "error_type": error_type}, count
+                )
+            )
+        for result, count in (("hit", stats.cache_hits), ("miss", stats.cache_misses)):
+            if stats.cache_hits or stats.cache_misses:
+                cache.append(
+                    format_sample(
+                        "tutor_tool_cache_lookups_total", {"tool": tool, "result": result}, count
+                    )
+                )
+        # Tool statistics are kept in milliseconds (see ``format_tool_stats``).
+        latency.extend(
+            format_histogram(
+                "tutor_tool_duration_seconds", stats.latency.scaled(1e-3), {"tool": tool}
+            )
+        )
+    return [*calls, *errors, *cache, *latency]
+
+
+REGISTRY.register_collector(_tool_metrics)
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
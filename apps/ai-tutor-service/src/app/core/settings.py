@@ -1,21 +1,86 @@
 from __future__ import annotations
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from app.core.pricing import ModelPrice
+
+
+class RuntimeSettings(BaseSettings):
+    """Every setting except the secrets: enough to run offline or replay a cassette
+    (e.g. in CI) without an LLM or API key."""
 
-class Settings(BaseSettings):
-    llm_api_key: SecretStr = Field(alias="LLM_API_KEY")
     llm_name: str = Field(default="gemini/gemini-flash-lite-latest", alias="LLM_NAME")
     llm_api_base: str | None = Field(default=None, alias="LLM_API_BASE")
+    llm_hedge_enabled: bool = Field(default=False, alias="LLM_HEDGE_ENABLED")
+    llm_hedge_percentile: float = Field(default=0.95, gt=0.0, le=1.0, alias="LLM_HEDGE_PERCENTILE")
+    llm_hedge_min_delay_ms: int = Field(default=500, ge=0, alias="LLM_HEDGE_MIN_DELAY_MS")
+    llm_hedge_initial_delay_ms: int = Field(
+        default=10_000, ge=0, alias="LLM_HEDGE_INITIAL_DELAY_MS"
+    )
+    llm_secondary_api_base: str | None = Field(default=None, alias="LLM_SECONDARY_API_BASE")
+    # JSON object of USD per million tokens by llm_name (or bare model name), merged over
+    # the built-in table, e.g. {"gemini/gemini-2.5-flash": {"input_per_mtok": 0.3,
+    # "output_per_mtok": 2.5, "cached_input_per_mtok": 0.075}}.
+    llm_prices: dict[str, ModelPrice] = Field(default_factory=dict, alias="LLM_PRICES")
+    # Return X-Usage-* headers (tokens, LM calls, estimated cost) on solve responses.
+    usage_response_headers: bool = Field(default=False, alias="USAGE_RESPONSE_HEADERS")
     otel_project_name: str = Field(default="ai-tutor-service", alias="OTEL_PROJECT_NAME")
+    # Fraction of traces exported (root spans decide; children follow their parent).
+    otel_trace_sample_ratio: float = Field(
+        default=1.0, ge=0.0, le=1.0, alias="OTEL_TRACE_SAMPLE_RATIO"
+    )
+    otel_keep_error_traces: bool = Field(default=True, alias="OTEL_KEEP_ERROR_TRACES")
+    otel_error_trace_buffer: int = Field(default=1000, ge=1, alias="OTEL_ERROR_TRACE_BUFFER")
+    otel_export_queue_size: int = Field(default=2048, ge=1, alias="OTEL_EXPORT_QUEUE_SIZE")
+    otel_export_batch_size: int = Field(default=512, ge=1, alias="OTEL_EXPORT_BATCH_SIZE")
+    otel_export_schedule_delay_ms: int = Field(
+        default=1000, ge=1, alias="OTEL_EXPORT_SCHEDULE_DELAY_MS"
+    )
+    otel_export_timeout_ms: int = Field(default=10_000, ge=1, alias="OTEL_EXPORT_TIMEOUT_MS")
+    # Spans are not exported when unset (runner only; the service requires it).
+    phoenix_collector_endpoint: str | None = Field(default=None, alias="PHOENIX_COLLECTOR_ENDPOINT")
+    physics_program_version: str = Field(default="latest", alias="PHYSICS_PROGRAM_VERSION")
+    # Startup warm-up before /ready; the dataset's units prime the unit cache (skipped
+    # when the file is missing).
+    warmup_enabled: bool = Field(default=True, alias="WARMUP_ENABLED")
+    warmup_dataset: str = Field(
+        default="evals/physics/fuvest_descriptive_dev.jsonl", alias="WARMUP_DATASET"
+    )
+    # Default per-request solve deadline; clients may ask for another one with the
+    # X-Request-Deadline-Ms header, capped at solve_max_deadline_ms.
+    solve_deadline_ms: int = Field(default=120_000, ge=1, alias="SOLVE_DEADLINE_MS")
+    solve_max_deadline_ms: int = Field(default=300_000, ge=1, alias="SOLVE_MAX_DEADLINE_MS")
+    solve_hedge_attempts: int = Field(default=1, ge=1, alias="SOLVE_HEDGE_ATTEMPTS")
+    solve_hedge_strategy: Literal["first_valid", "vote"] = Field(
+        default="first_valid", alias="SOLVE_HEDGE_STRATEGY"
+    )
+    solve_hedge_stagger_ms: int = Field(default=0, ge=0, alias="SOLVE_HEDGE_STAGGER_MS")
+    solve_hedge_vote_quorum: int = Field(default=2, ge=1, alias="SOLVE_HEDGE_VOTE_QUORUM")
+    solve_hedge_rel_tolerance: float = Field(
+        default=0.02, ge=0.0, alias="SOLVE_HEDGE_REL_TOLERANCE"
+    )
+    solve_hedge_temperatures: list[float] = Field(
+        default_factory=list, alias="SOLVE_HEDGE_TEMPERATURES"
+    )
+    solve_hedge_models: list[str] = Field(default_factory=list, alias="SOLVE_HEDGE_MODELS")
+    model_config = SettingsConfigDict(env_file=".env", env_prefix="", env_ignore_empty=True)
+
+
+class Settings(RuntimeSettings):
+    llm_api_key: SecretStr = Field(alias="LLM_API_KEY")
     phoenix_collector_endpoint: str = Field(alias="PHOENIX_COLLECTOR_ENDPOINT")
     tutor_api_key: SecretStr = Field(alias="TUTOR_API_KEY")
-    model_config = SettingsConfigDict(env_file=".env", env_prefix="", env_ignore_empty=True)
 
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
     return Settings()  # type: ignore[missing-argument]
+
+
+@lru_cache(maxsize=1)
+def get_runtime_settings() -> RuntimeSettings:
+    return RuntimeSettings()
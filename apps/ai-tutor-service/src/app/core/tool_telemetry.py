@@ -0,0 +1,166 @@
+"""Per-call spans and in-process statistics for agent tools.
+
+``tool_call()`` wraps one tool invocation in a span and, when it ends, folds the
+call into ``TOOL_STATS`` (latency histogram, error classes, cache hits). Tools
+describe their call from the inside with ``set_tool_attribute``,
+``mark_tool_error`` and ``mark_tool_cache``. These are no-ops outside a
+``tool_call()``, so tools stay plain functions that also work when called
+directly.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from opentelemetry import trace
+from opentelemetry.util.types import AttributeValue
+
+from app.core.metrics import Histogram, HistogramSnapshot
+from app.core.observability_contract import AttrKey, SpanName
+
+
+@dataclass
+class ToolCall:
+    name: str
+    attributes: dict[str, AttributeValue] = field(default_factory=dict)
+    error_type: str | None = None
+    cache_hit: bool | None = None
+
+
+_current: ContextVar[ToolCall | None] = ContextVar("tool_call", default=None)
+
+
+def set_tool_attribute(key: AttrKey, value: AttributeValue) -> None:
+    call = _current.get()
+    if call is not None:
+        call.attributes[key] = value
+
+
+def mark_tool_error(error: BaseException | str) -> None:
+    """Record that the current call failed (tools report errors as return strings)."""
+    call = _current.get()
+    if call is not None:
+        call.error_type = error if isinstance(error, str) else type(error).__name__
+
+
+def mark_tool_cache(hit: bool) -> None:
+    call = _current.get()
+    if call is not None:
+        call.cache_hit = hit
+
+
+@dataclass(frozen=True)
+class ToolStatsSummary:
+    calls: int
+    errors: dict[str, int]
+    cache_hits: int
+    cache_misses: int
+    latency: HistogramSnapshot
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.errors.values()) / self.calls if self.calls else 0.0
+
+
+@dataclass
+class _ToolStats:
+    latency: Histogram = field(default_factory=Histogram)
+    errors: Counter[str] = field(default_factory=Counter)
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+
+class ToolStatsRegistry:
+    def __init__(self) -> None:
+        self._tools: dict[str, _ToolStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, call: ToolCall, elapsed_ms: float) -> None:
+        stats = self._tools.get(call.name)
+        if stats is None:
+            with self._lock:
+                stats = self._tools.setdefault(call.name, _ToolStats())
+        stats.latency.observe(elapsed_ms)
+        if call.error_type is None and call.cache_hit is None:
+            return
+        with self._lock:
+            if call.error_type is not None:
+                stats.errors[call.error_type] += 1
+            if call.cache_hit is True:
+                stats.cache_hits += 1
+            elif call.cache_hit is False:
+                stats.cache_misses += 1
+
+    def summary(self) -> dict[str, ToolStatsSummary]:
+        with self._lock:
+            tools = list(self._tools.items())
+        result: dict[str, ToolStatsSummary] = {}
+        for name, stats in sorted(tools):
+            latency = stats.latency.snapshot()
+            with self._lock:
+                errors = dict(stats.errors)
+                hits, misses = stats.cache_hits, stats.cache_misses
+            result[name] = ToolStatsSummary(
+                calls=latency.count,
+                errors=errors,
+                cache_hits=hits,
+                cache_misses=misses,
+                latency=latency,
+            )
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tools.clear()
+
+
+TOOL_STATS = ToolStatsRegistry()
+
+
+@contextmanager
+def tool_call(name: str) -> Iterator[ToolCall]:
+    tracer = trace.get_tracer(__name__)
+    call = ToolCall(name=name)
+    with tracer.start_as_current_span(SpanName.TOOL_CALL) as span:
+        span.set_attribute(AttrKey.TOOL_NAME, name)
+        token = _current.set(call)
+        started = time.perf_counter()
+        try:
+            yield call
+        except Exception as exc:
+            call.error_type = type(exc).__name__
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            _current.reset(token)
+            TOOL_STATS.record(call, elapsed_ms)
+
+            span.set_attributes(call.attributes)
+            span.set_attribute(AttrKey.TOOL_DURATION_MS, elapsed_ms)
+            if call.cache_hit is not None:
+                span.set_attribute(AttrKey.TOOL_CACHE_HIT, call.cache_hit)
+            if call.error_type is not None:
+                span.set_attribute(AttrKey.ERROR_TYPE, call.error_type)
+                span.set_status(trace.StatusCode.ERROR)
+
+
+def format_tool_stats(summary: dict[str, ToolStatsSummary]) -> list[str]:
+    rows = [
+        f"{'tool':<18} {'calls':>6} {'errors':>6} {'cache_hit':>9} "
+        f"{'p50_ms':>8} {'p90_ms':>8} {'p99_ms':>8}"
+    ]
+    for name, stats in summary.items():
+        lookups = stats.cache_hits + stats.cache_misses
+        hit_rate = f"{stats.cache_hits / lookups:.0%}" if lookups else "-"
+        p50, p90, p99 = (stats.latency.quantile(q) or 0.0 for q in (0.5, 0.9, 0.99))
+        rows.append(
+            f"{name:<18} {stats.calls:>6} {sum(stats.errors.values()):>6} {hit_rate:>9} "
+            f"{p50:>8.1f} {p90:>8.1f} {p99:>8.1f}"
+        )
+    return rows
@@ -0,0 +1,167 @@
+"""Head sampling that still keeps errored traces.
+
+``ErrorKeepingSampler`` samples root spans by trace-id ratio and makes children
+follow their parent. Unsampled spans are still recorded (``RECORD_ONLY``), so
+``ErrorKeepingSpanProcessor`` can buffer them per trace and forward the whole
+trace to the exporting processor when one of its spans errored. The decision is
+made when the local root span ends. Unsampled traces without errors are
+discarded.
+
+The buffer is bounded. When it is full, the oldest pending trace is dropped, so
+a slow or missing root span cannot grow memory without limit.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+from opentelemetry import trace
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter
+from opentelemetry.sdk.trace.sampling import (
+    Decision,
+    Sampler,
+    SamplingResult,
+    TraceIdRatioBased,
+)
+from opentelemetry.trace import Link, SpanContext, SpanKind, StatusCode, TraceFlags
+from opentelemetry.trace.span import TraceState
+from opentelemetry.util.types import Attributes
+
+from app.core.settings import RuntimeSettings
+
+MAX_SPANS_PER_PENDING_TRACE = 1024
+
+
+class ErrorKeepingSampler(Sampler):
+    def __init__(self, ratio: float, keep_errors: bool = True) -> None:
+        self._ratio = ratio
+        self._root = TraceIdRatioBased(ratio)
+        self._unsampled = Decision.RECORD_ONLY if keep_errors else Decision.DROP
+
+    def should_sample(
+        self,
+        parent_context: Context | None,
+        trace_id: int,
+        name: str,
+        kind: SpanKind | None = None,
+        attributes: Attributes = None,
+        links: Sequence[Link] | None = None,
+        trace_state: TraceState | None = None,
+    ) -> SamplingResult:
+        parent = trace.get_current_span(parent_context).get_span_context()
+        if parent.is_valid:
+            sampled = parent.trace_flags.sampled
+            trace_state = parent.trace_state
+        else:
+            sampled = self._root.should_sample(
+                parent_context, trace_id, name, kind, attributes, links
+            ).decision.is_sampled()
+        decision = Decision.RECORD_AND_SAMPLE if sampled else self._unsampled
+        return SamplingResult(
+            decision, attributes if decision.is_recording() else None, trace_state
+        )
+
+    def get_description(self) -> str:
+        return f"ErrorKeepingSampler{{{self._ratio}}}"
+
+
+@dataclass
+class _PendingTrace:
+    spans: list[ReadableSpan] = field(default_factory=list)
+    errored: bool = False
+
+
+def _as_sampled(span: ReadableSpan) -> ReadableSpan:
+    context = span.get_span_context()
+    if context is None:
+        return span
+    return ReadableSpan(
+        name=span.name,
+        context=SpanContext(
+            context.trace_id,
+            context.span_id,
+            context.is_remote,
+            TraceFlags(context.trace_flags | TraceFlags.SAMPLED),
+            context.trace_state,
+        ),
+        parent=span.parent,
+        resource=span.resource,
+        attributes=span.attributes,
+        events=span.events,
+        links=span.links,
+        kind=span.kind,
+        status=span.status,
+        start_time=span.start_time,
+        end_time=span.end_time,
+        instrumentation_scope=span.instrumentation_scope,
+    )
+
+
+class ErrorKeepingSpanProcessor(SpanProcessor):
+    """Forwards sampled spans to ``delegate``; unsampled ones only if their trace errored."""
+
+    def __init__(self, delegate: SpanProcessor, max_pending_traces: int = 1000) -> None:
+        self._delegate = delegate
+        self._max_pending_traces = max_pending_traces
+        self._pending: OrderedDict[int, _PendingTrace] = OrderedDict()
+        self._lock = threading.Lock()
+        self.kept_error_traces = 0
+        self.dropped_traces = 0
+
+    def on_start(self, span: Span, parent_context: Context | None = None) -> None:
+        self._delegate.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        context = span.get_span_context()
+        if context is None or context.trace_flags.sampled:
+            self._delegate.on_end(span)
+            return
+
+        is_local_root = span.parent is None or span.parent.is_remote
+        with self._lock:
+            if is_local_root:
+                pending = self._pending.pop(context.trace_id, None) or _PendingTrace()
+            else:
+                pending = self._pending.get(context.trace_id)
+                if pending is None:
+                    if len(self._pending) >= self._max_pending_traces:
+                        self._pending.popitem(last=False)
+                        self.dropped_traces += 1
+                    pending = self._pending[context.trace_id] = _PendingTrace()
+            if len(pending.spans) < MAX_SPANS_PER_PENDING_TRACE:
+                pending.spans.append(span)
+            pending.errored = pending.errored or span.status.status_code is StatusCode.ERROR
+            if not is_local_root:
+                return
+            if pending.errored:
+                self.kept_error_traces += 1
+
+        if pending.errored:
+            for pending_span in pending.spans:
+                self._delegate.on_end(_as_sampled(pending_span))
+
+    def shutdown(self) -> None:
+        self._delegate.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._delegate.force_flush(timeout_millis)
+
+
+def build_span_processor(exporter: SpanExporter, settings: RuntimeSettings) -> SpanProcessor:
+    """Background, batched export: ``span.end()`` only enqueues, and spans are dropped
+    (never blocking the caller) once ``otel_export_queue_size`` spans are waiting."""
+    batch = BatchSpanProcessor(
+        exporter,
+        max_queue_size=settings.otel_export_queue_size,
+        schedule_delay_millis=settings.otel_export_schedule_delay_ms,
+        max_export_batch_size=settings.otel_export_batch_size,
+        export_timeout_millis=settings.otel_export_timeout_ms,
+    )
+    if settings.otel_trace_sample_ratio >= 1.0 or not settings.otel_keep_error_traces:
+        return batch
+    return ErrorKeepingSpanProcessor(batch, max_pending_traces=settings.otel_error_trace_buffer)
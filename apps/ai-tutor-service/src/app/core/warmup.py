@@ -0,0 +1,74 @@
+"""Startup warm-up and the readiness it gates.
+
+The server accepts connections right away (``/health``), but reports ready
+(``/ready``) only after the warm-up ran: imports, cache priming and a tool
+self-test that would otherwise be paid by the first requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Literal
+
+logger = logging.getLogger(__name__)
+
+ReadinessStatus = Literal["starting", "warming_up", "ready", "failed"]
+
+
+@dataclass
+class WarmupReport:
+    steps_ms: dict[str, float] = field(default_factory=dict)
+    # Self-test failures: the service must not report ready.
+    failures: list[str] = field(default_factory=list)
+    # Best-effort steps that failed; the service still works, only colder.
+    warnings: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps_ms[name] = round((time.perf_counter() - started) * 1000, 1)
+
+
+class Readiness:
+    def __init__(self, status: ReadinessStatus = "starting") -> None:
+        self.status: ReadinessStatus = status
+        self.report: WarmupReport | None = None
+        self.error: str | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    async def warm_up(self, warmup: Callable[[], WarmupReport]) -> None:
+        """Run ``warmup`` in a worker thread, so the event loop keeps serving."""
+        self.status = "warming_up"
+        started = time.perf_counter()
+        try:
+            report = await asyncio.to_thread(warmup)
+        except Exception as exc:
+            self.status = "failed"
+            self.error = f"{type(exc).__name__}: {exc}"
+            logger.exception("[warmup] failed")
+            return
+        self.report = report
+        self.status = "ready" if report.ok else "failed"
+        logger.info(
+            "[warmup] %s in %sms steps=%s failures=%s warnings=%s",
+            self.status,
+            round((time.perf_counter() - started) * 1000),
+            report.steps_ms,
+            report.failures,
+            report.warnings,
+        )
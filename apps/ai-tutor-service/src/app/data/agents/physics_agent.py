@@ -1,29 +1,181 @@
 from __future__ import annotations
 
-from typing import Protocol, cast
+import hashlib
+import json
+import logging
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Protocol, cast
 
 import dspy
+from opentelemetry import trace
 
 from app.application.ports.physics_port import PhysicsPort
 from app.application.signatures.physics_signature import PhysicsSignature
+from app.core.deadline import check_deadline, remaining_s
+from app.core.observability_contract import AttrKey
+from app.core.run_metrics import instrument_tool, record_iterations, record_usage_entry
+from app.data.agents.program_store import BASE_VERSION, ProgramUsageStats
+from app.data.agents.trajectory import (
+    TrajectoryCompactionConfig,
+    compact_trajectory,
+    track_compaction,
+)
+from app.data.dspy.lm_metrics import LM_TIMING_CALLBACK
 from app.data.tools.physics_tools import calculate, convert_unit, evaluate_formula, solve_formula
 from app.domain.models.physics import PhysicsQuestion, PhysicsSolution
 
+logger = logging.getLogger(__name__)
+
+
+class CompactingReAct(dspy.ReAct):
+    """ReAct that formats a compacted view of the trajectory into each prompt."""
+
+    def __init__(
+        self,
+        *args: Any,
+        compaction: TrajectoryCompactionConfig | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.compaction = compaction or TrajectoryCompactionConfig()
+
+    def _format_trajectory(self, trajectory: dict[str, Any]):
+        return super()._format_trajectory(compact_trajectory(trajectory, self.compaction))
+
+    async def _async_call_with_potential_trajectory_truncation(
+        self, module: dspy.Module, trajectory: dict[str, Any], **input_args: Any
+    ):
+        # Runs once per ReAct step and for the final extraction: a solve past its
+        # deadline stops before paying for the next LM call. The call itself is
+        # cancelled by the caller's ``asyncio.timeout``; a per-call LM ``timeout``
+        # would be part of dspy's cache key and defeat the LM cache.
+        check_deadline()
+        return await super()._async_call_with_potential_trajectory_truncation(
+            module, trajectory, **input_args
+        )
+
 
 class PhysicsAgent(PhysicsPort):
-    def __init__(self) -> None:
-        self._predictor = dspy.ReAct(
+    def __init__(
+        self,
+        compaction: TrajectoryCompactionConfig | None = None,
+        lm: dspy.BaseLM | None = None,
+    ) -> None:
+        # ``lm`` overrides the globally configured LM for this agent only (e.g. a
+        # hedge attempt with another model or temperature).
+        self._lm = lm
+        self._compaction = compaction
+        # (version, predictor) is swapped as a single reference so in-flight solves
+        # keep the program they started with.
+        self._program: tuple[str, CompactingReAct] = (BASE_VERSION, self._build_predictor())
+        self.usage_stats: dict[str, ProgramUsageStats] = {BASE_VERSION: ProgramUsageStats()}
+
+    def _build_predictor(self) -> CompactingReAct:
+        return CompactingReAct(
             PhysicsSignature,
-            tools=[calculate, convert_unit, evaluate_formula, solve_formula],
+            tools=[
+                instrument_tool(tool)
+                for tool in (calculate, convert_unit, evaluate_formula, solve_formula)
+            ],
             max_iters=8,
+            compaction=self._compaction,
         )
 
-    async def solve(self, question: PhysicsQuestion) -> PhysicsSolution:
-        pred = cast(
-            _PhysicsPred,
-            await self._predictor.acall(
-                question=question.text, reference_data=question.reference_data
+    @property
+    def program_version(self) -> str:
+        return self._program[0]
+
+    @property
+    def program(self) -> dspy.Module:
+        return self._program[1]
+
+    def fingerprint(self) -> str:
+        """Hash of everything that shapes this agent's prompts: signature, tools,
+        compaction settings and the active program (instructions and demos)."""
+        version, predictor = self._program
+        payload = {
+            "program_version": version,
+            "tools": sorted(
+                (tool.name, tool.desc or "", json.dumps(tool.args, sort_keys=True, default=str))
+                for tool in predictor.tools.values()
             ),
+            "max_iters": predictor.max_iters,
+            "compaction": asdict(predictor.compaction),
+            "predictors": {name: p.dump_state() for name, p in predictor.named_predictors()},
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def load_program(self, version: str, path: Path | None) -> None:
+        """Hot-swap the ReAct program; ``path=None`` restores the uncompiled one."""
+        predictor = self._build_predictor()
+        if path is not None:
+            predictor.load(str(path))
+        self.usage_stats.setdefault(version, ProgramUsageStats())
+        self._program = (version, predictor)
+
+    def warm_up(self) -> None:
+        """Format the ReAct and extraction prompts once, so adapter and signature setup
+        is not paid by the first request. Makes no LM call."""
+        _, predictor = self._program
+        adapter = dspy.settings.adapter or dspy.JSONAdapter()
+        inputs = {"question": "warm-up", "reference_data": None, "trajectory": ""}
+        for step in (predictor.react, predictor.extract.predict):
+            adapter.format(step.signature, demos=step.demos, inputs=inputs)
+
+    async def solve(self, question: PhysicsQuestion) -> PhysicsSolution:
+        # A hedge attempt launched late, or a queued request, must not start paying
+        # for LM calls once the request's deadline has passed (CompactingReAct checks
+        # again before every step).
+        check_deadline()
+        remaining = remaining_s()
+        if remaining is not None:
+            trace.get_current_span().set_attribute(
+                AttrKey.DEADLINE_REMAINING_MS, round(remaining * 1000)
+            )
+        version, predictor = self._program
+        started = time.perf_counter()
+        overrides: dict[str, Any] = {
+            "callbacks": [*dspy.settings.get("callbacks", []), LM_TIMING_CALLBACK]
+        }
+        if self._lm is not None:
+            overrides["lm"] = self._lm
+        with (
+            dspy.context(**overrides),
+            track_compaction() as compaction_stats,
+            dspy.track_usage() as usage,
+        ):
+            try:
+                pred = cast(
+                    _PhysicsPred,
+                    await predictor.acall(
+                        question=question.text, reference_data=question.reference_data
+                    ),
+                )
+            finally:
+                # Failed, timed-out and cancelled solves paid for their LM calls too.
+                # ``usage_data`` keeps one entry per call, so steps are recorded separately.
+                for model, entries in usage.usage_data.items():
+                    for entry in entries:
+                        record_usage_entry(model, entry)
+        record_iterations(sum(1 for key in pred.trajectory if key.startswith("tool_name_")))
+        self.usage_stats[version].record(
+            latency_ms=(time.perf_counter() - started) * 1000,
+            trajectory_tokens=compaction_stats.compacted_tokens,
+        )
+
+        span = trace.get_current_span()
+        span.set_attribute(AttrKey.PROGRAM_VERSION, version)
+        span.set_attribute(AttrKey.TRAJECTORY_TOKENS_ORIGINAL, compaction_stats.original_tokens)
+        span.set_attribute(AttrKey.TRAJECTORY_TOKENS_SAVED, compaction_stats.tokens_saved)
+        logger.info(
+            "[agent] trajectory compaction saved ~%s tokens (%s -> %s over %s prompts)",
+            compaction_stats.tokens_saved,
+            compaction_stats.original_tokens,
+            compaction_stats.compacted_tokens,
+            compaction_stats.calls,
         )
 
         return PhysicsSolution(
@@ -34,6 +186,7 @@ class PhysicsAgent(PhysicsPort):
 
 
 class _PhysicsPred(Protocol):
+    trajectory: dict[str, Any]
     reasoning: str
     value: float
     unit: str
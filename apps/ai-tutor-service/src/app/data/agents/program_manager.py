@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Sequence
+
+from app.application.ports.program_port import ProgramPort
+from app.data.agents.physics_agent import PhysicsAgent
+from app.data.agents.program_store import BASE_VERSION, ProgramStore, program_prompt_tokens
+from app.domain.models.program import ProgramVersion
+
+logger = logging.getLogger(__name__)
+
+
+class PhysicsProgramManager(ProgramPort):
+    """Loads stored program versions into one or more running agents."""
+
+    def __init__(self, store: ProgramStore, agents: Sequence[PhysicsAgent]) -> None:
+        if not agents:
+            raise ValueError("PhysicsProgramManager needs at least one agent")
+        self._store = store
+        self._agents = list(agents)
+        self._lock = threading.Lock()
+
+    def active_version(self) -> str:
+        return self._agents[0].program_version
+
+    def _describe_base(self) -> ProgramVersion:
+        num_demos, prompt_tokens = program_prompt_tokens(self._agents[0].program)
+        return ProgramVersion(
+            version=BASE_VERSION, num_demos=num_demos, prompt_tokens=prompt_tokens
+        )
+
+    def list_versions(self) -> list[ProgramVersion]:
+        active = self.active_version()
+        versions = [self._describe_base(), *self._store.list_versions()]
+        primary = self._agents[0]
+        for version in versions:
+            version.active = version.version == active
+            stats = primary.usage_stats.get(version.version)
+            if stats is not None:
+                version.stats = stats.snapshot()
+        return versions
+
+    def activate(self, version: str) -> ProgramVersion:
+        with self._lock:
+            resolved = self._store.resolve(version)
+            path = None if resolved == BASE_VERSION else self._store.program_path(resolved)
+            for agent in self._agents:
+                agent.load_program(resolved, path)
+            logger.info("[programs] activated program version %s", resolved)
+
+        return next(v for v in self.list_versions() if v.version == resolved)
@@ -0,0 +1,140 @@
+"""Versioned on-disk storage for compiled (optimized) DSPy programs.
+
+Layout::
+
+    .artifacts/programs/<agent>/<version>/program.json   # dspy Module state
+    .artifacts/programs/<agent>/<version>/meta.json      # ProgramVersion metadata
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from collections import deque
+from datetime import UTC, datetime
+from pathlib import Path
+
+import dspy
+
+from app.data.agents.trajectory import estimate_tokens
+from app.domain.models.program import ProgramStats, ProgramVersion
+
+BASE_VERSION = "base"
+PROGRAM_FILE = "program.json"
+META_FILE = "meta.json"
+# Versions name a directory under the store root: no separators, no leading dot.
+VERSION_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]{0,63}")
+
+
+def default_programs_dir() -> Path:
+    # cwd is `apps/ai-tutor-service` when called via Nx target
+    return Path(".artifacts") / "programs"
+
+
+def program_prompt_tokens(program: dspy.Module) -> tuple[int, int]:
+    """Estimate the static prompt size (instructions + demos) of a program.
+
+    Returns ``(num_demos, prompt_tokens)``.
+    """
+    num_demos = 0
+    tokens = 0
+    for _, predictor in program.named_predictors():
+        tokens += estimate_tokens(predictor.signature.instructions)
+        for demo in predictor.demos:
+            num_demos += 1
+            tokens += estimate_tokens(json.dumps(dict(demo), ensure_ascii=False, default=str))
+    return num_demos, tokens
+
+
+class ProgramUsageStats:
+    """Latency and trajectory size of solves served by one program version."""
+
+    def __init__(self, window: int = 500) -> None:
+        self.solves = 0
+        self._latency_sum_ms = 0.0
+        self._trajectory_tokens_sum = 0
+        self._latencies_ms: deque[float] = deque(maxlen=window)
+
+    def record(self, latency_ms: float, trajectory_tokens: int) -> None:
+        self.solves += 1
+        self._latency_sum_ms += latency_ms
+        self._trajectory_tokens_sum += trajectory_tokens
+        self._latencies_ms.append(latency_ms)
+
+    def snapshot(self) -> ProgramStats:
+        if self.solves == 0:
+            return ProgramStats()
+        latencies = sorted(self._latencies_ms)
+        p90_rank = max(math.ceil(0.9 * len(latencies)) - 1, 0)
+        return ProgramStats(
+            solves=self.solves,
+            avg_latency_ms=self._latency_sum_ms / self.solves,
+            p90_latency_ms=latencies[p90_rank],
+            avg_trajectory_tokens=self._trajectory_tokens_sum / self.solves,
+        )
+
+
+class ProgramStore:
+    def __init__(self, root: Path | None = None, agent: str = "physics_agent") -> None:
+        self.root = (root or default_programs_dir()) / agent
+
+    def _version_dir(self, version: str) -> Path:
+        if not VERSION_PATTERN.fullmatch(version):
+            raise ValueError(f"Invalid program version: {version!r}")
+        return self.root / version
+
+    def program_path(self, version: str) -> Path:
+        return self._version_dir(version) / PROGRAM_FILE
+
+    def save(self, program: dspy.Module, version: str | None = None) -> ProgramVersion:
+        created_at = datetime.now(tz=UTC)
+        version = version or created_at.strftime("%Y%m%dT%H%M%SZ")
+        if version == BASE_VERSION:
+            raise ValueError(f"'{BASE_VERSION}' is reserved for the uncompiled program")
+
+        version_dir = self._version_dir(version)
+        if version_dir.exists():
+            raise FileExistsError(f"Program version already exists: {version}")
+        version_dir.mkdir(parents=True)
+
+        program.save(str(version_dir / PROGRAM_FILE))
+        num_demos, prompt_tokens = program_prompt_tokens(program)
+        meta = ProgramVersion(
+            version=version,
+            created_at=created_at,
+            num_demos=num_demos,
+            prompt_tokens=prompt_tokens,
+        )
+        (version_dir / META_FILE).write_text(
+            meta.model_dump_json(include={"version", "created_at", "num_demos", "prompt_tokens"}),
+            encoding="utf-8",
+        )
+        return meta
+
+    def list_versions(self) -> list[ProgramVersion]:
+        if not self.root.exists():
+            return []
+        versions = [
+            ProgramVersion.model_validate_json(meta_path.read_text(encoding="utf-8"))
+            for meta_path in self.root.glob(f"*/{META_FILE}")
+        ]
+        return sorted(versions, key=lambda v: v.created_at or datetime.min.replace(tzinfo=UTC))
+
+    def latest_version(self) -> str | None:
+        versions = self.list_versions()
+        return versions[-1].version if versions else None
+
+    def resolve(self, version: str) -> str:
+        """Resolve ``latest`` and validate that a stored version exists.
+
+        Raises ``ValueError`` for a malformed version, ``KeyError`` for an unknown one.
+        """
+        if version == BASE_VERSION:
+            return version
+        if version == "latest":
+            latest = self.latest_version()
+            return latest if latest is not None else BASE_VERSION
+        if not self.program_path(version).exists():
+            raise KeyError(f"Unknown program version: {version}")
+        return version
@@ -0,0 +1,202 @@
+"""Trajectory compaction for the DSPy ReAct loop.
+
+Every ReAct iteration re-sends the whole trajectory (thoughts, tool calls and
+observations) to the LM.  The helpers below build a compacted *view* of that
+trajectory right before it is formatted into the prompt; the original dict kept
+by ``dspy.ReAct`` is never mutated, so the final prediction still carries the
+full trajectory.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.unit_registry import UnitQuantity, ureg
+
+_STEP_KEY_RE = re.compile(r"^(thought|tool_name|tool_args|observation)_(\d+)$")
+_FAILED_OBSERVATION_RE = re.compile(r"^\s*(error|execution error|missing variables)", re.IGNORECASE)
+_QUANTITY_RE = re.compile(r"^\s*[-+]?(\d|\.\d)")
+
+# Named SI units preferred over their base-unit expansion (e.g. "98 N" instead of
+# "98 kg*m/s**2").  Order matters when two units share a dimensionality.
+_PREFERRED_SI_UNITS = ("N", "J", "W", "Pa", "C", "V", "ohm", "F", "T", "Wb", "H")
+
+
+@dataclass(frozen=True)
+class TrajectoryCompactionConfig:
+    keep_recent_steps: int = 2
+    max_thought_chars: int = 160
+    max_observation_chars: int = 240
+    significant_digits: int = 6
+    normalize_quantities: bool = True
+    drop_failed_steps: bool = True
+
+
+@dataclass
+class TrajectoryCompactionStats:
+    calls: int = 0
+    original_tokens: int = 0
+    compacted_tokens: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.compacted_tokens
+
+
+_current_stats: ContextVar[TrajectoryCompactionStats | None] = ContextVar(
+    "trajectory_compaction_stats", default=None
+)
+
+
+@contextmanager
+def track_compaction() -> Iterator[TrajectoryCompactionStats]:
+    """Collect compaction stats for every trajectory formatted inside the block."""
+    stats = TrajectoryCompactionStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap provider-agnostic token estimate (~4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def compact_quantity_text(text: str, significant_digits: int = 6) -> str:
+    """Rewrite a pint quantity string in a compact SI form.
+
+    Returns the input unchanged when it is not a parseable quantity.
+
+    Examples:
+        >>> compact_quantity_text("2.4000000000000004 electron_volt * hertz * second")
+        '2.4 eV'
+        >>> compact_quantity_text("98.0 kilogram * meter / second ** 2")
+        '98 N'
+    """
+    if not _QUANTITY_RE.match(text):
+        return text
+    try:
+        quantity = UnitQuantity(text)
+    except Exception:
+        return text
+    if not isinstance(quantity, UnitQuantity):
+        return text
+
+    try:
+        quantity = quantity.to_reduced_units()
+        unit_items = quantity.unit_items()
+        fractional = any(not float(exponent).is_integer() for _, exponent in unit_items)
+        if len(unit_items) > 1 or fractional:
+            base = quantity.to_base_units()
+            for unit in _PREFERRED_SI_UNITS:
+                if base.dimensionality == ureg(unit).dimensionality:
+                    quantity = base.to(unit)
+                    break
+            else:
+                if len(unit_items) > 2 or fractional:
+                    quantity = base
+    except Exception:
+        return text
+
+    magnitude = f"{quantity.magnitude:.{significant_digits}g}"
+    units = f"{quantity.units:~C}"
+    return f"{magnitude} {units}" if units else magnitude
+
+
+def compact_observation(observation: Any, config: TrajectoryCompactionConfig) -> Any:
+    if not isinstance(observation, str) or not config.normalize_quantities:
+        return observation
+
+    stripped = observation.strip()
+    if stripped.startswith("["):
+        try:
+            items = json.loads(stripped)
+        except json.JSONDecodeError:
+            return observation
+        if isinstance(items, list) and all(isinstance(item, str) for item in items):
+            return json.dumps(
+                [compact_quantity_text(item, config.significant_digits) for item in items]
+            )
+        return observation
+
+    return compact_quantity_text(stripped, config.significant_digits)
+
+
+def _is_failed(observation: Any) -> bool:
+    return isinstance(observation, str) and bool(_FAILED_OBSERVATION_RE.match(observation))
+
+
+def _truncate(value: Any, max_chars: int) -> Any:
+    if not isinstance(value, str) or len(value) <= max_chars:
+        return value
+    return value[: max(max_chars - 1, 0)] + "…"
+
+
+def _serialized_tokens(trajectory: dict[str, Any]) -> int:
+    return sum(estimate_tokens(f"{key}: {value}") for key, value in trajectory.items())
+
+
+def compact_trajectory(
+    trajectory: dict[str, Any],
+    config: TrajectoryCompactionConfig | None = None,
+) -> dict[str, Any]:
+    """Return a compacted copy of a ReAct trajectory.
+
+    - tool observations are normalized to compact SI quantity strings;
+    - failed steps are dropped once a later step succeeded;
+    - thoughts and observations older than ``keep_recent_steps`` are truncated.
+    """
+    config = config or TrajectoryCompactionConfig()
+
+    steps: dict[int, dict[str, Any]] = {}
+    passthrough: dict[str, Any] = {}
+    for key, value in trajectory.items():
+        match = _STEP_KEY_RE.match(key)
+        if match is None:
+            passthrough[key] = value
+            continue
+        steps.setdefault(int(match.group(2)), {})[match.group(1)] = value
+
+    indices = sorted(steps)
+    succeeded_after: set[int] = set()
+    seen_success = False
+    for index in reversed(indices):
+        if seen_success:
+            succeeded_after.add(index)
+        if "observation" in steps[index] and not _is_failed(steps[index]["observation"]):
+            seen_success = True
+
+    recent = set(indices[-config.keep_recent_steps :]) if config.keep_recent_steps > 0 else set()
+
+    compacted: dict[str, Any] = dict(passthrough)
+    for index in indices:
+        step = steps[index]
+        failed = _is_failed(step.get("observation"))
+        if config.drop_failed_steps and failed and index in succeeded_after:
+            continue
+
+        for field, value in step.items():
+            if field == "observation" and not failed:
+                value = compact_observation(value, config)
+            if index not in recent:
+                if field == "thought":
+                    value = _truncate(value, config.max_thought_chars)
+                elif field == "observation":
+                    value = _truncate(value, config.max_observation_chars)
+            compacted[f"{field}_{index}"] = value
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.calls += 1
+        stats.original_tokens += _serialized_tokens(trajectory)
+        stats.compacted_tokens += _serialized_tokens(compacted)
+
+    return compacted
@@ -0,0 +1,118 @@
+"""On-disk prompt→completion cassette used to record and replay LM calls.
+
+Entries are stored as gzip-compressed JSON lines (one gzip member per append),
+keyed by a stable hash of the model, prompt/messages and call kwargs.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Literal
+
+CassetteMode = Literal["record", "replay"]
+
+# Call kwargs that never change the completion (credentials, transport tweaks).
+_IGNORED_KWARG_PREFIXES = ("api_",)
+_IGNORED_KWARGS = {"num_retries", "cache", "timeout"}
+
+
+class CassetteMissError(LookupError):
+    pass
+
+
+def cassette_key(
+    model: str,
+    prompt: str | None,
+    messages: list[dict[str, Any]] | None,
+    kwargs: dict[str, Any],
+    sample_index: int = 0,
+) -> str:
+    relevant_kwargs = {
+        key: value
+        for key, value in kwargs.items()
+        if key not in _IGNORED_KWARGS and not key.startswith(_IGNORED_KWARG_PREFIXES)
+    }
+    request: dict[str, Any] = {
+        "model": model,
+        "prompt": prompt,
+        "messages": messages,
+        "kwargs": relevant_kwargs,
+    }
+    # Repeated samples of the same prompt get their own entries; the first sample
+    # keeps the key it always had, so existing cassettes still replay.
+    if sample_index:
+        request["sample_index"] = sample_index
+    payload = json.dumps(
+        request,
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def compact_response(response: dict[str, Any]) -> dict[str, Any]:
+    """Keep only the parts of a chat completion needed to replay it."""
+    choices = []
+    for choice in response.get("choices") or []:
+        message = choice.get("message") or {}
+        choices.append(
+            {
+                "index": choice.get("index", 0),
+                "finish_reason": choice.get("finish_reason"),
+                "message": {
+                    key: message[key]
+                    for key in ("role", "content", "tool_calls")
+                    if message.get(key) is not None
+                },
+            }
+        )
+    compacted: dict[str, Any] = {"model": response.get("model"), "choices": choices}
+    if response.get("usage"):
+        compacted["usage"] = response["usage"]
+    return compacted
+
+
+class CassetteStore:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if path.exists():
+            with gzip.open(path, "rt", encoding="utf-8") as cassette:
+                for line in cassette:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    entry = json.loads(line)
+                    self._entries[entry["key"]] = entry["response"]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> dict[str, Any]:
+        try:
+            return self._entries[key]
+        except KeyError:
+            raise CassetteMissError(
+                f"No recorded LM response for key {key} in cassette {self.path}"
+            ) from None
+
+    def put(self, key: str, response: dict[str, Any]) -> None:
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = response
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            line = json.dumps(
+                {"key": key, "response": response}, ensure_ascii=False, separators=(",", ":")
+            )
+            with gzip.open(self.path, "at", encoding="utf-8") as cassette:
+                cassette.write(line + "\n")
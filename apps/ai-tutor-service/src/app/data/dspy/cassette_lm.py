@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import Any
+
+import dspy
+from litellm import ModelResponse
+
+from app.core.sampling import current_sample_index
+from app.data.dspy.cassette import CassetteMode, CassetteStore, cassette_key, compact_response
+
+
+class CassetteLM(dspy.BaseLM):
+    """Record/replay wrapper around a real LM.
+
+    In ``record`` mode every call goes to ``inner`` and the completion is stored;
+    in ``replay`` mode completions are served from the cassette only, without
+    network, and a missing entry raises ``CassetteMissError``.
+    """
+
+    def __init__(
+        self,
+        store: CassetteStore,
+        *,
+        mode: CassetteMode,
+        model: str,
+        inner: dspy.BaseLM | None = None,
+    ) -> None:
+        if mode == "record" and inner is None:
+            raise ValueError("Recording a cassette requires an inner LM")
+        super().__init__(model=model, model_type="chat", cache=False)
+        self.store = store
+        self.mode = mode
+        self.inner = inner
+        if inner is not None:
+            self.kwargs = dict(inner.kwargs)
+
+    def copy(self, **kwargs: Any) -> CassetteLM:
+        # ``BaseLM.copy`` deep-copies, which fails on the store's lock and would record
+        # into a throwaway store; copies share this one.
+        inner = self.inner.copy(**kwargs) if self.inner is not None else None
+        return CassetteLM(self.store, mode=self.mode, model=self.model, inner=inner)
+
+    def _key(self, prompt, messages, kwargs: dict[str, Any]) -> str:
+        return cassette_key(self.model, prompt, messages, kwargs, current_sample_index())
+
+    def _replay(self, key: str) -> ModelResponse:
+        response = ModelResponse(**self.store.get(key))
+        usage_tracker = dspy.settings.usage_tracker
+        if usage_tracker and getattr(response, "usage", None):
+            usage_tracker.add_usage(self.model, dict(response.usage))
+        return response
+
+    def _record(self, key: str, response: Any) -> Any:
+        self.store.put(key, compact_response(response.model_dump()))
+        return response
+
+    def forward(self, prompt=None, messages=None, **kwargs):
+        key = self._key(prompt, messages, kwargs)
+        if self.mode == "replay":
+            return self._replay(key)
+        assert self.inner is not None
+        return self._record(key, self.inner.forward(prompt=prompt, messages=messages, **kwargs))
+
+    async def aforward(self, prompt=None, messages=None, **kwargs):
+        key = self._key(prompt, messages, kwargs)
+        if self.mode == "replay":
+            return self._replay(key)
+        assert self.inner is not None
+        response = await self.inner.aforward(prompt=prompt, messages=messages, **kwargs)
+        return self._record(key, response)
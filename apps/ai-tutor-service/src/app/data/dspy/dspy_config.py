@@ -1,24 +1,55 @@
+from pathlib import Path
+
 import dspy
 from dspy.utils import DummyLM
 
-from app.core.settings import Settings
+from app.core.settings import RuntimeSettings, Settings
+from app.data.dspy.cassette import CassetteMode, CassetteStore
+from app.data.dspy.cassette_lm import CassetteLM
+from app.data.dspy.hedged_lm import HedgedLM
+from app.data.dspy.hedging import LatencyTracker
 
 _configured = False
 
 
-def configure_dspy(settings: Settings) -> None:
-    global _configured
-    if _configured:
-        return
+def build_lm(
+    settings: Settings,
+    *,
+    model: str | None = None,
+    temperature: float | None = None,
+) -> dspy.LM:
+    extra_kwargs = {} if temperature is None else {"temperature": temperature}
+    if settings.llm_hedge_enabled:
+        tracker = LatencyTracker(
+            percentile=settings.llm_hedge_percentile,
+            min_delay_s=settings.llm_hedge_min_delay_ms / 1000,
+            initial_delay_s=settings.llm_hedge_initial_delay_ms / 1000,
+        )
+        return HedgedLM(
+            model or settings.llm_name,
+            tracker=tracker,
+            secondary_api_base=settings.llm_secondary_api_base,
+            api_key=settings.llm_api_key.get_secret_value(),
+            api_base=settings.llm_api_base,
+            num_retries=1,
+            **extra_kwargs,
+        )
 
-    lm = dspy.LM(
-        settings.llm_name,
+    return dspy.LM(
+        model or settings.llm_name,
         api_key=settings.llm_api_key.get_secret_value(),
         api_base=settings.llm_api_base,
         num_retries=1,
+        **extra_kwargs,
     )
 
-    dspy.configure(lm=lm, adapter=dspy.JSONAdapter())
+
+def configure_dspy(settings: Settings) -> None:
+    global _configured
+    if _configured:
+        return
+
+    dspy.configure(lm=build_lm(settings), adapter=dspy.JSONAdapter())
     _configured = True
 
 
@@ -34,3 +65,21 @@ def configure_dspy_offline() -> None:
     }
     dspy.configure(lm=DummyLM({"": dummy_answer}), adapter=dspy.JSONAdapter())
     _configured = True
+
+
+def configure_dspy_cassette(
+    settings: RuntimeSettings, cassette_path: Path, mode: CassetteMode
+) -> None:
+    """Record needs the full ``Settings`` (the LLM key); replay only the model name."""
+    global _configured
+    if _configured:
+        return
+
+    inner = None
+    if mode == "record":
+        if not isinstance(settings, Settings):
+            raise ValueError("Recording a cassette requires the LLM settings")
+        inner = build_lm(settings)
+    lm = CassetteLM(CassetteStore(cassette_path), mode=mode, model=settings.llm_name, inner=inner)
+    dspy.configure(lm=lm, adapter=dspy.JSONAdapter())
+    _configured = True
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from typing import Any
+
+import dspy
+
+from app.data.dspy.hedging import LatencyTracker, hedged_call, hedged_call_sync
+
+
+class HedgedLM(dspy.LM):
+    """``dspy.LM`` that hedges slow provider calls.
+
+    When a call is slower than the tracker's percentile deadline, a duplicate is
+    issued (to ``secondary_api_base`` when set) and the first response wins.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        *,
+        tracker: LatencyTracker | None = None,
+        secondary_api_base: str | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(model, **kwargs)
+        self.tracker = tracker or LatencyTracker()
+        self.secondary_api_base = secondary_api_base
+
+    def _backup_kwargs(self, kwargs: dict[str, Any]) -> dict[str, Any]:
+        if self.secondary_api_base is None:
+            return kwargs
+        return {**kwargs, "api_base": self.secondary_api_base}
+
+    def forward(self, prompt=None, messages=None, **kwargs):
+        backup_kwargs = self._backup_kwargs(kwargs)
+        return hedged_call_sync(
+            lambda: super(HedgedLM, self).forward(prompt=prompt, messages=messages, **kwargs),
+            lambda: super(HedgedLM, self).forward(
+                prompt=prompt, messages=messages, **backup_kwargs
+            ),
+            self.tracker,
+        )
+
+    async def aforward(self, prompt=None, messages=None, **kwargs):
+        backup_kwargs = self._backup_kwargs(kwargs)
+        return await hedged_call(
+            lambda: super(HedgedLM, self).aforward(prompt=prompt, messages=messages, **kwargs),
+            lambda: super(HedgedLM, self).aforward(
+                prompt=prompt, messages=messages, **backup_kwargs
+            ),
+            self.tracker,
+        )
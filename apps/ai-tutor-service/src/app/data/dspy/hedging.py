@@ -0,0 +1,152 @@
+"""Request hedging for slow LM provider responses.
+
+If a call has not returned by the tracked latency percentile, a duplicate is
+issued and whichever finishes first (successfully) wins; the other is cancelled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_SYNC_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="lm-hedge")
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies used to derive the hedge deadline.
+
+    Lock-free on purpose (``deque.append`` is atomic) so LM instances holding a
+    tracker stay deep-copyable.
+    """
+
+    def __init__(
+        self,
+        *,
+        percentile: float = 0.95,
+        window: int = 200,
+        min_samples: int = 20,
+        min_delay_s: float = 0.5,
+        initial_delay_s: float = 10.0,
+    ) -> None:
+        if not 0.0 < percentile <= 1.0:
+            raise ValueError("percentile must be in (0, 1]")
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay_s = min_delay_s
+        self.initial_delay_s = initial_delay_s
+        self._samples: deque[float] = deque(maxlen=window)
+        self.calls = 0
+        self.hedged_calls = 0
+        self.backup_wins = 0
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def hedge_delay(self) -> float:
+        samples = sorted(self._samples)
+        if len(samples) < self.min_samples:
+            return self.initial_delay_s
+        rank = max(math.ceil(self.percentile * len(samples)) - 1, 0)
+        return max(samples[rank], self.min_delay_s)
+
+
+async def hedged_call(
+    primary: Callable[[], Awaitable[T]],
+    backup: Callable[[], Awaitable[T]],
+    tracker: LatencyTracker,
+) -> T:
+    """Await ``primary``; if it is slower than the hedge delay, race it with ``backup``."""
+    tracker.calls += 1
+    started = time.perf_counter()
+    primary_task = asyncio.ensure_future(primary())
+    try:
+        done, _ = await asyncio.wait({primary_task}, timeout=tracker.hedge_delay())
+    except BaseException:
+        primary_task.cancel()
+        raise
+    if done:
+        # Only successes feed the window: fast failures (auth errors, 429s) would pull
+        # the percentile down and hedge early just when the provider is throttling.
+        if primary_task.exception() is None:
+            tracker.record(time.perf_counter() - started)
+        return primary_task.result()
+
+    tracker.hedged_calls += 1
+    backup_task = asyncio.ensure_future(backup())
+    pending = {primary_task, backup_task}
+    first_error: BaseException | None = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                exc = task.exception()
+                if exc is not None:
+                    first_error = first_error or exc
+                    continue
+                if task is backup_task:
+                    tracker.backup_wins += 1
+                tracker.record(time.perf_counter() - started)
+                logger.debug(
+                    "[lm-hedge] %s won after %.3fs",
+                    "backup" if task is backup_task else "primary",
+                    time.perf_counter() - started,
+                )
+                return task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+    assert first_error is not None
+    raise first_error
+
+
+def hedged_call_sync(
+    primary: Callable[[], T],
+    backup: Callable[[], T],
+    tracker: LatencyTracker,
+) -> T:
+    """Thread-based variant of :func:`hedged_call` for synchronous LM calls.
+
+    A losing call cannot be interrupted; its result is simply discarded.
+    """
+    tracker.calls += 1
+    started = time.perf_counter()
+    primary_future = _SYNC_EXECUTOR.submit(contextvars.copy_context().run, primary)
+    done, _ = wait_futures({primary_future}, timeout=tracker.hedge_delay())
+    if done:
+        if primary_future.exception() is None:
+            tracker.record(time.perf_counter() - started)
+        return primary_future.result()
+
+    tracker.hedged_calls += 1
+    backup_future = _SYNC_EXECUTOR.submit(contextvars.copy_context().run, backup)
+    pending: set[Future[T]] = {primary_future, backup_future}
+    first_error: BaseException | None = None
+    while pending:
+        done, pending = wait_futures(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            exc = future.exception()
+            if exc is not None:
+                first_error = first_error or exc
+                continue
+            if future is backup_future:
+                tracker.backup_wins += 1
+            tracker.record(time.perf_counter() - started)
+            for other in pending:
+                other.cancel()
+            return future.result()
+
+    assert first_error is not None
+    raise first_error
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from dspy.utils.callback import BaseCallback
+
+from app.core.run_metrics import record_lm_call
+
+
+class LMTimingCallback(BaseCallback):
+    """Counts LM calls and their wall time into the current run metrics."""
+
+    def __init__(self) -> None:
+        self._started: dict[str, float] = {}
+
+    def on_lm_start(self, call_id: str, instance: Any, inputs: dict[str, Any]) -> None:
+        self._started[call_id] = time.perf_counter()
+
+    def on_lm_end(
+        self, call_id: str, outputs: dict[str, Any] | None, exception: Exception | None = None
+    ) -> None:
+        started = self._started.pop(call_id, None)
+        if started is not None:
+            record_lm_call((time.perf_counter() - started) * 1000)
+
+
+LM_TIMING_CALLBACK = LMTimingCallback()
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import Any
+
+import dspy
+
+from app.core.rate_limit import AsyncRateLimiter
+
+
+class RateLimitedLM(dspy.BaseLM):
+    """Wrapper that spaces out the calls to ``inner`` with ``limiter``.
+
+    Limiting LM calls rather than solves keeps a provider's requests-per-minute
+    limit however many ReAct steps a solve takes. Copies share the limiter.
+    """
+
+    def __init__(self, inner: dspy.BaseLM, limiter: AsyncRateLimiter) -> None:
+        super().__init__(model=inner.model, model_type=inner.model_type, cache=False)
+        self.inner = inner
+        self.limiter = limiter
+        self.kwargs = dict(inner.kwargs)
+
+    def copy(self, **kwargs: Any) -> RateLimitedLM:
+        return RateLimitedLM(self.inner.copy(**kwargs), self.limiter)
+
+    def forward(self, prompt=None, messages=None, **kwargs):
+        self.limiter.wait()
+        return self.inner.forward(prompt=prompt, messages=messages, **kwargs)
+
+    async def aforward(self, prompt=None, messages=None, **kwargs):
+        await self.limiter.acquire()
+        return await self.inner.aforward(prompt=prompt, messages=messages, **kwargs)
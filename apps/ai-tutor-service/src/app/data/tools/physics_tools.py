@@ -10,11 +10,19 @@ from __future__ import annotations
 import json
 from typing import Literal, TypeAlias
 
-import sympy
 from pint import errors as pint_errors
 
+from app.core.observability_contract import AttrKey
+from app.core.tool_telemetry import mark_tool_cache, mark_tool_error, set_tool_attribute
 from app.core.unit_registry import UnitQuantity
-from app.data.tools.utils import evaluate_expression, parse_formula, parse_variables
+from app.data.tools.utils import (
+    FormulaSolveError,
+    evaluate_expression,
+    formula_hash,
+    parse_rhs_cached,
+    parse_variables,
+    solve_cached,
+)
 
 ArithmeticOperation: TypeAlias = Literal["add", "subtract", "multiply", "divide", "power"]
 
@@ -42,10 +50,12 @@ def calculate(operation: ArithmeticOperation, a: str, b: str) -> str:
         >>> calculate("add", "1 km", "500 m")
         '1500.0 meter'
     """
+    set_tool_attribute(AttrKey.TOOL_OPERATION, operation)
     try:
         qa = UnitQuantity(a)
         qb = UnitQuantity(b)
     except Exception as exc:
+        mark_tool_error(exc)
         return f"Error parsing quantities: {exc}"
 
     ops = {
@@ -57,17 +67,21 @@ def calculate(operation: ArithmeticOperation, a: str, b: str) -> str:
     }
 
     if operation not in ops:
+        mark_tool_error("UnknownOperation")
         return f"Error: unknown operation '{operation}'. Use one of: {', '.join(ops)}"
 
     if operation == "power" and not qb.dimensionless:
+        mark_tool_error("DimensionalityError")
         return "Error: exponent must be dimensionless"
 
     try:
         result = ops[operation]()
         return str(result)
     except pint_errors.DimensionalityError as exc:
+        mark_tool_error(exc)
         return f"Error: incompatible units – {exc}"
     except Exception as exc:
+        mark_tool_error(exc)
         return f"Error: {exc}"
 
 
@@ -95,14 +109,17 @@ def convert_unit(quantity: str, target_unit: str) -> str:
     try:
         q = UnitQuantity(quantity)
     except Exception as exc:
+        mark_tool_error(exc)
         return f"Error parsing quantity: {exc}"
 
     try:
         converted = q.to(target_unit)
         return str(converted)
     except pint_errors.DimensionalityError as exc:
+        mark_tool_error(exc)
         return f"Error: incompatible units – {exc}"
     except Exception as exc:
+        mark_tool_error(exc)
         return f"Error: {exc}"
 
 
@@ -131,15 +148,17 @@ def evaluate_formula(formula: str, variables_json: str) -> str:
         >>> evaluate_formula("F = m * a", '{"m": "10 kg", "a": "9.8 m/s**2"}')
         '98.0 kilogram * meter / second ** 2'
     """
+    set_tool_attribute(AttrKey.TOOL_FORMULA_HASH, formula_hash(formula))
     try:
         variables = parse_variables(variables_json)
-        _formula_left_expr, formula_right_expr, _symbols = parse_formula(
-            formula=formula, variables=variables
-        )
+        formula_right_expr, cache_hit = parse_rhs_cached(formula, variables)
+        mark_tool_cache(cache_hit)
         return evaluate_expression(formula_right_expr, variables)
     except ValueError as exc:
+        mark_tool_error(exc)
         return str(exc)
     except Exception as exc:
+        mark_tool_error(exc)
         return f"Error evaluating formula: {exc}"
 
 
@@ -164,25 +183,20 @@ def solve_formula(formula: str, solve_for: str, variables_json: str) -> str:
         >>> solve_formula("c = wavelength * f", "wavelength", '{"c": "3e8 m/s", "f": "6e14 Hz"}')
         '5e-07 meter / hertz / second'
     """
+    set_tool_attribute(AttrKey.TOOL_FORMULA_HASH, formula_hash(formula))
     try:
         variables = parse_variables(variables_json)
-        formula_left_expr, formula_right_expr, symbols = parse_formula(
-            formula=formula, variables=variables, extra_symbols=[solve_for]
-        )
+        solutions, cache_hit = solve_cached(formula, solve_for, variables)
     except ValueError as exc:
+        mark_tool_error(exc)
         return str(exc)
-
-    equation = sympy.Eq(formula_left_expr, formula_right_expr)
-    target_sym = symbols.get(solve_for)
-    if target_sym is None:
-        return f"Error: variable '{solve_for}' not found in formula."
-
-    try:
-        solutions = sympy.solve(equation, target_sym)
-    except Exception as exc:
+    except FormulaSolveError as exc:
+        mark_tool_error(exc.__cause__ or exc)
         return f"Error solving equation: {exc}"
+    mark_tool_cache(cache_hit)
 
     if not solutions:
+        mark_tool_error("NoSolution")
         return f"Error: could not solve for '{solve_for}'."
 
     try:
@@ -192,6 +206,8 @@ def solve_formula(formula: str, solve_for: str, variables_json: str) -> str:
         results = [evaluate_expression(expression=s, variables=variables) for s in solutions]
         return json.dumps(results)
     except ValueError as exc:
+        mark_tool_error(exc)
         return str(exc)
     except Exception as exc:
+        mark_tool_error(exc)
         return f"Error evaluating solution: {exc}"
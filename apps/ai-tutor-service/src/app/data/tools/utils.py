@@ -1,9 +1,89 @@
+import hashlib
 import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Generic, TypeVar
 
 import sympy
 
 from app.core.unit_registry import UnitQuantity
 
+V = TypeVar("V")
+
+
+class FormulaSolveError(Exception):
+    pass
+
+
+FORMULA_CACHE_SIZE = 512
+
+
+_priming: ContextVar[bool] = ContextVar("priming_caches", default=False)
+
+
+@contextmanager
+def priming_caches() -> Iterator[None]:
+    """Fill caches (e.g. at warm-up) without it showing up as cache hits: the first
+    real lookup of a primed entry is reported as a miss."""
+    token = _priming.set(True)
+    try:
+        yield
+    finally:
+        _priming.reset(token)
+
+
+class LRUCache(Generic[V]):
+    """Small thread-safe LRU that reports whether a lookup was a hit.
+
+    Failed computations (exceptions) are not cached.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        # value, and whether it was primed and not looked up for real since.
+        self._data: OrderedDict[Hashable, tuple[V, bool]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], V]) -> tuple[V, bool]:
+        priming = _priming.get()
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                value, primed = self._data[key]
+                if primed and not priming:
+                    self._data[key] = (value, False)
+                return value, not (primed or priming)
+        value = compute()
+        with self._lock:
+            self._data[key] = (value, priming)
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+        return value, False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Parsed right-hand sides, sympy solutions and lambdified functions are pure functions
+# of the formula text and the variable names, so repeated tool calls (the same
+# formula with new values, across ReAct steps and requests) skip sympy entirely.
+PARSED_FORMULAS: LRUCache[sympy.Expr] = LRUCache(FORMULA_CACHE_SIZE)
+SOLVED_FORMULAS: LRUCache[tuple[sympy.Expr, ...]] = LRUCache(FORMULA_CACHE_SIZE)
+LAMBDIFIED: LRUCache[Callable[..., Any]] = LRUCache(FORMULA_CACHE_SIZE)
+
+
+def formula_hash(formula: str) -> str:
+    normalized = "".join(formula.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
 
 def parse_variables(variables_json: str) -> dict[str, str]:
     try:
@@ -21,7 +101,10 @@ def evaluate_expression(expression: sympy.Expr, variables: dict[str, str]) -> st
     missing = expr_symbols - set(variables.keys())
     if missing:
         raise ValueError(f"Missing variables for expression: {missing}")
-    func = sympy.lambdify(list(variables.keys()), expression)
+    names = tuple(sorted(variables))
+    func, _ = LAMBDIFIED.get_or_compute(
+        (expression, names), lambda: sympy.lambdify(list(names), expression)
+    )
     pint_values = {k: UnitQuantity(v) for k, v in variables.items()}
     return str(func(**pint_values))
 
@@ -51,3 +134,32 @@ def parse_formula(
         raise ValueError(f"Error parsing formula: {exc}") from exc
 
     return left_expression, right_expression, symbols
+
+
+def parse_rhs_cached(formula: str, variables: dict[str, str]) -> tuple[sympy.Expr, bool]:
+    """Right-hand side of ``formula``; the flag tells whether it came from the cache."""
+    return PARSED_FORMULAS.get_or_compute(
+        (formula, frozenset(variables)),
+        lambda: parse_formula(formula=formula, variables=variables)[1],
+    )
+
+
+def solve_cached(
+    formula: str, solve_for: str, variables: dict[str, str]
+) -> tuple[tuple[sympy.Expr, ...], bool]:
+    """Solutions of ``formula`` for ``solve_for`` (possibly empty) and the cache flag.
+
+    Raises ``ValueError`` for unparseable formulas and ``FormulaSolveError`` when
+    sympy fails to solve the equation.
+    """
+
+    def solve() -> tuple[sympy.Expr, ...]:
+        left, right, symbols = parse_formula(
+            formula=formula, variables=variables, extra_symbols=[solve_for]
+        )
+        try:
+            return tuple(sympy.solve(sympy.Eq(left, right), symbols[solve_for]))
+        except Exception as exc:
+            raise FormulaSolveError(str(exc)) from exc
+
+    return SOLVED_FORMULAS.get_or_compute((formula, solve_for, frozenset(variables)), solve)
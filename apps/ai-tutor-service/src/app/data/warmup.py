@@ -0,0 +1,132 @@
+"""Concrete warm-up steps: imports, unit and formula caches, tool self-test and
+prompt formatting for each agent."""
+
+from __future__ import annotations
+
+import importlib
+import json
+from collections.abc import Iterable, Sequence
+from typing import Protocol
+
+from app.core.unit_registry import UnitQuantity
+from app.core.warmup import WarmupReport
+from app.data.tools.physics_tools import calculate, convert_unit, evaluate_formula, solve_formula
+from app.data.tools.utils import priming_caches
+from app.domain.models.eval import EvalCase
+
+# Imported lazily on first use otherwise (sympy's solvers and printers, litellm's
+# provider modules).
+WARMUP_MODULES = ("numpy", "sympy", "sympy.solvers", "sympy.printing.numpy", "litellm")
+
+# (formula, variables, solve_for); typical shapes the agent writes, so sympy's
+# solver and lambdify code generation are exercised before the first request.
+WARMUP_FORMULAS: tuple[tuple[str, dict[str, str], str], ...] = (
+    ("v = d / t", {"d": "100 m", "t": "10 s"}, "t"),
+    ("F = m * a", {"m": "2 kg", "a": "5 m/s^2"}, "a"),
+    ("F = k * x", {"k": "300 N/m", "x": "0.1 m"}, "x"),
+    ("E = m * g * h", {"m": "1 kg", "g": "9.8 m/s^2", "h": "2 m"}, "h"),
+    ("s = v0 * t + a * t**2 / 2", {"v0": "0 m/s", "a": "2 m/s^2", "t": "3 s"}, "a"),
+    ("P = W / t", {"W": "600 J", "t": "2 min"}, "W"),
+    ("Q = m * c * dT", {"m": "0.5 kg", "c": "4186 J/(kg*K)", "dT": "10 K"}, "dT"),
+)
+
+
+class WarmableAgent(Protocol):
+    def warm_up(self) -> None: ...
+
+
+def quantities_from_cases(cases: Iterable[EvalCase]) -> list[str]:
+    """Expected units and reference quantities of eval cases: the units real
+    questions use."""
+    quantities: list[str] = []
+    for case in cases:
+        quantities.append(f"1 {case.expected.unit}")
+        for value in (case.reference_data or {}).values():
+            if isinstance(value, str):
+                quantities.append(value)
+    return list(dict.fromkeys(quantities))
+
+
+def prime_quantities(quantities: Iterable[str]) -> int:
+    """Parse each quantity once so pint caches its units; returns how many parsed."""
+    parsed = 0
+    for quantity in quantities:
+        try:
+            UnitQuantity(quantity).to_base_units()
+        except Exception:
+            continue
+        parsed += 1
+    return parsed
+
+
+def prime_formulas() -> None:
+    for formula, variables, solve_for in WARMUP_FORMULAS:
+        result = evaluate_formula(formula, json.dumps(variables))
+        known = {name: value for name, value in variables.items() if name != solve_for}
+        known[formula.split("=", 1)[0].strip()] = result
+        solve_formula(formula, solve_for, json.dumps(known))
+
+
+def _matches(output: str, expected: str) -> bool:
+    try:
+        target = UnitQuantity(expected)
+        actual = UnitQuantity(output).to(target.units)
+    except Exception:
+        return False
+    return abs(actual.magnitude - target.magnitude) <= 1e-6 * max(abs(target.magnitude), 1.0)
+
+
+def tool_self_test() -> list[str]:
+    """Run every tool on a known input; returns a message per wrong answer."""
+    checks = (
+        ("calculate", calculate("multiply", "2 m", "3 s"), "6 m*s"),
+        ("convert_unit", convert_unit("1.5 km", "m"), "1500 m"),
+        (
+            "evaluate_formula",
+            evaluate_formula("v = d / t", '{"d": "100 m", "t": "8 s"}'),
+            "12.5 m/s",
+        ),
+    )
+    failures = [
+        f"{tool}: expected {expected}, got {output!r}"
+        for tool, output, expected in checks
+        if not _matches(output, expected)
+    ]
+    solved = solve_formula("F = m * a", "a", '{"F": "10 N", "m": "4 kg"}')
+    # One solution comes back as a quantity, several as a JSON list.
+    try:
+        solutions = json.loads(solved)
+    except json.JSONDecodeError:
+        solutions = [solved]
+    if not isinstance(solutions, list) or not any(
+        _matches(str(solution), "2.5 m/s^2") for solution in solutions
+    ):
+        failures.append(f"solve_formula: expected 2.5 m/s^2, got {solved!r}")
+    return failures
+
+
+def run_warmup(
+    quantities: Iterable[str] = (), agents: Sequence[WarmableAgent] = ()
+) -> WarmupReport:
+    report = WarmupReport()
+    with report.step("imports"):
+        for module in WARMUP_MODULES:
+            try:
+                importlib.import_module(module)
+            except ImportError as exc:
+                report.warnings.append(f"import {module}: {exc}")
+    with report.step("quantities"):
+        prime_quantities(quantities)
+    # Tools are called directly, outside ``tool_call()``, so none of this reaches the
+    # tool statistics, and primed cache entries are not reported as hits later.
+    with report.step("formulas"), priming_caches():
+        prime_formulas()
+    with report.step("tool_self_test"), priming_caches():
+        report.failures.extend(tool_self_test())
+    with report.step("agents"):
+        for agent in agents:
+            try:
+                agent.warm_up()
+            except Exception as exc:
+                report.warnings.append(f"agent warm-up: {type(exc).__name__}: {exc}")
+    return report
@@ -2,6 +2,8 @@ from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
+from app.domain.models.usage import LMCallUsage
+
 
 class EvalCaseSource(BaseModel):
     exam: str
@@ -34,15 +36,79 @@ class EvalCase(BaseModel):
     reference_data: dict[str, Any] | None = None
 
 
+def result_key(case_id: str, sample_index: int = 0) -> str:
+    """Identify one sample of one case; the first sample is keyed by the bare case id."""
+    return case_id if sample_index == 0 else f"{case_id}#{sample_index}"
+
+
+class EvalCaseMetrics(BaseModel):
+    # Served from the eval result cache: no solve happened, so no cost.
+    cached: bool = False
+    latency_ms: float = Field(default=0.0, ge=0.0)
+    lm_calls: int = Field(default=0, ge=0)
+    lm_time_ms: float = Field(default=0.0, ge=0.0)
+    prompt_tokens: int = Field(default=0, ge=0)
+    completion_tokens: int = Field(default=0, ge=0)
+    cached_tokens: int = Field(default=0, ge=0)
+    estimated_cost_usd: float | None = None
+    iterations: int = Field(default=0, ge=0)
+    tool_calls: dict[str, int] = Field(default_factory=dict)
+    tool_time_ms: dict[str, float] = Field(default_factory=dict)
+    lm_usage: list[LMCallUsage] = Field(default_factory=list)
+
+
 class EvalCaseScore(BaseModel):
+    case_id: str | None = None
+    sample_index: int = Field(default=0, ge=0)
     expected: str | None = None
     predicted: str | None = None
+    # Raw solver output, kept so results can be re-scored without re-solving.
+    predicted_value: float | None = None
+    predicted_unit: str | None = None
     reasoning: str | None = None
     result_ok: bool
     reasoning_score: float
     total_score: float
     passed: bool
     error: str | None = None
+    metrics: EvalCaseMetrics | None = None
+
+    @property
+    def result_key(self) -> str | None:
+        return result_key(self.case_id, self.sample_index) if self.case_id is not None else None
+
+
+class ConfidenceInterval(BaseModel):
+    low: float
+    high: float
+    level: float = 0.95
+
+
+class EvalCaseSampleStats(BaseModel):
+    case_id: str
+    samples: int
+    passed_samples: int
+    # Share of samples with the majority outcome (1.0 = all samples pass or all fail).
+    agreement: float
+    distinct_answers: int
+
+
+# Reasons are relative to the latest entry for the same case, sample and model, so a
+# model with no entry yet reports ``new_case``. ``model_changed`` is no longer reported
+# and is kept so stored reports still load.
+EvalCacheMissReason = Literal[
+    "new_case", "content_changed", "model_changed", "program_changed", "not_cached"
+]
+
+
+class EvalCacheMiss(BaseModel):
+    case_id: str
+    reason: EvalCacheMissReason
+
+
+class EvalCacheReport(BaseModel):
+    hits: int = 0
+    misses: list[EvalCacheMiss] = Field(default_factory=list)
 
 
 class EvalRunSummary(BaseModel):
@@ -53,3 +119,22 @@ class EvalRunSummary(BaseModel):
     avg_total_score: float
     avg_reasoning_score: float
     avg_value_score: float
+
+    # Repeated sampling (``samples_per_case`` > 1): case_results hold every sample and
+    # the counts/averages above are over samples.
+    samples_per_case: int = 1
+    pass_at_1: float | None = None
+    pass_at_k: float | None = None
+    pass_rate_ci: ConfidenceInterval | None = None
+    avg_total_score_ci: ConfidenceInterval | None = None
+    case_sample_stats: list[EvalCaseSampleStats] = Field(default_factory=list)
+
+    # Cost and latency over solved (not cached) results that carry metrics.
+    latency_p50_ms: float | None = None
+    latency_p90_ms: float | None = None
+    latency_p99_ms: float | None = None
+    total_lm_calls: int = 0
+    total_prompt_tokens: int = 0
+    total_completion_tokens: int = 0
+    # None when some result used a model without a known price.
+    estimated_cost_usd: float | None = None
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class ProgramStats(BaseModel):
+    solves: int = Field(default=0, ge=0)
+    avg_latency_ms: float | None = None
+    p90_latency_ms: float | None = None
+    avg_trajectory_tokens: float | None = None
+
+
+class ProgramVersion(BaseModel):
+    version: str = Field(min_length=1)
+    created_at: datetime | None = None
+    num_demos: int = Field(default=0, ge=0)
+    prompt_tokens: int = Field(default=0, ge=0, description="Static prompt size estimate")
+    active: bool = False
+    stats: ProgramStats = Field(default_factory=ProgramStats)
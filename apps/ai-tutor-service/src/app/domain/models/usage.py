@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+
+
+class LMCallUsage(BaseModel):
+    model: str
+    prompt_tokens: int = Field(default=0, ge=0)
+    completion_tokens: int = Field(default=0, ge=0)
+    # Part of ``prompt_tokens`` read from the provider's prompt cache.
+    cached_tokens: int = Field(default=0, ge=0)
+    estimated_cost_usd: float | None = None
+
+
+class SolveUsage(BaseModel):
+    """What one solve consumed; ``lm_usage`` has one entry per LM call, in call order."""
+
+    lm_calls: int = Field(default=0, ge=0)
+    prompt_tokens: int = Field(default=0, ge=0)
+    completion_tokens: int = Field(default=0, ge=0)
+    cached_tokens: int = Field(default=0, ge=0)
+    # None when a model without a known price was used.
+    estimated_cost_usd: float | None = None
+    iterations: int = Field(default=0, ge=0)
+    lm_usage: list[LMCallUsage] = Field(default_factory=list)
@@ -1,17 +1,54 @@
+from pathlib import Path
+
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 
 from app.api.app import create_app
-from app.application.services.physics_service import PhysicsService
+from app.application.services.eval_service import iter_cases
+from app.application.services.physics_service import HedgeConfig, PhysicsService
 from app.core.observability import init_observability
+from app.core.pricing import configure_prices
 from app.core.settings import get_settings
+from app.core.warmup import WarmupReport
 from app.data.agents.physics_agent import PhysicsAgent
-from app.data.dspy.dspy_config import configure_dspy
+from app.data.agents.program_manager import PhysicsProgramManager
+from app.data.agents.program_store import ProgramStore
+from app.data.dspy.dspy_config import build_lm, configure_dspy
+from app.data.warmup import quantities_from_cases, run_warmup
 
 settings = get_settings()
 init_observability()
 configure_dspy(settings)
+configure_prices(settings.llm_prices)
+
+hedge = HedgeConfig(
+    attempts=settings.solve_hedge_attempts,
+    strategy=settings.solve_hedge_strategy,
+    stagger_ms=settings.solve_hedge_stagger_ms,
+    vote_quorum=settings.solve_hedge_vote_quorum,
+    rel_tolerance=settings.solve_hedge_rel_tolerance,
+)
+hedge_solvers = [
+    PhysicsAgent(lm=build_lm(settings, temperature=temperature))
+    for temperature in settings.solve_hedge_temperatures
+] + [PhysicsAgent(lm=build_lm(settings, model=model)) for model in settings.solve_hedge_models]
+
+physics_agent = PhysicsAgent()
+program_manager = PhysicsProgramManager(ProgramStore(), agents=[physics_agent, *hedge_solvers])
+program_manager.activate(settings.physics_program_version)
+
+physics_service = PhysicsService(solver=physics_agent, hedge=hedge, hedge_solvers=hedge_solvers)
+
+
+def warm_up() -> WarmupReport:
+    dataset = Path(settings.warmup_dataset)
+    quantities = quantities_from_cases(iter_cases(dataset)) if dataset.is_file() else []
+    return run_warmup(quantities=quantities, agents=[physics_agent, *hedge_solvers])
 
-physics_service = PhysicsService(solver=PhysicsAgent())
 
-app = create_app(physics_service=physics_service, settings=settings)
+app = create_app(
+    physics_service=physics_service,
+    settings=settings,
+    program_manager=program_manager,
+    warmup=warm_up if settings.warmup_enabled else None,
+)
 FastAPIInstrumentor.instrument_app(app)
@@ -1,8 +1,14 @@
 import json
+import uuid
+from dataclasses import asdict
 from pathlib import Path
 
 from dspy import settings
 from dspy.clients.lm import cast
+from opentelemetry import trace
+
+from app.core.run_metrics import RunMetrics
+from app.domain.models.usage import SolveUsage
 
 
 def extract_raw_output() -> str | None:
@@ -40,6 +46,22 @@ def extract_raw_output() -> str | None:
     return str(last)
 
 
+def artifact_trace_id(span: trace.Span) -> str:
+    """The span's trace id, or a fresh random one when tracing is not set up.
+
+    A no-op tracer hands every span the invalid all-zero id, which would make every
+    artifact of the run share one id in the artifact store.
+    """
+    context = span.get_span_context()
+    if not context.is_valid:
+        return uuid.uuid4().hex
+    return format(context.trace_id, "032x")
+
+
+def solve_usage(metrics: RunMetrics) -> SolveUsage:
+    return SolveUsage.model_validate(asdict(metrics))
+
+
 def default_artifacts_dir() -> Path:
     # cwd is `apps/ai-tutor-service` when called via Nx target
     return Path(".artifacts") / "runs"
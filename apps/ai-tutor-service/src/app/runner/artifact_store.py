@@ -0,0 +1,282 @@
+"""Indexed, append-only storage for run and eval artifacts.
+
+Layout::
+
+    <root>/index.sqlite3            # one row per artifact (queryable metadata)
+    <root>/segments/<date>.seg      # zlib-compressed payloads, appended
+
+A segment record is a 4-byte big-endian length followed by the zlib-compressed
+artifact JSON. The index keeps each artifact's segment, offset and length, so a
+lookup reads exactly one record and queries never touch the payloads.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import struct
+import zlib
+from collections.abc import Iterator
+from contextlib import closing
+from datetime import date, datetime
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel
+
+from app.runner.run_artifact import EvalMatrixArtifact, EvalRunArtifact, RunArtifact
+
+ArtifactKind = Literal["run", "eval", "eval_matrix"]
+StoredArtifactModel = RunArtifact | EvalRunArtifact | EvalMatrixArtifact
+
+INDEX_FILE = "index.sqlite3"
+SEGMENTS_DIR = "segments"
+_HEADER = struct.Struct(">I")
+
+_MODELS: dict[ArtifactKind, type[StoredArtifactModel]] = {
+    "run": RunArtifact,
+    "eval": EvalRunArtifact,
+    "eval_matrix": EvalMatrixArtifact,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    trace_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    day TEXT NOT NULL,
+    agent TEXT,
+    llm_name TEXT,
+    error_type TEXT,
+    duration_ms INTEGER NOT NULL,
+    dataset_path TEXT,
+    pass_rate REAL,
+    latency_p90_ms REAL,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS artifacts_day ON artifacts (day);
+CREATE INDEX IF NOT EXISTS artifacts_kind_started ON artifacts (kind, started_at);
+CREATE INDEX IF NOT EXISTS artifacts_llm_day ON artifacts (llm_name, day);
+CREATE INDEX IF NOT EXISTS artifacts_agent_day ON artifacts (agent, day);
+CREATE INDEX IF NOT EXISTS artifacts_error_day ON artifacts (error_type, day);
+CREATE INDEX IF NOT EXISTS artifacts_duration ON artifacts (duration_ms);
+"""
+
+
+class ArtifactIndexEntry(BaseModel):
+    trace_id: str
+    kind: ArtifactKind
+    started_at: datetime
+    agent: str | None = None
+    llm_name: str | None = None
+    error_type: str | None = None
+    duration_ms: int
+    dataset_path: str | None = None
+    pass_rate: float | None = None
+    latency_p90_ms: float | None = None
+
+
+class ArtifactQuery(BaseModel):
+    kind: ArtifactKind | None = None
+    since: date | None = None
+    until: date | None = None
+    agent: str | None = None
+    llm_name: str | None = None
+    failed: bool | None = None
+    error_type: str | None = None
+    min_duration_ms: int | None = None
+    dataset_path: str | None = None
+    limit: int | None = None
+    # Oldest first by default (trend views); newest first for "latest runs" views.
+    newest_first: bool = False
+
+
+def _kind_of(artifact: StoredArtifactModel) -> ArtifactKind:
+    if isinstance(artifact, RunArtifact):
+        return "run"
+    if isinstance(artifact, EvalRunArtifact):
+        return "eval"
+    return "eval_matrix"
+
+
+def _index_entry(artifact: StoredArtifactModel) -> ArtifactIndexEntry:
+    entry = ArtifactIndexEntry(
+        trace_id=artifact.trace_id,
+        kind=_kind_of(artifact),
+        started_at=artifact.started_at,
+        duration_ms=artifact.duration_ms,
+    )
+    if isinstance(artifact, RunArtifact):
+        entry.agent = artifact.agent
+        entry.llm_name = artifact.llm_name
+        entry.error_type = artifact.error.type if artifact.error is not None else None
+        return entry
+
+    summaries = (
+        [artifact.run_summary]
+        if isinstance(artifact, EvalRunArtifact)
+        else list(artifact.summaries.values())
+    )
+    entry.dataset_path = artifact.dataset_path
+    if isinstance(artifact, EvalRunArtifact):
+        entry.llm_name = artifact.llm_name
+        entry.pass_rate = artifact.run_summary.pass_rate
+        entry.latency_p90_ms = artifact.run_summary.latency_p90_ms
+    if any(result.error is not None for s in summaries for result in s.case_results):
+        entry.error_type = "EvalCaseExecutionError"
+    return entry
+
+
+class ArtifactStore:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / SEGMENTS_DIR).mkdir(exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Several processes (e.g. eval shards) may write concurrently.
+        connection = sqlite3.connect(self.root / INDEX_FILE, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def _append(self, segment: str, payload: bytes) -> tuple[int, int]:
+        record = _HEADER.pack(len(payload)) + payload
+        path = self.root / SEGMENTS_DIR / segment
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            # O_APPEND makes the single write land atomically at the end, so the
+            # offset is exact even with other processes appending to the segment.
+            os.write(fd, record)
+            end = os.lseek(fd, 0, os.SEEK_CUR)
+        finally:
+            os.close(fd)
+        return end - len(record), len(record)
+
+    def put(self, artifact: StoredArtifactModel) -> str:
+        """Append ``artifact`` and index it; returns ``<segment path>@<offset>``.
+
+        Artifacts are never replaced: a second artifact with a stored trace id raises
+        ``ValueError`` (checked before its payload is appended).
+        """
+        entry = _index_entry(artifact)
+        if self._exists(entry.trace_id):
+            raise ValueError(f"Artifact {entry.trace_id} is already stored")
+        segment = f"{entry.started_at.date().isoformat()}.seg"
+        payload = zlib.compress(artifact.model_dump_json().encode("utf-8"))
+        offset, length = self._append(segment, payload)
+
+        with closing(self._connect()) as connection, connection:
+            try:
+                connection.execute(
+                    "INSERT INTO artifacts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        entry.trace_id,
+                        entry.kind,
+                        entry.started_at.isoformat(),
+                        entry.started_at.date().isoformat(),
+                        entry.agent,
+                        entry.llm_name,
+                        entry.error_type,
+                        entry.duration_ms,
+                        entry.dataset_path,
+                        entry.pass_rate,
+                        entry.latency_p90_ms,
+                        segment,
+                        offset,
+                        length,
+                    ),
+                )
+            except sqlite3.IntegrityError as exc:
+                # Another process stored the same id in between; its row wins.
+                raise ValueError(f"Artifact {entry.trace_id} is already stored") from exc
+        return f"{self.root / SEGMENTS_DIR / segment}@{offset}"
+
+    def _exists(self, trace_id: str) -> bool:
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT 1 FROM artifacts WHERE trace_id = ?", (trace_id,)
+            ).fetchone()
+        return row is not None
+
+    def query(self, query: ArtifactQuery | None = None) -> list[ArtifactIndexEntry]:
+        query = query or ArtifactQuery()
+        clauses: list[str] = []
+        params: list[object] = []
+        for column, value in (
+            ("kind", query.kind),
+            ("agent", query.agent),
+            ("llm_name", query.llm_name),
+            ("error_type", query.error_type),
+            ("dataset_path", query.dataset_path),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if query.since is not None:
+            clauses.append("day >= ?")
+            params.append(query.since.isoformat())
+        if query.until is not None:
+            clauses.append("day <= ?")
+            params.append(query.until.isoformat())
+        if query.failed is not None:
+            clauses.append("error_type IS NOT NULL" if query.failed else "error_type IS NULL")
+        if query.min_duration_ms is not None:
+            clauses.append("duration_ms >= ?")
+            params.append(query.min_duration_ms)
+
+        sql = "SELECT * FROM artifacts"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY started_at " + ("DESC" if query.newest_first else "ASC")
+        if query.limit is not None:
+            sql += " LIMIT ?"
+            params.append(query.limit)
+
+        with closing(self._connect()) as connection:
+            rows = connection.execute(sql, params).fetchall()
+        return [
+            ArtifactIndexEntry.model_validate({key: row[key] for key in row.keys()}) for row in rows
+        ]
+
+    def _locate(self, trace_id: str) -> tuple[ArtifactKind, str, int, int]:
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT kind, segment, offset, length FROM artifacts WHERE trace_id = ?",
+                (trace_id,),
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown artifact: {trace_id}")
+        return row["kind"], row["segment"], row["offset"], row["length"]
+
+    def read_json(self, trace_id: str) -> str:
+        _, segment, offset, length = self._locate(trace_id)
+        with open(self.root / SEGMENTS_DIR / segment, "rb") as segment_file:
+            segment_file.seek(offset)
+            record = segment_file.read(length)
+        (payload_length,) = _HEADER.unpack_from(record)
+        return zlib.decompress(record[_HEADER.size : _HEADER.size + payload_length]).decode("utf-8")
+
+    def get(self, trace_id: str) -> StoredArtifactModel:
+        kind = self._locate(trace_id)[0]
+        return _MODELS[kind].model_validate_json(self.read_json(trace_id))
+
+    def iter_artifacts(self, entries: list[ArtifactIndexEntry]) -> Iterator[StoredArtifactModel]:
+        """Load the payloads of ``entries`` one at a time."""
+        for entry in entries:
+            yield self.get(entry.trace_id)
+
+
+def load_eval_artifact(store: ArtifactStore, ref: str) -> EvalRunArtifact:
+    """Load an ``EvalRunArtifact`` by trace id, or from a legacy standalone JSON file."""
+    path = Path(ref)
+    if path.suffix == ".json" and path.is_file():
+        return EvalRunArtifact.model_validate_json(path.read_text(encoding="utf-8"))
+    artifact = store.get(ref)
+    if not isinstance(artifact, EvalRunArtifact):
+        raise ValueError(f"Artifact {ref} is not an eval run artifact")
+    return artifact
@@ -0,0 +1,44 @@
+"""Input and output records of ``run-batch`` (one JSON object per line)."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from pydantic import AliasChoices, BaseModel, Field, ValidationError
+
+from app.domain.models.physics import PhysicsSolution
+from app.runner.run_artifact import RunError
+
+
+class BatchItem(BaseModel):
+    id: str | None = None
+    question: str = Field(min_length=1, validation_alias=AliasChoices("question", "text"))
+    reference_data: dict[str, Any] | None = None
+
+
+class BatchResult(BaseModel):
+    # 0-based position of the item in the input; results stream in completion order.
+    index: int
+    id: str | None = None
+    trace_id: str | None = None
+    ok: bool
+    duration_ms: int = 0
+    solution: PhysicsSolution | None = None
+    error: RunError | None = None
+
+
+def iter_batch_items(lines: Iterable[str]) -> Iterator[tuple[int, BatchItem | RunError]]:
+    """Parse JSONL ``lines`` lazily; blank lines are skipped.
+
+    An invalid line yields a ``RunError`` in its slot instead of aborting the batch.
+    """
+    index = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield index, BatchItem.model_validate_json(line)
+        except ValidationError as e:
+            yield index, RunError(type="InvalidBatchItem", message=str(e))
+        index += 1
@@ -0,0 +1,137 @@
+"""Content-addressed cache of solver predictions for incremental re-evaluation.
+
+Layout::
+
+    <root>/entries/<key[:2]>/<key>.json   # cached PhysicsSolution for one key
+    <root>/manifest.jsonl                 # key components of every stored entry
+
+An entry key hashes (case id, sample index, case content, model name, program
+fingerprint). Only
+the solver inputs (question text and reference data) count as case content: the
+expected value and tolerance only affect scoring, which is always re-run, so fixing
+them never costs LLM calls.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from pydantic import BaseModel, ValidationError
+
+from app.application.ports.eval_cache_port import EvalCachePort
+from app.domain.models.eval import (
+    EvalCacheMiss,
+    EvalCacheMissReason,
+    EvalCacheReport,
+    EvalCase,
+)
+from app.domain.models.physics import PhysicsSolution
+
+MANIFEST_FILE = "manifest.jsonl"
+
+# (case id, sample index, model name): what a miss reason is relative to. Several
+# models (an eval matrix) and samples share one cache root.
+_IndexKey = tuple[str, int, str]
+
+
+def _sha256(payload: object) -> str:
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def case_content_hash(case: EvalCase) -> str:
+    return _sha256({"question_text": case.question_text, "reference_data": case.reference_data})
+
+
+class EvalCacheEntryKey(BaseModel):
+    case_id: str
+    sample_index: int = 0
+    content_hash: str
+    llm_name: str
+    program_fingerprint: str
+
+    @property
+    def digest(self) -> str:
+        return _sha256(self.model_dump())
+
+
+class FileEvalCache(EvalCachePort):
+    """On-disk ``EvalCachePort`` bound to one model and one program fingerprint."""
+
+    def __init__(self, root: Path, *, llm_name: str, program_fingerprint: str) -> None:
+        self.root = root
+        self.llm_name = llm_name
+        self.program_fingerprint = program_fingerprint
+        self._latest = self._load_manifest()
+        self._report = EvalCacheReport()
+
+    def _key(self, case: EvalCase, sample_index: int) -> EvalCacheEntryKey:
+        return EvalCacheEntryKey(
+            case_id=case.id,
+            sample_index=sample_index,
+            content_hash=case_content_hash(case),
+            llm_name=self.llm_name,
+            program_fingerprint=self.program_fingerprint,
+        )
+
+    def _entry_path(self, digest: str) -> Path:
+        return self.root / "entries" / digest[:2] / f"{digest}.json"
+
+    @staticmethod
+    def _index_key(key: EvalCacheEntryKey) -> _IndexKey:
+        return key.case_id, key.sample_index, key.llm_name
+
+    def _load_manifest(self) -> dict[_IndexKey, EvalCacheEntryKey]:
+        latest: dict[_IndexKey, EvalCacheEntryKey] = {}
+        manifest = self.root / MANIFEST_FILE
+        if not manifest.exists():
+            return latest
+        with open(manifest, encoding="utf-8") as lines:
+            for line in lines:
+                try:
+                    key = EvalCacheEntryKey.model_validate_json(line)
+                except ValidationError:
+                    continue
+                latest[self._index_key(key)] = key
+        return latest
+
+    def _miss_reason(self, key: EvalCacheEntryKey) -> EvalCacheMissReason:
+        previous = self._latest.get(self._index_key(key))
+        if previous is None:
+            return "new_case"
+        if previous.content_hash != key.content_hash:
+            return "content_changed"
+        if previous.program_fingerprint != key.program_fingerprint:
+            return "program_changed"
+        return "not_cached"
+
+    def get(self, case: EvalCase, sample_index: int = 0) -> PhysicsSolution | None:
+        key = self._key(case, sample_index)
+        path = self._entry_path(key.digest)
+        try:
+            solution = PhysicsSolution.model_validate_json(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValidationError):
+            self._report.misses.append(
+                EvalCacheMiss(case_id=case.id, reason=self._miss_reason(key))
+            )
+            return None
+        self._report.hits += 1
+        return solution
+
+    def put(self, case: EvalCase, solution: PhysicsSolution, sample_index: int = 0) -> None:
+        key = self._key(case, sample_index)
+        path = self._entry_path(key.digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(solution.model_dump_json(), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+        with open(self.root / MANIFEST_FILE, "a", encoding="utf-8") as manifest:
+            manifest.write(key.model_dump_json() + "\n")
+        self._latest[self._index_key(key)] = key
+
+    def report(self) -> EvalCacheReport:
+        return self._report.model_copy(deep=True)
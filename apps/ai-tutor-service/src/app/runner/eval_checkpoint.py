@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from app.domain.models.eval import EvalCaseScore
+
+logger = logging.getLogger(__name__)
+
+
+class EvalCheckpoint:
+    """Append-only JSONL log of finished eval cases, one ``EvalCaseScore`` per line."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def append(self, case_score: EvalCaseScore) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as checkpoint:
+            checkpoint.write(case_score.model_dump_json() + "\n")
+            checkpoint.flush()
+
+    def load(self) -> dict[str, EvalCaseScore]:
+        """Return completed samples by ``result_key``; a torn last line (crash mid-write)
+        is ignored."""
+        completed: dict[str, EvalCaseScore] = {}
+        with open(self.path, encoding="utf-8") as checkpoint:
+            for index, line in enumerate(checkpoint):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    case_score = EvalCaseScore.model_validate_json(line)
+                except ValidationError:
+                    logger.warning(
+                        "[eval] ignoring unreadable checkpoint line %s in %s", index + 1, self.path
+                    )
+                    continue
+                if case_score.result_key is not None:
+                    completed[case_score.result_key] = case_score
+        return completed
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Literal, TypeVar
+
+from pydantic import BaseModel
+
+from app.domain.models.eval import EvalCaseScore
+from app.runner.artifact_store import ArtifactIndexEntry
+from app.runner.run_artifact import EvalRunArtifact
+
+CaseFlip = Literal["pass_to_fail", "fail_to_pass"]
+Number = TypeVar("Number", int, float)
+
+# Latency and token deltas within this fraction of the baseline are run-to-run noise.
+DEFAULT_NOISE_RATIO = 0.2
+
+
+class EvalCaseDiff(BaseModel):
+    result_key: str
+    baseline_passed: bool
+    candidate_passed: bool
+    flip: CaseFlip | None = None
+    score_delta: float
+    latency_delta_ms: float | None = None
+    token_delta: int | None = None
+
+
+class EvalRunDiff(BaseModel):
+    baseline_trace_id: str
+    candidate_trace_id: str
+    common_cases: int
+    pass_rate_delta: float
+    avg_total_score_delta: float
+    latency_p90_delta_ms: float | None = None
+    token_delta: int
+    regressions: list[str]
+    fixes: list[str]
+    # Only cases whose outcome or score changed, or whose latency or tokens moved by more
+    # than the noise ratio.
+    changed_cases: list[EvalCaseDiff]
+    only_in_baseline: list[str]
+    only_in_candidate: list[str]
+
+
+def _tokens(result: EvalCaseScore) -> int | None:
+    if result.metrics is None or result.metrics.cached:
+        return None
+    return result.metrics.prompt_tokens + result.metrics.completion_tokens
+
+
+def _latency(result: EvalCaseScore) -> float | None:
+    if result.metrics is None or result.metrics.cached:
+        return None
+    return result.metrics.latency_ms
+
+
+def _delta(before: Number | None, after: Number | None) -> Number | None:
+    if before is None or after is None:
+        return None
+    return after - before
+
+
+def diff_case(key: str, baseline: EvalCaseScore, candidate: EvalCaseScore) -> EvalCaseDiff:
+    flip: CaseFlip | None = None
+    if baseline.passed and not candidate.passed:
+        flip = "pass_to_fail"
+    elif candidate.passed and not baseline.passed:
+        flip = "fail_to_pass"
+    return EvalCaseDiff(
+        result_key=key,
+        baseline_passed=baseline.passed,
+        candidate_passed=candidate.passed,
+        flip=flip,
+        score_delta=candidate.total_score - baseline.total_score,
+        latency_delta_ms=_delta(_latency(baseline), _latency(candidate)),
+        token_delta=_delta(_tokens(baseline), _tokens(candidate)),
+    )
+
+
+def _beyond_noise(delta: Number | None, before: Number | None, noise_ratio: float) -> bool:
+    if delta is None or before is None:
+        return False
+    return abs(delta) > noise_ratio * abs(before)
+
+
+def is_changed(
+    diff: EvalCaseDiff, baseline: EvalCaseScore, noise_ratio: float = DEFAULT_NOISE_RATIO
+) -> bool:
+    return (
+        diff.flip is not None
+        or diff.score_delta != 0
+        or _beyond_noise(diff.latency_delta_ms, _latency(baseline), noise_ratio)
+        or _beyond_noise(diff.token_delta, _tokens(baseline), noise_ratio)
+    )
+
+
+def _by_key(artifact: EvalRunArtifact) -> dict[str, EvalCaseScore]:
+    return {
+        result.result_key: result
+        for result in artifact.run_summary.case_results
+        if result.result_key is not None
+    }
+
+
+def diff_eval_runs(
+    baseline: EvalRunArtifact,
+    candidate: EvalRunArtifact,
+    *,
+    noise_ratio: float = DEFAULT_NOISE_RATIO,
+) -> EvalRunDiff:
+    """Per-case differences of ``candidate`` against ``baseline``.
+
+    Cases are matched by result key (case id and sample index); aggregate deltas come
+    from the run summaries, so they include cases present in only one run. A case
+    whose only change is latency or tokens within ``noise_ratio`` of the baseline is
+    not listed as changed.
+    """
+    before = _by_key(baseline)
+    after = _by_key(candidate)
+    common = [key for key in before if key in after]
+    diffs = [diff_case(key, before[key], after[key]) for key in common]
+    before_summary = baseline.run_summary
+    after_summary = candidate.run_summary
+    return EvalRunDiff(
+        baseline_trace_id=baseline.trace_id,
+        candidate_trace_id=candidate.trace_id,
+        common_cases=len(common),
+        pass_rate_delta=after_summary.pass_rate - before_summary.pass_rate,
+        avg_total_score_delta=after_summary.avg_total_score - before_summary.avg_total_score,
+        latency_p90_delta_ms=_delta(before_summary.latency_p90_ms, after_summary.latency_p90_ms),
+        token_delta=(after_summary.total_prompt_tokens + after_summary.total_completion_tokens)
+        - (before_summary.total_prompt_tokens + before_summary.total_completion_tokens),
+        regressions=[diff.result_key for diff in diffs if diff.flip == "pass_to_fail"],
+        fixes=[diff.result_key for diff in diffs if diff.flip == "fail_to_pass"],
+        changed_cases=[
+            diff for diff in diffs if is_changed(diff, before[diff.result_key], noise_ratio)
+        ],
+        only_in_baseline=[key for key in before if key not in after],
+        only_in_candidate=[key for key in after if key not in before],
+    )
+
+
+def format_trend(entries: Iterable[ArtifactIndexEntry], *, bar_width: int = 20) -> list[str]:
+    """Text table of pass rate (with a bar) and p90 latency, one row per eval run."""
+    rows = [f"{'started_at':<20} {'trace_id':<33} {'model':<20} {'pass_rate':>9}  {'p90_ms':>6}"]
+    for entry in entries:
+        pass_rate = entry.pass_rate or 0.0
+        bar = "#" * round(pass_rate * bar_width)
+        p90 = f"{entry.latency_p90_ms:.0f}" if entry.latency_p90_ms is not None else "-"
+        rows.append(
+            f"{entry.started_at.isoformat(timespec='seconds')[:19]:<20} "
+            f"{entry.trace_id:<33} {(entry.llm_name or '-')[:20]:<20} "
+            f"{pass_rate:>9.3f}  {p90:>6}  {bar}"
+        )
+    return rows
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from app.domain.models.eval import EvalRunSummary
+from app.runner.run_artifact import EvalModelComparison
+
+
+def compare_models(summaries: dict[str, EvalRunSummary]) -> list[EvalModelComparison]:
+    """One comparison row per model, best pass rate first (ties: higher total score)."""
+    rows = [
+        EvalModelComparison(
+            model=model,
+            total_cases=summary.total_cases,
+            pass_rate=summary.pass_rate,
+            avg_total_score=summary.avg_total_score,
+            error_cases=sum(1 for result in summary.case_results if result.error is not None),
+            latency_p90_ms=summary.latency_p90_ms,
+            total_tokens=summary.total_prompt_tokens + summary.total_completion_tokens,
+            estimated_cost_usd=summary.estimated_cost_usd,
+        )
+        for model, summary in summaries.items()
+    ]
+    return sorted(rows, key=lambda row: (-row.pass_rate, -row.avg_total_score))
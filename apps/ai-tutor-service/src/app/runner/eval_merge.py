@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from app.application.services.eval_service import summarize
+from app.domain.models.eval import EvalCacheReport
+from app.runner.run_artifact import EvalRunArtifact
+
+
+def merge_shard_artifacts(shards: list[EvalRunArtifact], *, trace_id: str) -> EvalRunArtifact:
+    """Combine the artifacts of one sharded eval run into a single artifact.
+
+    Aggregate metrics are recomputed from the concatenated case results (a mean of
+    shard means would weight shards equally regardless of their size). Shards must
+    share the dataset, model and program version.
+    """
+    if not shards:
+        raise ValueError("Nothing to merge")
+
+    dataset_paths = {shard.dataset_path for shard in shards}
+    if len(dataset_paths) > 1:
+        raise ValueError(f"Shards come from different datasets: {sorted(dataset_paths)}")
+    llm_names = {shard.llm_name for shard in shards}
+    if len(llm_names) > 1:
+        raise ValueError(f"Shards come from different models: {sorted(map(str, llm_names))}")
+    program_versions = {shard.program_version for shard in shards}
+    if len(program_versions) > 1:
+        raise ValueError(
+            f"Shards come from different programs: {sorted(map(str, program_versions))}"
+        )
+
+    shard_specs = [shard.shard for shard in shards]
+    named_specs = [spec for spec in shard_specs if spec is not None]
+    if len(set(named_specs)) != len(named_specs):
+        raise ValueError(f"Duplicate shards: {sorted(named_specs)}")
+
+    result_keys = [
+        case_result.result_key
+        for shard in shards
+        for case_result in shard.run_summary.case_results
+        if case_result.result_key is not None
+    ]
+    if len(set(result_keys)) != len(result_keys):
+        raise ValueError("Shards overlap: some cases were evaluated more than once")
+
+    ordered = sorted(shards, key=lambda shard: _shard_index(shard.shard))
+    parents = {shard.parent_trace_id for shard in shards}
+    started_at = min(shard.started_at for shard in shards)
+    finished_at = max(shard.finished_at for shard in shards)
+
+    cache_reports = [shard.cache_report for shard in ordered if shard.cache_report is not None]
+    cache_report = (
+        EvalCacheReport(
+            hits=sum(report.hits for report in cache_reports),
+            misses=[miss for report in cache_reports for miss in report.misses],
+        )
+        if cache_reports
+        else None
+    )
+
+    return EvalRunArtifact(
+        trace_id=trace_id,
+        started_at=started_at,
+        finished_at=finished_at,
+        # Wall clock from the first shard start to the last shard end.
+        duration_ms=round((finished_at - started_at).total_seconds() * 1000),
+        llm_name=llm_names.pop(),
+        program_version=program_versions.pop(),
+        dataset_path=dataset_paths.pop(),
+        parent_trace_id=parents.pop() if len(parents) == 1 else None,
+        shard_trace_ids=[shard.trace_id for shard in ordered],
+        cache_report=cache_report,
+        # Sorted by case and sample, so a merged run diffs cleanly against another one
+        # whatever the sharding.
+        run_summary=summarize(
+            sorted(
+                (
+                    case_result
+                    for shard in ordered
+                    for case_result in shard.run_summary.case_results
+                ),
+                key=lambda result: (
+                    result.case_id is None,
+                    result.case_id or "",
+                    result.sample_index,
+                ),
+            )
+        ),
+    )
+
+
+def _shard_index(spec: str | None) -> int:
+    if spec is None:
+        return 0
+    return int(spec.partition("/")[0])
+
+
+def missing_shards(shards: list[EvalRunArtifact]) -> list[str]:
+    """Shard specs ("i/n") absent from ``shards``, based on the shard count they declare."""
+    counts = {int(shard.shard.partition("/")[2]) for shard in shards if shard.shard is not None}
+    present = {shard.shard for shard in shards}
+    return [
+        f"{index}/{count}"
+        for count in sorted(counts)
+        for index in range(1, count + 1)
+        if f"{index}/{count}" not in present
+    ]
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from app.runner.artifact import default_artifacts_dir
+from app.runner.artifact_store import (
+    ArtifactIndexEntry,
+    ArtifactQuery,
+    ArtifactStore,
+    load_eval_artifact,
+)
+from app.runner.eval_compare import DEFAULT_NOISE_RATIO, diff_eval_runs, format_trend
+
+
+def _format_entry(entry: ArtifactIndexEntry) -> str:
+    pass_rate = f"{entry.pass_rate:.3f}" if entry.pass_rate is not None else "-"
+    return "\t".join(
+        [
+            entry.started_at.isoformat(timespec="seconds"),
+            entry.trace_id,
+            entry.kind,
+            entry.agent or "-",
+            entry.llm_name or "-",
+            f"{entry.duration_ms}ms",
+            pass_rate,
+            entry.error_type or "ok",
+        ]
+    )
+
+
+def query_artifacts(*, query: ArtifactQuery, show: bool) -> int:
+    """Print the stored artifacts matching ``query``, newest first.
+
+    Only the index is read, unless ``show`` asks for the full artifact payloads.
+    """
+    store = ArtifactStore(default_artifacts_dir())
+    entries = store.query(query.model_copy(update={"newest_first": True}))
+    for entry in entries:
+        if show:
+            print(store.read_json(entry.trace_id))
+        else:
+            print(_format_entry(entry))
+    if not entries:
+        print("No artifacts found.")
+    return 0
+
+
+def _signed(value: float | None, fmt: str) -> str:
+    return "-" if value is None else format(value, "+" + fmt)
+
+
+def compare_evals(
+    *, artifact_refs: list[str], print_output: bool, noise_ratio: float = DEFAULT_NOISE_RATIO
+) -> int:
+    """Diff each eval artifact against the first one (the baseline).
+
+    Candidates are loaded one at a time. Returns 1 when any case went from pass to fail.
+    """
+    store = ArtifactStore(default_artifacts_dir())
+    baseline = load_eval_artifact(store, artifact_refs[0])
+    regressed = False
+    for ref in artifact_refs[1:]:
+        diff = diff_eval_runs(baseline, load_eval_artifact(store, ref), noise_ratio=noise_ratio)
+        regressed = regressed or bool(diff.regressions)
+        print(
+            f"{diff.baseline_trace_id} -> {diff.candidate_trace_id}: "
+            f"cases={diff.common_cases} "
+            f"pass_rate={_signed(diff.pass_rate_delta, '.3f')} "
+            f"avg_total_score={_signed(diff.avg_total_score_delta, '.3f')} "
+            f"p90={_signed(diff.latency_p90_delta_ms, '.0f')}ms "
+            f"tokens={_signed(diff.token_delta, 'd')} "
+            f"regressions={len(diff.regressions)} fixes={len(diff.fixes)}"
+        )
+        for case in diff.changed_cases:
+            outcome = case.flip or ("pass" if case.candidate_passed else "fail")
+            print(
+                f"  {case.result_key}\t{outcome}\tscore={_signed(case.score_delta, '.2f')}"
+                f"\tlatency={_signed(case.latency_delta_ms, '.0f')}ms"
+                f"\ttokens={_signed(case.token_delta, 'd')}"
+            )
+        if diff.only_in_baseline or diff.only_in_candidate:
+            print(
+                f"  only in baseline: {len(diff.only_in_baseline)}, "
+                f"only in candidate: {len(diff.only_in_candidate)}"
+            )
+        if print_output:
+            print(diff.model_dump_json(indent=2))
+    return 1 if regressed else 0
+
+
+def eval_trend(*, query: ArtifactQuery) -> int:
+    """Print pass rate and p90 latency of the latest eval runs, oldest first.
+
+    Reads only the artifact index, so long histories are not parsed.
+    """
+    store = ArtifactStore(default_artifacts_dir())
+    entries = store.query(query.model_copy(update={"kind": "eval", "newest_first": True}))
+    for row in format_trend(reversed(entries)):
+        print(row)
+    return 0
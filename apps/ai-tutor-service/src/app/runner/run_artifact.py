@@ -5,8 +5,9 @@ from typing import Literal
 
 from pydantic import BaseModel, Field
 
-from app.domain.models.eval import EvalRunSummary
+from app.domain.models.eval import EvalCacheReport, EvalRunSummary
 from app.domain.models.physics import PhysicsQuestion, PhysicsSolution
+from app.domain.models.usage import SolveUsage
 
 
 class RunError(BaseModel):
@@ -24,11 +25,16 @@ class RunArtifact(BaseModel):
 
     agent: str = Field(min_length=1)
     llm_name: str | None = None
+    program_version: str | None = None
 
     input: PhysicsQuestion
     raw_output: str | None = None
     validated_output: PhysicsSolution | None = None
     error: RunError | None = None
+    # Tokens and estimated cost of the solve, per LM call.
+    usage: SolveUsage | None = None
+    # ``--profile`` runs: cProfile dump, with the phase breakdown in ``<name>.phases.json``.
+    profile_path: str | None = None
 
 
 class EvalRunArtifact(BaseModel):
@@ -40,6 +46,45 @@ class EvalRunArtifact(BaseModel):
     duration_ms: int = Field(ge=0)
 
     llm_name: str | None = None
+    program_version: str | None = None
 
     dataset_path: str = Field(min_length=1)
+    resumed_from: str | None = None
+    # Re-scored runs: trace id of the artifact whose predictions were re-scored.
+    rescored_from: str | None = None
+    # Sharded runs: "i/n" of this shard and the trace id shared by all shards of the run.
+    shard: str | None = None
+    parent_trace_id: str | None = None
+    # Merged runs: trace ids of the shard artifacts that were combined.
+    shard_trace_ids: list[str] = Field(default_factory=list)
+    cache_report: EvalCacheReport | None = None
+    profile_path: str | None = None
     run_summary: EvalRunSummary
+
+
+class EvalModelComparison(BaseModel):
+    model: str
+    total_cases: int
+    pass_rate: float
+    avg_total_score: float
+    error_cases: int
+    latency_p90_ms: float | None = None
+    total_tokens: int = 0
+    estimated_cost_usd: float | None = None
+
+
+class EvalMatrixArtifact(BaseModel):
+    format_version: Literal["eval_matrix_artifact.v1"] = Field(default="eval_matrix_artifact.v1")
+
+    trace_id: str = Field(min_length=1)
+    started_at: datetime
+    finished_at: datetime
+    duration_ms: int = Field(ge=0)
+
+    program_version: str | None = None
+
+    dataset_path: str = Field(min_length=1)
+    models: list[str] = Field(min_length=1)
+    # One row per model, ordered by pass rate (best first).
+    comparison: list[EvalModelComparison]
+    summaries: dict[str, EvalRunSummary]
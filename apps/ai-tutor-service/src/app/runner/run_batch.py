@@ -0,0 +1,231 @@
+import asyncio
+import logging
+import sys
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+
+import dspy
+from openinference.semconv.trace import SpanAttributes
+from opentelemetry import context as otel_context
+from opentelemetry import trace
+
+from app.application.services.physics_service import PhysicsService
+from app.core.observability import init_observability
+from app.core.observability_contract import AttrKey, SpanKind, SpanName
+from app.core.rate_limit import AsyncRateLimiter
+from app.core.run_metrics import collect_run_metrics, set_usage_attributes
+from app.core.tool_telemetry import TOOL_STATS, format_tool_stats
+from app.data.agents.physics_agent import PhysicsAgent
+from app.data.dspy.cassette import CassetteMode
+from app.data.dspy.rate_limited_lm import RateLimitedLM
+from app.domain.models.physics import PhysicsQuestion, PhysicsSolution
+from app.runner.artifact import (
+    artifact_trace_id,
+    default_artifacts_dir,
+    extract_raw_output,
+    solve_usage,
+)
+from app.runner.artifact_store import ArtifactStore
+from app.runner.batch import BatchItem, BatchResult, iter_batch_items
+from app.runner.run_artifact import RunArtifact, RunError
+from app.runner.utils import load_configured_program, setup_llm
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(tz=UTC)
+
+
+class _BatchRunner:
+    def __init__(
+        self,
+        *,
+        agent: str,
+        llm_name: str,
+        offline: bool,
+        batch_span: trace.Span,
+        store: ArtifactStore,
+        max_lm_calls_per_minute: float | None,
+    ) -> None:
+        self.agent = agent
+        self.llm_name = llm_name
+        self.store = store
+        # One agent and service for the whole batch; each item gets its own LM copy so
+        # the raw output read from the LM history belongs to that item.
+        solver = PhysicsAgent()
+        self.program_version = load_configured_program([solver], offline=offline)
+        batch_span.set_attribute(AttrKey.PROGRAM_VERSION, self.program_version)
+        self.service = PhysicsService(solver)
+        self.batch_link = trace.Link(batch_span.get_span_context())
+        self.lm = dspy.settings.lm
+        if max_lm_calls_per_minute is not None:
+            self.lm = RateLimitedLM(self.lm, AsyncRateLimiter(max_lm_calls_per_minute))
+        self.tracer = trace.get_tracer(__name__)
+
+    async def solve(self, index: int, item: BatchItem | RunError) -> BatchResult:
+        if isinstance(item, RunError):
+            return BatchResult(index=index, ok=False, error=item)
+
+        # Each item is its own trace (and artifact), linked to the batch span.
+        with self.tracer.start_as_current_span(
+            SpanName.RUNNER_RUN_CASE,
+            context=otel_context.Context(),
+            links=[self.batch_link],
+        ) as span:
+            trace_id = artifact_trace_id(span)
+            span.set_attribute(AttrKey.TRACE_ID, trace_id)
+            span.set_attribute(AttrKey.BATCH_ITEM_INDEX, index)
+            span.set_attribute(SpanAttributes.AGENT_NAME, self.agent)
+            span.set_attribute(SpanAttributes.OPENINFERENCE_SPAN_KIND, SpanKind.CHAIN)
+            span.set_attribute(SpanAttributes.LLM_MODEL_NAME, self.llm_name)
+            span.set_attribute(AttrKey.PROGRAM_VERSION, self.program_version)
+
+            question = PhysicsQuestion(text=item.question, reference_data=item.reference_data)
+            started_at = _utcnow()
+            validated_output: PhysicsSolution | None = None
+            run_error: RunError | None = None
+            raw_output: str | None = None
+            with collect_run_metrics() as run_metrics:
+                try:
+                    with dspy.context(lm=self.lm.copy()):
+                        try:
+                            validated_output = await self.service.solve_once(question)
+                        finally:
+                            raw_output = extract_raw_output()
+                except Exception as exc:  # noqa: BLE001 - want artifact even on failure
+                    run_error = RunError(type=type(exc).__name__, message=str(exc) or repr(exc))
+                    span.set_attribute(AttrKey.ERROR_TYPE, run_error.type)
+                    span.set_attribute(AttrKey.ERROR_MESSAGE, run_error.message)
+                    span.set_status(trace.StatusCode.ERROR)
+            set_usage_attributes(span, run_metrics)
+            finished_at = _utcnow()
+            duration_ms = int((finished_at - started_at).total_seconds() * 1000)
+
+            artifact = RunArtifact(
+                trace_id=trace_id,
+                started_at=started_at,
+                finished_at=finished_at,
+                duration_ms=duration_ms,
+                agent=self.agent,
+                llm_name=self.llm_name,
+                program_version=self.program_version,
+                input=question,
+                raw_output=raw_output,
+                validated_output=validated_output,
+                error=run_error,
+                usage=solve_usage(run_metrics),
+            )
+            await asyncio.to_thread(self.store.put, artifact)
+            if run_error is None:
+                span.set_status(trace.StatusCode.OK)
+
+        return BatchResult(
+            index=index,
+            id=item.id,
+            trace_id=trace_id,
+            ok=run_error is None,
+            duration_ms=duration_ms,
+            solution=validated_output,
+            error=run_error,
+        )
+
+
+async def _run_items(
+    runner: _BatchRunner, items: Iterator[tuple[int, BatchItem | RunError]], concurrency: int
+) -> tuple[int, int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks: set[asyncio.Task[BatchResult]] = set()
+    total = failed = 0
+
+    def emit(task: asyncio.Task[BatchResult]) -> None:
+        nonlocal failed
+        semaphore.release()
+        tasks.discard(task)
+        exc = task.exception()
+        if exc is not None:
+            failed += 1
+            logger.error("[batch] item failed error_type=%s error='%s'", type(exc).__name__, exc)
+            return
+        result = task.result()
+        failed += 0 if result.ok else 1
+        print(result.model_dump_json(), flush=True)
+
+    while True:
+        # Read the next line off the event loop (stdin may block) only once a slot is
+        # free, so the input is streamed rather than loaded up front.
+        await semaphore.acquire()
+        next_item = await asyncio.to_thread(next, items, None)
+        if next_item is None:
+            semaphore.release()
+            break
+        total += 1
+        task = asyncio.create_task(runner.solve(*next_item))
+        tasks.add(task)
+        task.add_done_callback(emit)
+
+    if tasks:
+        await asyncio.wait(set(tasks))
+    return total, failed
+
+
+def run_batch(
+    *,
+    agent: str,
+    input_path: Path | None,
+    offline: bool,
+    concurrency: int = 1,
+    max_lm_calls_per_minute: float | None = None,
+    cassette: Path | None = None,
+    cassette_mode: CassetteMode | None = None,
+) -> int:
+    """Solve every JSONL item of ``input_path`` (stdin when None) in one process.
+
+    One ``RunArtifact`` per item goes to the artifact store and one ``BatchResult``
+    NDJSON line per item is printed to stdout as soon as the item finishes.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1")
+    if agent != "physics_descriptive":
+        raise ValueError(f"Unsupported agent: {agent}")
+
+    init_observability()
+    tracer = trace.get_tracer(__name__)
+
+    with tracer.start_as_current_span(SpanName.RUNNER_RUN_BATCH) as span:
+        span.set_attribute(AttrKey.OFFLINE, offline)
+        span.set_attribute(AttrKey.BATCH_CONCURRENCY, concurrency)
+        span.set_attribute(SpanAttributes.AGENT_NAME, agent)
+        span.set_attribute(SpanAttributes.OPENINFERENCE_SPAN_KIND, SpanKind.CHAIN)
+        if cassette_mode is not None:
+            span.set_attribute(AttrKey.LLM_CASSETTE_MODE, cassette_mode)
+        llm_name = setup_llm(offline=offline, cassette=cassette, cassette_mode=cassette_mode)
+        span.set_attribute(SpanAttributes.LLM_MODEL_NAME, llm_name)
+
+        runner = _BatchRunner(
+            agent=agent,
+            llm_name=llm_name,
+            offline=offline,
+            batch_span=span,
+            store=ArtifactStore(default_artifacts_dir()),
+            max_lm_calls_per_minute=max_lm_calls_per_minute,
+        )
+        source = open(input_path, encoding="utf-8") if input_path is not None else sys.stdin
+        try:
+            total, failed = asyncio.run(_run_items(runner, iter_batch_items(source), concurrency))
+        finally:
+            if input_path is not None:
+                source.close()
+
+        span.set_attribute(AttrKey.BATCH_TOTAL_ITEMS, total)
+        span.set_attribute(AttrKey.BATCH_FAILED_ITEMS, failed)
+        span.set_status(trace.StatusCode.ERROR if failed else trace.StatusCode.OK)
+        logger.info("[batch] done items=%s failed=%s", total, failed)
+        tool_stats = TOOL_STATS.summary()
+        if tool_stats:
+            logger.info("[batch] tool stats:")
+            for row in format_tool_stats(tool_stats):
+                logger.info("[batch]   %s", row)
+
+        return 1 if failed else 0
@@ -1,6 +1,7 @@
 import asyncio
 import traceback
 from datetime import UTC, datetime
+from pathlib import Path
 
 from openinference.semconv.trace import SpanAttributes
 from opentelemetry import trace
@@ -8,41 +9,79 @@ from opentelemetry import trace
 from app.application.services.physics_service import PhysicsService
 from app.core.observability import init_observability
 from app.core.observability_contract import AttrKey, SpanKind, SpanName
+from app.core.profiling import (
+    ARTIFACT_WRITE_PHASE,
+    LLM_SETUP_PHASE,
+    RunProfiler,
+    phase,
+    print_profile_report,
+)
+from app.core.run_metrics import collect_run_metrics, set_usage_attributes
 from app.data.agents.physics_agent import PhysicsAgent
+from app.data.dspy.cassette import CassetteMode
 from app.domain.models.physics import PhysicsQuestion, PhysicsSolution
-from app.runner.artifact import default_artifacts_dir, extract_raw_output
+from app.runner.artifact import (
+    artifact_trace_id,
+    default_artifacts_dir,
+    extract_raw_output,
+    solve_usage,
+)
+from app.runner.artifact_store import ArtifactStore
 from app.runner.run_artifact import RunArtifact, RunError
-from app.runner.utils import setup_llm
+from app.runner.utils import load_configured_program, setup_llm
 
 
 def _utcnow() -> datetime:
     return datetime.now(tz=UTC)
 
 
-async def _run_physics_descriptive(question_text: str) -> PhysicsSolution:
-    agent = PhysicsAgent()
+async def _run_physics_descriptive(agent: PhysicsAgent, question_text: str) -> PhysicsSolution:
     service = PhysicsService(agent)
     return await service.solve_once(PhysicsQuestion(text=question_text))
 
 
-def run_case(*, agent: str, question: str, offline: bool, print_output: bool) -> int:
+def run_case(
+    *,
+    agent: str,
+    question: str,
+    offline: bool,
+    print_output: bool,
+    cassette: Path | None = None,
+    cassette_mode: CassetteMode | None = None,
+    profile: bool = False,
+) -> int:
     init_observability()
 
     started_at = _utcnow()
     tracer = trace.get_tracer(__name__)
 
-    with tracer.start_as_current_span(
-        SpanName.RUNNER_RUN_CASE,
-    ) as span:
-        trace_id = format(span.get_span_context().trace_id, "032x")
+    with (
+        tracer.start_as_current_span(SpanName.RUNNER_RUN_CASE) as span,
+        collect_run_metrics() as run_metrics,
+    ):
+        trace_id = artifact_trace_id(span)
         span.set_attribute(AttrKey.TRACE_ID, trace_id)
         span.set_attribute(AttrKey.OFFLINE, offline)
         span.set_attribute(SpanAttributes.AGENT_NAME, agent)
         span.set_attribute(SpanAttributes.OPENINFERENCE_SPAN_KIND, SpanKind.CHAIN)
 
-        llm_name = setup_llm(offline=offline)
+        profiler = RunProfiler() if profile else None
+        profile_path = (
+            default_artifacts_dir() / "profiles" / f"{trace_id}.prof" if profile else None
+        )
+        if profiler is not None:
+            profiler.start()
+
+        if cassette_mode is not None:
+            span.set_attribute(AttrKey.LLM_CASSETTE_MODE, cassette_mode)
+        with phase(LLM_SETUP_PHASE):
+            llm_name = setup_llm(offline=offline, cassette=cassette, cassette_mode=cassette_mode)
         span.set_attribute(SpanAttributes.LLM_MODEL_NAME, llm_name)
 
+        physics_agent = PhysicsAgent()
+        program_version = load_configured_program([physics_agent], offline=offline)
+        span.set_attribute(AttrKey.PROGRAM_VERSION, program_version)
+
         raw_output: str | None = None
         validated_output: PhysicsSolution | None = None
         run_error: RunError | None = None
@@ -52,7 +91,7 @@ def run_case(*, agent: str, question: str, offline: bool, print_output: bool) ->
             if agent != "physics_descriptive":
                 raise ValueError(f"Unsupported agent: {agent}")
 
-            validated_output = asyncio.run(_run_physics_descriptive(question))
+            validated_output = asyncio.run(_run_physics_descriptive(physics_agent, question))
             raw_output = extract_raw_output()
 
             finished_at = _utcnow()
@@ -65,6 +104,7 @@ def run_case(*, agent: str, question: str, offline: bool, print_output: bool) ->
                 duration_ms=duration_ms,
                 agent=str(agent),
                 llm_name=llm_name,
+                program_version=program_version,
                 input=PhysicsQuestion(text=str(question)),
                 raw_output=raw_output,
                 validated_output=validated_output,
@@ -89,27 +129,34 @@ def run_case(*, agent: str, question: str, offline: bool, print_output: bool) ->
                 duration_ms=duration_ms,
                 agent=str(agent),
                 llm_name=llm_name,
+                program_version=program_version,
                 input=PhysicsQuestion(text=str(question)),
                 raw_output=raw_output,
                 validated_output=validated_output,
                 error=run_error,
             )
 
-        out_path = default_artifacts_dir() / started_at.date().isoformat() / f"{trace_id}.json"
-
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_text(artifact.model_dump_json(indent=2), encoding="utf-8")
+        if profile_path is not None:
+            artifact.profile_path = str(profile_path)
+        artifact.usage = solve_usage(run_metrics)
+        set_usage_attributes(span, run_metrics)
+        with phase(ARTIFACT_WRITE_PHASE):
+            location = ArtifactStore(default_artifacts_dir()).put(artifact)
+        if profiler is not None and profile_path is not None:
+            profiler.stop()
+            profiler.save(profile_path)
+            print_profile_report(profiler, profile_path)
 
         if run_error is not None:
             # Help debugging without losing the artifact.
-            print("Execution failed. Artifact saved to:", out_path)
+            print("Execution failed. Artifact", trace_id, "stored at:", location)
             print("Error:", run_error.type, "-", run_error.message)
             if traceback_str is not None:
                 print("Traceback:")
                 print(traceback_str)
             return 1
 
-        print("OK. Artifact saved to:", out_path)
+        print("OK. Artifact", trace_id, "stored at:", location)
         span.set_status(trace.StatusCode.OK)
         if print_output and validated_output is not None:
             print(validated_output.model_dump_json(indent=2))
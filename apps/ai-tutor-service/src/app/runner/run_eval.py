@@ -1,18 +1,49 @@
 import asyncio
+import json
 import logging
+from collections import Counter
 from datetime import UTC, datetime
 from pathlib import Path
 
+import dspy
 from openinference.semconv.trace import SpanAttributes
 from opentelemetry import trace
 
-from app.application.services.eval_service import EvalService, load_cases
+from app.application.services.eval_service import (
+    EvalCaseFilter,
+    EvalMatrixService,
+    EvalService,
+    EvalShard,
+    iter_cases,
+    load_cases,
+    rescore,
+    summarize,
+)
 from app.core.observability import init_observability
 from app.core.observability_contract import AttrKey, SpanName
+from app.core.profiling import (
+    ARTIFACT_WRITE_PHASE,
+    LLM_SETUP_PHASE,
+    RunProfiler,
+    phase,
+    print_profile_report,
+)
+from app.core.rate_limit import AsyncRateLimiter
+from app.core.settings import get_settings
+from app.core.tool_telemetry import TOOL_STATS, format_tool_stats
 from app.data.agents.physics_agent import PhysicsAgent
-from app.runner.artifact import default_artifacts_dir
-from app.runner.run_artifact import EvalRunArtifact
-from app.runner.utils import setup_llm
+from app.data.dspy.cassette import CassetteMode
+from app.data.dspy.dspy_config import build_lm
+from app.data.dspy.rate_limited_lm import RateLimitedLM
+from app.domain.models.eval import EvalCaseScore
+from app.runner.artifact import artifact_trace_id, default_artifacts_dir
+from app.runner.artifact_store import ArtifactStore, load_eval_artifact
+from app.runner.eval_cache import FileEvalCache
+from app.runner.eval_checkpoint import EvalCheckpoint
+from app.runner.eval_matrix import compare_models
+from app.runner.eval_merge import merge_shard_artifacts, missing_shards
+from app.runner.run_artifact import EvalMatrixArtifact, EvalRunArtifact
+from app.runner.utils import load_configured_program, setup_llm
 
 logger = logging.getLogger(__name__)
 
@@ -21,28 +52,122 @@ def _utcnow() -> datetime:
     return datetime.now(tz=UTC)
 
 
-def run_eval(*, dataset: str, max_cases: int | None, offline: bool, print_output: bool) -> int:
+def _round(value: float | None) -> int | None:
+    return round(value) if value is not None else None
+
+
+def run_eval(
+    *,
+    dataset: str,
+    max_cases: int | None,
+    offline: bool,
+    print_output: bool,
+    cassette: Path | None = None,
+    cassette_mode: CassetteMode | None = None,
+    concurrency: int = 1,
+    max_lm_calls_per_minute: float | None = None,
+    resume: str | None = None,
+    use_cache: bool = False,
+    case_filter: EvalCaseFilter | None = None,
+    sample: int | None = None,
+    seed: int = 0,
+    shard: EvalShard | None = None,
+    parent_trace_id: str | None = None,
+    samples_per_case: int = 1,
+    profile: bool = False,
+) -> int:
     init_observability()
     started_at = _utcnow()
     tracer = trace.get_tracer(__name__)
 
     with tracer.start_as_current_span(SpanName.EVAL_RUN) as span:
-        trace_id = format(span.get_span_context().trace_id, "032x")
+        trace_id = artifact_trace_id(span)
         span.set_attribute(AttrKey.TRACE_ID, trace_id)
         span.set_attribute(AttrKey.OFFLINE, offline)
         span.set_attribute(AttrKey.DATASET_PATH, dataset)
         span.set_attribute(SpanAttributes.OPENINFERENCE_SPAN_KIND, "EVALUATOR")
         if max_cases is not None:
             span.set_attribute(AttrKey.EVAL_MAX_CASES, max_cases)
+        span.set_attribute(AttrKey.EVAL_CONCURRENCY, concurrency)
+        span.set_attribute(AttrKey.EVAL_SAMPLES_PER_CASE, samples_per_case)
+        if resume is not None:
+            span.set_attribute(AttrKey.EVAL_RESUMED_FROM, resume)
+        if shard is not None:
+            span.set_attribute(AttrKey.EVAL_SHARD, str(shard))
+        if parent_trace_id is not None:
+            span.set_attribute(AttrKey.EVAL_PARENT_TRACE_ID, parent_trace_id)
+
+        profiler = RunProfiler() if profile else None
+        profile_path = (
+            default_artifacts_dir() / "profiles" / f"{trace_id}.prof" if profile else None
+        )
+        if profiler is not None:
+            profiler.start()
 
-        llm_name = setup_llm(offline=offline)
+        if cassette_mode is not None:
+            span.set_attribute(AttrKey.LLM_CASSETTE_MODE, cassette_mode)
+        with phase(LLM_SETUP_PHASE):
+            llm_name = setup_llm(offline=offline, cassette=cassette, cassette_mode=cassette_mode)
         span.set_attribute(SpanAttributes.LLM_MODEL_NAME, llm_name)
 
+        # A resumed run keeps appending to the checkpoint of the run it resumes.
+        checkpoint = EvalCheckpoint(
+            default_artifacts_dir() / "evals" / f"{resume or trace_id}.checkpoint.jsonl"
+        )
+
         try:
-            cases = load_cases(dataset_path=Path(dataset), max_cases=max_cases)
-            eval_service = EvalService(cases=cases, solver=PhysicsAgent())
+            completed: dict[str, EvalCaseScore] = {}
+            if resume is not None:
+                if not checkpoint.path.exists():
+                    raise FileNotFoundError(f"No checkpoint found for run {resume}")
+                # Errored cases (e.g. rate limited) are retried on resume.
+                completed = {
+                    key: case_score
+                    for key, case_score in checkpoint.load().items()
+                    if case_score.error is None
+                }
+                logger.info("[eval] resuming %s: %s cases already done", resume, len(completed))
+
+            cases = load_cases(
+                dataset_path=Path(dataset),
+                max_cases=max_cases,
+                case_filter=case_filter,
+                sample=sample,
+                seed=seed,
+                shard=shard,
+            )
+            # Repeated samples must not be served from the LM response cache, which
+            # would return the first sample's completion k times.
+            lm = dspy.settings.lm.copy(cache=False) if samples_per_case > 1 else None
+            if max_lm_calls_per_minute is not None:
+                lm = RateLimitedLM(
+                    lm or dspy.settings.lm, AsyncRateLimiter(per_minute=max_lm_calls_per_minute)
+                )
+            solver = PhysicsAgent(lm=lm)
+            program_version = load_configured_program([solver], offline=offline)
+            span.set_attribute(AttrKey.PROGRAM_VERSION, program_version)
+            cache = (
+                FileEvalCache(
+                    default_artifacts_dir() / "eval_cache",
+                    llm_name=llm_name,
+                    program_fingerprint=solver.fingerprint(),
+                )
+                if use_cache
+                else None
+            )
+            eval_service = EvalService(
+                cases=cases,
+                solver=solver,
+                concurrency=concurrency,
+                completed=completed,
+                on_case_done=checkpoint.append,
+                cache=cache,
+                samples=samples_per_case,
+            )
             run_summary = asyncio.run(eval_service.run())
         except Exception as e:
+            if profiler is not None:
+                profiler.stop()
             span.record_exception(e)
             span.set_attribute(AttrKey.ERROR_TYPE, type(e).__name__)
             span.set_attribute(AttrKey.ERROR_MESSAGE, str(e) or repr(e))
@@ -58,6 +183,41 @@ def run_eval(*, dataset: str, max_cases: int | None, offline: bool, print_output
             )
             return 1
 
+        cache_report = cache.report() if cache is not None else None
+        if cache_report is not None:
+            reasons = Counter(miss.reason for miss in cache_report.misses)
+            logger.info(
+                "[eval] cache: %s hits, %s re-solved %s",
+                cache_report.hits,
+                len(cache_report.misses),
+                dict(reasons),
+            )
+
+        logger.info(
+            "[eval] latency p50=%sms p90=%sms p99=%sms, %s LM calls, %s+%s tokens, cost=%s USD",
+            _round(run_summary.latency_p50_ms),
+            _round(run_summary.latency_p90_ms),
+            _round(run_summary.latency_p99_ms),
+            run_summary.total_lm_calls,
+            run_summary.total_prompt_tokens,
+            run_summary.total_completion_tokens,
+            run_summary.estimated_cost_usd,
+        )
+        tool_stats = TOOL_STATS.summary()
+        if tool_stats:
+            logger.info("[eval] tool stats:")
+            for row in format_tool_stats(tool_stats):
+                logger.info("[eval]   %s", row)
+        if samples_per_case > 1:
+            logger.info(
+                "[eval] pass@1=%.3f pass@%s=%.3f pass_rate 95%% CI=[%.3f, %.3f]",
+                run_summary.pass_at_1 or 0.0,
+                samples_per_case,
+                run_summary.pass_at_k or 0.0,
+                run_summary.pass_rate_ci.low if run_summary.pass_rate_ci else 0.0,
+                run_summary.pass_rate_ci.high if run_summary.pass_rate_ci else 1.0,
+            )
+
         finished_at = _utcnow()
         duration_ms = round((finished_at - started_at).total_seconds() * 1000)
         artifact = EvalRunArtifact(
@@ -67,13 +227,22 @@ def run_eval(*, dataset: str, max_cases: int | None, offline: bool, print_output
             duration_ms=duration_ms,
             dataset_path=dataset,
             llm_name=llm_name,
+            program_version=program_version,
+            resumed_from=resume,
+            shard=str(shard) if shard is not None else None,
+            parent_trace_id=parent_trace_id,
+            cache_report=cache_report,
+            profile_path=str(profile_path) if profile_path is not None else None,
             run_summary=run_summary,
         )
 
-        out_path = default_artifacts_dir() / "evals" / f"{trace_id}.json"
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_text(artifact.model_dump_json(indent=2), encoding="utf-8")
-        logger.info("Artifact saved to: %s", out_path)
+        with phase(ARTIFACT_WRITE_PHASE):
+            location = ArtifactStore(default_artifacts_dir()).put(artifact)
+        logger.info("Artifact %s stored at: %s", trace_id, location)
+        if profiler is not None and profile_path is not None:
+            profiler.stop()
+            profiler.save(profile_path)
+            print_profile_report(profiler, profile_path)
 
         error_cases = sum(
             1 for case_result in run_summary.case_results if case_result.error is not None
@@ -102,3 +271,252 @@ def run_eval(*, dataset: str, max_cases: int | None, offline: bool, print_output
             print(run_summary.model_dump_json(indent=2))
 
         return 1 if error_cases > 0 else 0
+
+
+def merge_eval(*, artifact_refs: list[str], print_output: bool) -> int:
+    """Merge the ``EvalRunArtifact``s of a sharded run into one artifact.
+
+    ``artifact_refs`` are trace ids in the artifact store or legacy JSON artifact paths.
+    """
+    init_observability()
+    tracer = trace.get_tracer(__name__)
+
+    with tracer.start_as_current_span(SpanName.EVAL_MERGE) as span:
+        trace_id = artifact_trace_id(span)
+        span.set_attribute(AttrKey.TRACE_ID, trace_id)
+        span.set_attribute(SpanAttributes.OPENINFERENCE_SPAN_KIND, "EVALUATOR")
+
+        try:
+            store = ArtifactStore(default_artifacts_dir())
+            shards = [load_eval_artifact(store, ref) for ref in artifact_refs]
+            missing = missing_shards(shards)
+            if missing:
+                logger.warning("[eval] merging without shards %s", ", ".join(missing))
+            merged = merge_shard_artifacts(shards, trace_id=trace_id)
+        except Exception as e:
+            span.record_exception(e)
+            span.set_attribute(AttrKey.ERROR_TYPE, type(e).__name__)
+            span.set_attribute(AttrKey.ERROR_MESSAGE, str(e) or repr(e))
+            span.set_status(trace.StatusCode.ERROR)
+            logger.error("[eval] merge failed error_type=%s error='%s'", type(e).__name__, e)
+            return 1
+
+        span.set_attribute(AttrKey.DATASET_PATH, merged.dataset_path)
+        span.set_attribute(AttrKey.EVAL_SHARD_TRACE_IDS, merged.shard_trace_ids)
+        if merged.parent_trace_id is not None:
+            span.set_attribute(AttrKey.EVAL_PARENT_TRACE_ID, merged.parent_trace_id)
+        span.set_attribute(AttrKey.EVAL_TOTAL_CASES, merged.run_summary.total_cases)
+
+        location = ArtifactStore(default_artifacts_dir()).put(merged)
+        logger.info("Artifact %s stored at: %s", trace_id, location)
+        span.set_status(trace.StatusCode.OK)
+
+        if print_output:
+            print(merged.run_summary.model_dump_json(indent=2))
+
+        return 0
+
+
+def run_eval_matrix(
+    *,
+    dataset: str,
+    models: list[str],
+    max_cases: int | None,
+    print_output: bool,
+    concurrency: int = 1,
+    max_lm_calls_per_minute: float | None = None,
+    use_cache: bool = False,
+    case_filter: EvalCaseFilter | None = None,
+    sample: int | None = None,
+    seed: int = 0,
+    samples_per_case: int = 1,
+) -> int:
+    """Evaluate the same cases against every model in ``models`` in one process.
+
+    Cases are loaded once; ``concurrency`` is shared by all models while
+    ``max_lm_calls_per_minute`` applies to each model separately.
+    """
+    init_observability()
+    started_at = _utcnow()
+    tracer = trace.get_tracer(__name__)
+
+    with tracer.start_as_current_span(SpanName.EVAL_MATRIX) as span:
+        trace_id = artifact_trace_id(span)
+        span.set_attribute(AttrKey.TRACE_ID, trace_id)
+        span.set_attribute(AttrKey.DATASET_PATH, dataset)
+        span.set_attribute(AttrKey.EVAL_MODELS, models)
+        span.set_attribute(AttrKey.EVAL_CONCURRENCY, concurrency)
+        span.set_attribute(SpanAttributes.OPENINFERENCE_SPAN_KIND, "EVALUATOR")
+
+        try:
+            setup_llm(offline=False)
+            settings = get_settings()
+            cases = load_cases(
+                dataset_path=Path(dataset),
+                max_cases=max_cases,
+                case_filter=case_filter,
+                sample=sample,
+                seed=seed,
+            )
+
+            solvers: dict[str, PhysicsAgent] = {}
+            for model in models:
+                lm = build_lm(settings, model=model)
+                if samples_per_case > 1:
+                    lm = lm.copy(cache=False)
+                if max_lm_calls_per_minute is not None:
+                    lm = RateLimitedLM(lm, AsyncRateLimiter(per_minute=max_lm_calls_per_minute))
+                solvers[model] = PhysicsAgent(lm=lm)
+            program_version = load_configured_program(list(solvers.values()), offline=False)
+            span.set_attribute(AttrKey.PROGRAM_VERSION, program_version)
+
+            services: dict[str, EvalService] = {}
+            for model, solver in solvers.items():
+                services[model] = EvalService(
+                    cases=cases,
+                    solver=solver,
+                    cache=(
+                        FileEvalCache(
+                            default_artifacts_dir() / "eval_cache",
+                            llm_name=model,
+                            program_fingerprint=solver.fingerprint(),
+                        )
+                        if use_cache
+                        else None
+                    ),
+                    samples=samples_per_case,
+                )
+            summaries = asyncio.run(EvalMatrixService(services, concurrency=concurrency).run())
+        except Exception as e:
+            span.record_exception(e)
+            span.set_attribute(AttrKey.ERROR_TYPE, type(e).__name__)
+            span.set_attribute(AttrKey.ERROR_MESSAGE, str(e) or repr(e))
+            span.set_status(trace.StatusCode.ERROR)
+            logger.error(
+                "[eval] matrix failed trace_id=%s dataset='%s' error_type=%s error='%s'",
+                trace_id,
+                dataset,
+                type(e).__name__,
+                e,
+            )
+            return 1
+
+        finished_at = _utcnow()
+        artifact = EvalMatrixArtifact(
+            trace_id=trace_id,
+            started_at=started_at,
+            finished_at=finished_at,
+            duration_ms=round((finished_at - started_at).total_seconds() * 1000),
+            dataset_path=dataset,
+            program_version=program_version,
+            models=models,
+            comparison=compare_models(summaries),
+            summaries=summaries,
+        )
+
+        location = ArtifactStore(default_artifacts_dir()).put(artifact)
+        logger.info("Artifact %s stored at: %s", trace_id, location)
+
+        for row in artifact.comparison:
+            logger.info(
+                "[eval] %s pass_rate=%.3f avg_total_score=%.3f errors=%s p90=%sms cost=%s USD",
+                row.model,
+                row.pass_rate,
+                row.avg_total_score,
+                row.error_cases,
+                _round(row.latency_p90_ms),
+                row.estimated_cost_usd,
+            )
+
+        error_cases = sum(row.error_cases for row in artifact.comparison)
+        span.set_attribute(AttrKey.EVAL_TOTAL_CASES, len(cases))
+        span.set_attribute(AttrKey.EVAL_ERROR_CASES, error_cases)
+        span.set_status(trace.StatusCode.ERROR if error_cases > 0 else trace.StatusCode.OK)
+
+        if print_output:
+            print(
+                json.dumps(
+                    [row.model_dump() for row in artifact.comparison], indent=2, ensure_ascii=False
+                )
+            )
+
+        return 1 if error_cases > 0 else 0
+
+
+def rescore_eval(*, artifact_ref: str, dataset: str | None, print_output: bool) -> int:
+    """Re-score the predictions stored in an ``EvalRunArtifact`` with the current scorer.
+
+    Cases (expected value, tolerance) are reloaded from ``dataset``, defaulting to the
+    dataset the run used; no LM is called.
+    """
+    init_observability()
+    started_at = _utcnow()
+    tracer = trace.get_tracer(__name__)
+
+    with tracer.start_as_current_span(SpanName.EVAL_RESCORE) as span:
+        trace_id = artifact_trace_id(span)
+        span.set_attribute(AttrKey.TRACE_ID, trace_id)
+        span.set_attribute(SpanAttributes.OPENINFERENCE_SPAN_KIND, "EVALUATOR")
+
+        try:
+            previous = load_eval_artifact(ArtifactStore(default_artifacts_dir()), artifact_ref)
+            dataset_path = dataset or previous.dataset_path
+            span.set_attribute(AttrKey.EVAL_RESCORED_FROM, previous.trace_id)
+            span.set_attribute(AttrKey.DATASET_PATH, dataset_path)
+
+            case_results = previous.run_summary.case_results
+            case_ids = frozenset(c.case_id for c in case_results if c.case_id is not None)
+            cases = iter_cases(Path(dataset_path), EvalCaseFilter(case_ids=case_ids))
+            rescored, skipped = rescore(cases, case_results)
+        except Exception as e:
+            span.record_exception(e)
+            span.set_attribute(AttrKey.ERROR_TYPE, type(e).__name__)
+            span.set_attribute(AttrKey.ERROR_MESSAGE, str(e) or repr(e))
+            span.set_status(trace.StatusCode.ERROR)
+            logger.error("[eval] rescore failed error_type=%s error='%s'", type(e).__name__, e)
+            return 1
+
+        if skipped:
+            logger.warning(
+                "[eval] %s results kept as-is (case or prediction missing): %s",
+                len(skipped),
+                ", ".join(skipped[:10]),
+            )
+        changed = sum(
+            1
+            for before, after in zip(case_results, rescored, strict=True)
+            if (before.passed, before.total_score) != (after.passed, after.total_score)
+        )
+        run_summary = summarize(rescored)
+        logger.info(
+            "[eval] rescored %s: pass_rate %.3f -> %.3f, %s results changed",
+            previous.trace_id,
+            previous.run_summary.pass_rate,
+            run_summary.pass_rate,
+            changed,
+        )
+        span.set_attribute(AttrKey.EVAL_TOTAL_CASES, run_summary.total_cases)
+        span.set_attribute(AttrKey.EVAL_CHANGED_CASES, changed)
+
+        finished_at = _utcnow()
+        # Only what describes the predictions carries over; the cache report, profile,
+        # resume and shard fields belong to the run that made them.
+        artifact = EvalRunArtifact(
+            trace_id=trace_id,
+            started_at=started_at,
+            finished_at=finished_at,
+            duration_ms=round((finished_at - started_at).total_seconds() * 1000),
+            llm_name=previous.llm_name,
+            program_version=previous.program_version,
+            dataset_path=dataset_path,
+            rescored_from=previous.trace_id,
+            run_summary=run_summary,
+        )
+        location = ArtifactStore(default_artifacts_dir()).put(artifact)
+        logger.info("Artifact %s stored at: %s", trace_id, location)
+        span.set_status(trace.StatusCode.OK)
+
+        if print_output:
+            print(run_summary.model_dump_json(indent=2))
+
+        return 0
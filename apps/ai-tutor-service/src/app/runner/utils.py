@@ -1,12 +1,52 @@
-from app.core.settings import get_settings
-from app.data.dspy.dspy_config import configure_dspy, configure_dspy_offline
+from collections.abc import Sequence
+from pathlib import Path
 
+from app.core.pricing import configure_prices
+from app.core.settings import get_runtime_settings, get_settings
+from app.data.agents.physics_agent import PhysicsAgent
+from app.data.agents.program_manager import PhysicsProgramManager
+from app.data.agents.program_store import BASE_VERSION, ProgramStore
+from app.data.dspy.cassette import CassetteMode
+from app.data.dspy.dspy_config import (
+    configure_dspy,
+    configure_dspy_cassette,
+    configure_dspy_offline,
+)
 
-def setup_llm(offline: bool) -> str:
+
+def setup_llm(
+    offline: bool,
+    cassette: Path | None = None,
+    cassette_mode: CassetteMode | None = None,
+) -> str:
     if offline:
         configure_dspy_offline()
         return "offline/dummy"
 
+    if cassette is not None and cassette_mode == "replay":
+        # Replay makes no LM call, so it needs no LLM key (nor the service's secrets).
+        runtime = get_runtime_settings()
+        configure_prices(runtime.llm_prices)
+        configure_dspy_cassette(runtime, cassette_path=cassette, mode=cassette_mode)
+        return runtime.llm_name
+
     settings = get_settings()
+    configure_prices(settings.llm_prices)
+    if cassette is not None and cassette_mode is not None:
+        configure_dspy_cassette(settings, cassette_path=cassette, mode=cassette_mode)
+        return settings.llm_name
+
     configure_dspy(settings)
     return settings.llm_name
+
+
+def load_configured_program(agents: Sequence[PhysicsAgent], offline: bool) -> str:
+    """Load ``PHYSICS_PROGRAM_VERSION`` into ``agents``, as the server does, so runs
+    exercise the program being served. Offline runs keep the base program.
+
+    Returns the loaded version.
+    """
+    if offline:
+        return BASE_VERSION
+    manager = PhysicsProgramManager(ProgramStore(), agents=agents)
+    return manager.activate(get_runtime_settings().physics_program_version).version
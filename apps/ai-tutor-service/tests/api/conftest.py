@@ -6,6 +6,7 @@ from app.api.app import create_app
 from app.application.services.physics_service import PhysicsService
 from app.core.settings import Settings
 from app.domain.models.physics import PhysicsQuestion, PhysicsSolution
+from app.domain.models.program import ProgramVersion
 
 TEST_API_KEY = "test-secret-key"
 
@@ -25,6 +26,31 @@ def physics_service():
     return PhysicsService(solver=FakePhysicsSolver())
 
 
+class FakeProgramManager:
+    def __init__(self) -> None:
+        self.versions = {"base": ProgramVersion(version="base", active=True)}
+
+    def active_version(self) -> str:
+        return next(v.version for v in self.versions.values() if v.active)
+
+    def list_versions(self) -> list[ProgramVersion]:
+        return list(self.versions.values())
+
+    def activate(self, version: str) -> ProgramVersion:
+        if version not in self.versions:
+            raise KeyError(f"Unknown program version: {version}")
+        for stored in self.versions.values():
+            stored.active = stored.version == version
+        return self.versions[version]
+
+
+@pytest.fixture
+def program_manager():
+    manager = FakeProgramManager()
+    manager.versions["v2"] = ProgramVersion(version="v2", num_demos=3)
+    return manager
+
+
 @pytest.fixture
 def fake_settings():
     return Settings(
@@ -35,8 +61,16 @@ def fake_settings():
 
 
 @pytest.fixture
-async def client(fake_settings: Settings, physics_service: PhysicsService):
-    app = create_app(physics_service=physics_service, settings=fake_settings)
+async def client(
+    fake_settings: Settings,
+    physics_service: PhysicsService,
+    program_manager: FakeProgramManager,
+):
+    app = create_app(
+        physics_service=physics_service,
+        settings=fake_settings,
+        program_manager=program_manager,
+    )
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
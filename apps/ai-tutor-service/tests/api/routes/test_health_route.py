@@ -0,0 +1,77 @@
+import asyncio
+import threading
+
+import pytest
+from httpx import ASGITransport, AsyncClient, Response
+
+from app.api.app import create_app
+from app.application.services.physics_service import PhysicsService
+from app.core.settings import Settings
+from app.core.warmup import WarmupReport
+
+
+async def wait_until_settled(client: AsyncClient) -> Response:
+    for _ in range(200):
+        response = await client.get("/ready")
+        if response.json()["status"] != "warming_up":
+            return response
+        await asyncio.sleep(0.01)
+    raise AssertionError("warm-up did not finish")
+
+
+@pytest.mark.asyncio
+async def test_health_and_ready_without_warmup(client: AsyncClient):
+    health = await client.get("/health")
+    ready = await client.get("/ready")
+
+    assert health.status_code == 200
+    assert health.json() == {"status": "ok"}
+    assert ready.status_code == 200
+    assert ready.json()["status"] == "ready"
+
+
+@pytest.mark.asyncio
+async def test_ready_waits_for_the_warmup(fake_settings: Settings, physics_service: PhysicsService):
+    release = threading.Event()
+
+    def warmup() -> WarmupReport:
+        release.wait(timeout=5)
+        return WarmupReport(steps_ms={"formulas": 1.0})
+
+    app = create_app(physics_service=physics_service, settings=fake_settings, warmup=warmup)
+    transport = ASGITransport(app=app)
+    async with (
+        app.router.lifespan_context(app),
+        AsyncClient(transport=transport, base_url="http://test") as client,
+    ):
+        assert (await client.get("/health")).status_code == 200
+        warming = await client.get("/ready")
+        assert warming.status_code == 503
+        assert warming.json()["status"] == "warming_up"
+
+        release.set()
+        response = await wait_until_settled(client)
+
+    assert response.status_code == 200
+    assert response.json()["warmup"]["steps_ms"] == {"formulas": 1.0}
+
+
+@pytest.mark.asyncio
+async def test_failed_self_test_keeps_the_service_unready(
+    fake_settings: Settings, physics_service: PhysicsService
+):
+    app = create_app(
+        physics_service=physics_service,
+        settings=fake_settings,
+        warmup=lambda: WarmupReport(failures=["calculate: expected 6 m*s"]),
+    )
+    transport = ASGITransport(app=app)
+    async with (
+        app.router.lifespan_context(app),
+        AsyncClient(transport=transport, base_url="http://test") as client,
+    ):
+        response = await wait_until_settled(client)
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "failed"
+    assert response.json()["warmup"]["failures"] == ["calculate: expected 6 m*s"]
@@ -0,0 +1,29 @@
+import pytest
+from httpx import AsyncClient
+
+from app.core.service_metrics import SOLVE_REQUESTS
+
+
+@pytest.mark.asyncio
+async def test_metrics_are_exposed_without_api_key(client: AsyncClient):
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE tutor_solve_duration_seconds histogram" in response.text
+    assert "tutor_solves_in_flight 0" in response.text
+
+
+@pytest.mark.asyncio
+async def test_solves_are_counted(client: AsyncClient, auth_headers: dict):
+    before = SOLVE_REQUESTS.value(("ok",))
+
+    await client.post(
+        url="/api/v1/physics/solve",
+        headers=auth_headers,
+        json={"text": "What is the force of gravity on a 10kg object?"},
+    )
+    response = await client.get("/metrics")
+
+    assert SOLVE_REQUESTS.value(("ok",)) == before + 1
+    assert f'tutor_solve_requests_total{{outcome="ok"}} {int(before + 1)}' in response.text
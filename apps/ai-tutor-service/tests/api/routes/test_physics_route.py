@@ -1,5 +1,17 @@
+import asyncio
+import json
+import time
+
+import litellm
 import pytest
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient
+
+from app.api.app import create_app
+from app.application.services.physics_service import PhysicsService
+from app.core.run_metrics import record_lm_call, record_token_usage
+from app.core.service_metrics import SOLVE_REQUESTS
+from app.core.settings import Settings
+from app.domain.models.physics import PhysicsQuestion, PhysicsSolution
 
 
 @pytest.mark.asyncio
@@ -42,3 +54,190 @@ async def test_solve_physics_with_invalid_api_key_returns_401(client: AsyncClien
         json={"text": "What is the force of gravity on a 10kg object?"},
     )
     assert response.status_code == 401
+
+
+class MeteredPhysicsSolver:
+    async def solve(self, question: PhysicsQuestion) -> PhysicsSolution:
+        record_lm_call(5.0)
+        record_token_usage("openai/gpt-4o-mini", prompt_tokens=1000, completion_tokens=100)
+        return PhysicsSolution(reasoning="Fake reasoning", value=42.0, unit="N")
+
+
+@pytest.mark.asyncio
+async def test_solve_physics_returns_usage_headers_when_enabled(
+    fake_settings: Settings, auth_headers: dict
+):
+    settings = fake_settings.model_copy(update={"usage_response_headers": True})
+    app = create_app(
+        physics_service=PhysicsService(solver=MeteredPhysicsSolver()), settings=settings
+    )
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            url="/api/v1/physics/solve",
+            headers=auth_headers,
+            json={"text": "What is the force of gravity on a 10kg object?"},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["X-Usage-LM-Calls"] == "1"
+    assert response.headers["X-Usage-Prompt-Tokens"] == "1000"
+    assert response.headers["X-Usage-Completion-Tokens"] == "100"
+    assert response.headers["X-Usage-Cost-USD"] == "0.000210"
+
+
+@pytest.mark.asyncio
+async def test_solve_physics_omits_usage_headers_by_default(
+    client: AsyncClient, auth_headers: dict
+):
+    response = await client.post(
+        url="/api/v1/physics/solve",
+        headers=auth_headers,
+        json={"text": "What is the force of gravity on a 10kg object?"},
+    )
+
+    assert "X-Usage-Prompt-Tokens" not in response.headers
+
+
+class BlockingPhysicsSolver:
+    def __init__(self) -> None:
+        self.started = asyncio.Event()
+        self.cancelled = False
+
+    async def solve(self, question: PhysicsQuestion) -> PhysicsSolution:
+        self.started.set()
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return PhysicsSolution(reasoning="Fake reasoning", value=42.0, unit="N")
+
+
+@pytest.mark.asyncio
+async def test_solve_physics_returns_504_past_the_requested_deadline(
+    fake_settings: Settings, auth_headers: dict
+):
+    solver = BlockingPhysicsSolver()
+    app = create_app(physics_service=PhysicsService(solver=solver), settings=fake_settings)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            url="/api/v1/physics/solve",
+            headers={**auth_headers, "X-Request-Deadline-Ms": "50"},
+            json={"text": "What is the force of gravity on a 10kg object?"},
+        )
+
+    assert response.status_code == 504
+    assert solver.cancelled is True
+
+
+class MeteredBlockingPhysicsSolver(BlockingPhysicsSolver):
+    async def solve(self, question: PhysicsQuestion) -> PhysicsSolution:
+        record_lm_call(5.0)
+        record_token_usage("openai/gpt-4o-mini", prompt_tokens=1000, completion_tokens=100)
+        return await super().solve(question)
+
+
+@pytest.mark.asyncio
+async def test_solve_physics_returns_usage_headers_past_the_deadline(
+    fake_settings: Settings, auth_headers: dict
+):
+    settings = fake_settings.model_copy(update={"usage_response_headers": True})
+    app = create_app(
+        physics_service=PhysicsService(solver=MeteredBlockingPhysicsSolver()), settings=settings
+    )
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            url="/api/v1/physics/solve",
+            headers={**auth_headers, "X-Request-Deadline-Ms": "50"},
+            json={"text": "What is the force of gravity on a 10kg object?"},
+        )
+
+    assert response.status_code == 504
+    assert response.headers["X-Usage-LM-Calls"] == "1"
+    assert response.headers["X-Usage-Prompt-Tokens"] == "1000"
+
+
+class TimedOutLMSolver:
+    """An LM client whose own timeout fires just past the deadline, before the
+    deadline's cancellation reaches the solve."""
+
+    async def solve(self, question: PhysicsQuestion) -> PhysicsSolution:
+        time.sleep(0.1)
+        raise litellm.Timeout(
+            message="Request timed out", model="openai/gpt-4o-mini", llm_provider="openai"
+        )
+
+
+@pytest.mark.asyncio
+async def test_solve_physics_returns_504_when_an_lm_call_times_out_at_the_deadline(
+    fake_settings: Settings, auth_headers: dict
+):
+    app = create_app(
+        physics_service=PhysicsService(solver=TimedOutLMSolver()), settings=fake_settings
+    )
+    before = SOLVE_REQUESTS.value(("timeout",))
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            url="/api/v1/physics/solve",
+            headers={**auth_headers, "X-Request-Deadline-Ms": "50"},
+            json={"text": "What is the force of gravity on a 10kg object?"},
+        )
+
+    assert response.status_code == 504
+    assert SOLVE_REQUESTS.value(("timeout",)) == before + 1
+
+
+@pytest.mark.asyncio
+async def test_solve_physics_rejects_an_invalid_deadline(client: AsyncClient, auth_headers: dict):
+    response = await client.post(
+        url="/api/v1/physics/solve",
+        headers={**auth_headers, "X-Request-Deadline-Ms": "0"},
+        json={"text": "What is the force of gravity on a 10kg object?"},
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_client_disconnect_cancels_the_solve(fake_settings: Settings, auth_headers: dict):
+    solver = MeteredBlockingPhysicsSolver()
+    settings = fake_settings.model_copy(update={"usage_response_headers": True})
+    app = create_app(physics_service=PhysicsService(solver=solver), settings=settings)
+    body = json.dumps({"text": "What is the force of gravity on a 10kg object?"}).encode()
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent: list[dict] = []
+
+    async def receive() -> dict:
+        if messages:
+            return messages.pop(0)
+        await solver.started.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/v1/physics/solve",
+        "raw_path": b"/api/v1/physics/solve",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"x-api-key", auth_headers["X-API-Key"].encode()),
+        ],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    before = SOLVE_REQUESTS.value(("cancelled",))
+
+    await asyncio.wait_for(app(scope, receive, send), timeout=5)
+
+    assert solver.cancelled is True
+    assert sent[0]["status"] == 499
+    assert (b"x-usage-lm-calls", b"1") in sent[0]["headers"]
+    assert SOLVE_REQUESTS.value(("cancelled",)) == before + 1
@@ -0,0 +1,35 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_list_programs(client: AsyncClient, auth_headers: dict):
+    response = await client.get(url="/api/v1/programs", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert [v["version"] for v in response.json()] == ["base", "v2"]
+
+
+@pytest.mark.asyncio
+async def test_activate_program_swaps_active_version(client: AsyncClient, auth_headers: dict):
+    response = await client.post(url="/api/v1/programs/v2/activate", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["active"] is True
+
+    listed = await client.get(url="/api/v1/programs", headers=auth_headers)
+    assert [v["version"] for v in listed.json() if v["active"]] == ["v2"]
+
+
+@pytest.mark.asyncio
+async def test_activate_unknown_program_returns_404(client: AsyncClient, auth_headers: dict):
+    response = await client.post(url="/api/v1/programs/nope/activate", headers=auth_headers)
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_programs_without_api_key_returns_401(client: AsyncClient):
+    response = await client.get(url="/api/v1/programs")
+
+    assert response.status_code == 401
@@ -1,20 +1,47 @@
+import asyncio
+import random
+from pathlib import Path
+
 import pytest
 
-from app.application.services.eval_service import score_case
-from app.domain.models.eval import EvalCase
-from app.domain.models.physics import PhysicsSolution
+from app.application.services import eval_service as eval_service_module
+from app.application.services.eval_service import (
+    EvalCaseFilter,
+    EvalMatrixService,
+    EvalService,
+    EvalShard,
+    check_result,
+    check_results_batch,
+    load_cases,
+    prepare_expected,
+    rescore,
+    score_case,
+    score_cases,
+    stored_prediction,
+)
+from app.core.run_metrics import record_iterations, record_lm_call, record_token_usage
+from app.core.sampling import current_sample_index
+from app.core.unit_registry import UnitQuantity
+from app.domain.models.eval import (
+    EvalCacheReport,
+    EvalCase,
+    EvalCaseScore,
+    EvalExpected,
+    EvalTolerance,
+)
+from app.domain.models.physics import PhysicsQuestion, PhysicsSolution
 
 
-def make_case() -> EvalCase:
+def make_case(case_id: str = "case-1", question_text: str = "Pergunta") -> EvalCase:
     return EvalCase.model_validate(
         {
-            "id": "case-1",
+            "id": case_id,
             "source": {"exam": "fuvest", "year": 2024, "phase": 2, "question": "F00a"},
             "subject": "physics",
             "topics": ["kinematics"],
             "difficulty": "easy",
             "split": "dev",
-            "question_text": "Pergunta",
+            "question_text": question_text,
             "expected": {"value": 10.0, "unit": "m/s"},
             "tolerance": {"abs": 0.1, "rel": 0.01},
             "reasoning_rubric": ["criterio"],
@@ -68,3 +95,431 @@ def test_score_case_correct_value_bad_reasoning() -> None:
     assert result.reasoning_score == pytest.approx(0.0)
     assert result.total_score == pytest.approx(0.4)
     assert result.passed is True
+
+
+class ConcurrencyTrackingSolver:
+    """Answers after a delay encoded in the question text; "fail" raises."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def solve(self, question: PhysicsQuestion) -> PhysicsSolution:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if question.text == "fail":
+                raise RuntimeError("rate limited")
+            await asyncio.sleep(float(question.text))
+            return PhysicsSolution(reasoning="logo v = 10 m/s", value=10.0, unit="m/s")
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.asyncio
+async def test_eval_service_runs_cases_concurrently_in_dataset_order() -> None:
+    cases = [
+        make_case("slow", "0.05"),
+        make_case("broken", "fail"),
+        make_case("fast", "0.0"),
+        make_case("medium", "0.02"),
+    ]
+    solver = ConcurrencyTrackingSolver()
+
+    summary = await EvalService(cases=cases, solver=solver, concurrency=2).run()
+
+    assert solver.max_in_flight == 2
+    assert [c.error for c in summary.case_results] == [None, "rate limited", None, None]
+    assert summary.total_cases == 4
+    assert summary.passed_cases == 3
+    assert summary.pass_rate == pytest.approx(0.75)
+
+
+@pytest.mark.asyncio
+async def test_eval_service_defaults_to_sequential() -> None:
+    solver = ConcurrencyTrackingSolver()
+
+    await EvalService(cases=[make_case("a", "0.0"), make_case("b", "0.0")], solver=solver).run()
+
+    assert solver.max_in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_eval_service_skips_completed_cases_and_reports_new_ones() -> None:
+    previous = EvalCaseScore(
+        case_id="done",
+        result_ok=True,
+        reasoning_score=1.0,
+        total_score=1.0,
+        passed=True,
+    )
+    finished: list[str | None] = []
+    solver = ConcurrencyTrackingSolver()
+
+    summary = await EvalService(
+        cases=[make_case("done", "fail"), make_case("todo", "0.0")],
+        solver=solver,
+        completed={"done": previous},
+        on_case_done=lambda case_score: finished.append(case_score.case_id),
+    ).run()
+
+    assert finished == ["todo"]
+    assert [c.case_id for c in summary.case_results] == ["done", "todo"]
+    assert summary.passed_cases == 2
+
+
+class DictCache:
+    def __init__(self, solutions: dict[str, PhysicsSolution]) -> None:
+        self.solutions = solutions
+
+    def get(self, case: EvalCase, sample_index: int = 0) -> PhysicsSolution | None:
+        return self.solutions.get(case.id)
+
+    def put(self, case: EvalCase, solution: PhysicsSolution, sample_index: int = 0) -> None:
+        self.solutions[case.id] = solution
+
+    def report(self) -> EvalCacheReport:
+        return EvalCacheReport()
+
+
+@pytest.mark.asyncio
+async def test_eval_service_uses_cached_predictions_and_caches_new_ones() -> None:
+    cached = PhysicsSolution(reasoning="logo v = 10 m/s", value=10.0, unit="m/s")
+    cache = DictCache({"cached": cached})
+    solver = ConcurrencyTrackingSolver()
+
+    summary = await EvalService(
+        cases=[make_case("cached", "fail"), make_case("fresh", "0.0")],
+        solver=solver,
+        cache=cache,
+    ).run()
+
+    assert summary.passed_cases == 2
+    assert solver.max_in_flight == 1
+    assert set(cache.solutions) == {"cached", "fresh"}
+
+
+@pytest.mark.asyncio
+async def test_eval_service_scores_cases_finishing_together_in_one_batch(monkeypatch) -> None:
+    batch_sizes: list[int] = []
+
+    def recording_score_cases(cases, *args):
+        batch_sizes.append(len(cases))
+        return score_cases(cases, *args)
+
+    monkeypatch.setattr(eval_service_module, "score_cases", recording_score_cases)
+    solution = PhysicsSolution(reasoning="logo v = 10 m/s", value=10.0, unit="m/s")
+    cases = [make_case(f"c{i}") for i in range(6)]
+    cache = DictCache({case.id: solution for case in cases})
+
+    summary = await EvalService(
+        cases=cases, solver=ConcurrencyTrackingSolver(), cache=cache, concurrency=6
+    ).run()
+
+    assert summary.passed_cases == 6
+    assert batch_sizes == [6]
+
+
+def write_dataset(path: Path, cases: list[EvalCase]) -> Path:
+    path.write_text("".join(case.model_dump_json() + "\n" for case in cases), encoding="utf-8")
+    return path
+
+
+def test_load_cases_filters_before_validation(tmp_path: Path) -> None:
+    dataset = write_dataset(
+        tmp_path / "cases.jsonl",
+        [make_case("fuvest-2016-a"), make_case("fuvest-2017-b"), make_case("unicamp-2016-c")],
+    )
+    with open(dataset, "a", encoding="utf-8") as f:
+        f.write('{"id": "broken-2016", "split": "test"}\n')
+
+    cases = load_cases(
+        dataset,
+        case_filter=EvalCaseFilter(splits=frozenset({"dev"}), id_patterns=("fuvest-*",)),
+    )
+
+    assert [case.id for case in cases] == ["fuvest-2016-a", "fuvest-2017-b"]
+    with pytest.raises(ValueError, match="Error loading eval case 4"):
+        load_cases(dataset)
+
+
+def test_eval_case_filter_matches_topics_difficulty_and_year() -> None:
+    raw = make_case().model_dump()
+
+    assert EvalCaseFilter(topics=frozenset({"optics", "kinematics"})).matches(raw)
+    assert not EvalCaseFilter(topics=frozenset({"optics"})).matches(raw)
+    assert not EvalCaseFilter(difficulties=frozenset({"hard"})).matches(raw)
+    assert EvalCaseFilter(years=frozenset({2024})).matches(raw)
+    assert not EvalCaseFilter(years=frozenset({2016})).matches(raw)
+
+
+def test_load_cases_samples_deterministically_in_dataset_order(tmp_path: Path) -> None:
+    dataset = write_dataset(
+        tmp_path / "cases.jsonl", [make_case(f"case-{i:02d}") for i in range(50)]
+    )
+
+    first = [case.id for case in load_cases(dataset, sample=5, seed=7)]
+
+    assert first == [case.id for case in load_cases(dataset, sample=5, seed=7)]
+    assert first != [case.id for case in load_cases(dataset, sample=5, seed=8)]
+    assert first == sorted(first)
+    assert len(load_cases(dataset, sample=5, seed=7, max_cases=2)) == 2
+    assert len(load_cases(dataset, sample=500)) == 50
+
+
+def test_eval_shards_partition_cases_stably() -> None:
+    case_ids = [f"case-{i}" for i in range(200)]
+    shards = [EvalShard.parse(f"{index}/4") for index in range(1, 5)]
+
+    assignments = [[case_id for case_id in case_ids if s.contains(case_id)] for s in shards]
+
+    assert sorted(case_id for part in assignments for case_id in part) == sorted(case_ids)
+    assert all(len(part) > 20 for part in assignments)
+
+
+def test_merged_shards_equal_the_unsharded_selection(tmp_path: Path) -> None:
+    dataset = write_dataset(
+        tmp_path / "cases.jsonl", [make_case(f"case-{i:02d}") for i in range(60)]
+    )
+    selection = {"sample": 20, "seed": 3, "max_cases": 15}
+
+    unsharded = [case.id for case in load_cases(dataset, **selection)]
+    shards = [
+        [case.id for case in load_cases(dataset, shard=EvalShard(index, 3), **selection)]
+        for index in range(1, 4)
+    ]
+
+    assert len(unsharded) == 15
+    assert sorted(case_id for shard in shards for case_id in shard) == sorted(unsharded)
+
+
+@pytest.mark.parametrize("spec", ["0/4", "5/4", "1", "a/b", "1/0"])
+def test_eval_shard_rejects_invalid_specs(spec: str) -> None:
+    with pytest.raises(ValueError):
+        EvalShard.parse(spec)
+
+
+class AlternatingSolver:
+    """Right on even calls, wrong on odd calls."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.sample_indexes: list[int] = []
+
+    async def solve(self, question: PhysicsQuestion) -> PhysicsSolution:
+        value = 10.0 if self.calls % 2 == 0 else 3.0
+        self.calls += 1
+        self.sample_indexes.append(current_sample_index())
+        return PhysicsSolution(reasoning="logo v = 10 m/s", value=value, unit="m/s")
+
+
+@pytest.mark.asyncio
+async def test_eval_service_reports_pass_at_k_over_repeated_samples() -> None:
+    solver = AlternatingSolver()
+
+    summary = await EvalService(
+        cases=[make_case("a"), make_case("b")], solver=solver, samples=2
+    ).run()
+
+    assert solver.calls == 4
+    # Bound for LM layers (the cassette) that key repeated samples separately.
+    assert solver.sample_indexes == [0, 1, 0, 1]
+    assert [(c.case_id, c.sample_index) for c in summary.case_results] == [
+        ("a", 0),
+        ("a", 1),
+        ("b", 0),
+        ("b", 1),
+    ]
+    assert summary.samples_per_case == 2
+    assert summary.pass_at_1 == pytest.approx(0.5)
+    assert summary.pass_at_k == pytest.approx(1.0)
+    assert [stats.agreement for stats in summary.case_sample_stats] == [0.5, 0.5]
+    assert [stats.distinct_answers for stats in summary.case_sample_stats] == [2, 2]
+    assert summary.pass_rate_ci is not None
+    assert summary.pass_rate_ci.low <= 0.5 <= summary.pass_rate_ci.high
+
+
+def test_prepared_expected_quantity_scores_like_the_case() -> None:
+    case = make_case()
+    predicted = PhysicsSolution(reasoning="logo v = 10 m/s", value=36.0, unit="km/h")
+
+    assert score_case(case, predicted, expected=prepare_expected(case)) == score_case(
+        case, predicted
+    )
+
+
+class MeteredSolver:
+    async def solve(self, question: PhysicsQuestion) -> PhysicsSolution:
+        record_lm_call(12.0)
+        record_token_usage("openai/gpt-4o-mini", prompt_tokens=100, completion_tokens=20)
+        record_iterations(3)
+        await asyncio.sleep(0)
+        return PhysicsSolution(reasoning="logo v = 10 m/s", value=10.0, unit="m/s")
+
+
+@pytest.mark.asyncio
+async def test_eval_service_records_per_case_metrics_and_cost_summary() -> None:
+    cache = DictCache(
+        {"cached": PhysicsSolution(reasoning="logo v = 10 m/s", value=10.0, unit="m/s")}
+    )
+
+    summary = await EvalService(
+        cases=[make_case("a"), make_case("b"), make_case("cached")],
+        solver=MeteredSolver(),
+        concurrency=3,
+        cache=cache,
+    ).run()
+
+    metrics = [case_score.metrics for case_score in summary.case_results]
+    assert all(m is not None for m in metrics)
+    assert [m.cached for m in metrics if m is not None] == [False, False, True]
+    assert metrics[0] is not None and metrics[0].iterations == 3
+    assert metrics[0].lm_calls == 1
+    assert summary.total_lm_calls == 2
+    assert summary.total_prompt_tokens == 200
+    assert summary.total_completion_tokens == 40
+    assert summary.estimated_cost_usd == pytest.approx(2 * (100 * 0.15 + 20 * 0.60) / 1e6)
+    assert summary.latency_p50_ms is not None
+    assert summary.latency_p99_ms is not None
+    assert summary.latency_p50_ms <= summary.latency_p99_ms
+
+
+class RecordingSolver:
+    def __init__(self, name: str, log: list[str], value: float) -> None:
+        self.name = name
+        self.log = log
+        self.value = value
+
+    async def solve(self, question: PhysicsQuestion) -> PhysicsSolution:
+        self.log.append(self.name)
+        await asyncio.sleep(0)
+        return PhysicsSolution(reasoning="logo v = 10 m/s", value=self.value, unit="m/s")
+
+
+@pytest.mark.asyncio
+async def test_eval_matrix_interleaves_models_under_one_budget() -> None:
+    cases = [make_case("a"), make_case("b")]
+    log: list[str] = []
+    tracker = ConcurrencyTrackingSolver()
+    services = {
+        "good": EvalService(cases=cases, solver=RecordingSolver("good", log, 10.0)),
+        "bad": EvalService(cases=cases, solver=RecordingSolver("bad", log, 3.0)),
+        "slow": EvalService(cases=[make_case("c", "0.01"), make_case("d", "0.01")], solver=tracker),
+    }
+
+    summaries = await EvalMatrixService(services, concurrency=1).run()
+
+    assert log == ["good", "bad", "good", "bad"]
+    assert tracker.max_in_flight == 1
+    assert summaries["good"].pass_rate == pytest.approx(1.0)
+    assert summaries["bad"].pass_rate == pytest.approx(0.0)
+    assert [c.case_id for c in summaries["slow"].case_results] == ["c", "d"]
+
+
+def test_rescore_reapplies_scoring_to_stored_predictions() -> None:
+    case = make_case("a")
+    stored = score_case(
+        case, PhysicsSolution(reasoning="logo v = 36 km/h", value=36.0, unit="km/h")
+    )
+    legacy = stored.model_copy(
+        update={"case_id": "b", "predicted_value": None, "predicted_unit": None}
+    )
+    errored = EvalCaseScore(
+        case_id="a",
+        sample_index=1,
+        result_ok=False,
+        reasoning_score=0.0,
+        total_score=0.0,
+        passed=False,
+        error="timeout",
+    )
+    stricter = make_case("a").model_copy(update={"expected": EvalExpected(value=11.0, unit="m/s")})
+
+    rescored, skipped = rescore(
+        [stricter, make_case("b")],
+        [stored, legacy, errored, stored.model_copy(update={"case_id": "gone"})],
+    )
+
+    assert stored.passed is True
+    assert [r.passed for r in rescored] == [False, True, False, True]
+    assert rescored[2] is errored
+    assert skipped == ["gone"]
+
+
+def test_stored_prediction_parses_legacy_predicted_string() -> None:
+    legacy = EvalCaseScore(
+        case_id="a",
+        predicted="10.0 meter / second",
+        reasoning="logo v = 10 m/s",
+        result_ok=True,
+        reasoning_score=1.0,
+        total_score=1.0,
+        passed=True,
+    )
+
+    prediction = stored_prediction(legacy)
+
+    assert prediction is not None
+    assert prediction.value == pytest.approx(10.0)
+    assert prediction.unit == "meter / second"
+
+
+def reference_check_result(case: EvalCase, predicted_value: float, predicted_unit: str) -> bool:
+    """The original per-call pint implementation of ``check_result``."""
+    try:
+        expected = UnitQuantity(f"{case.expected.value} {case.expected.unit}")
+        predicted = UnitQuantity(f"{predicted_value} {predicted_unit}")
+        diff = abs(expected - predicted)
+        abs_tolerance = UnitQuantity(f"{case.tolerance.abs} {case.expected.unit}")
+        return bool(diff <= abs_tolerance + case.tolerance.rel * abs(expected))
+    except Exception:
+        return False
+
+
+def test_batch_scoring_matches_per_case_pint_logic() -> None:
+    rng = random.Random(1234)
+    units = ["m/s", "km/h", "N", "kN", "J", "eV", "m", "cm", "10^3 m", "delta_degC", "K", "s"]
+    cases: list[EvalCase] = []
+    predictions: list[PhysicsSolution] = []
+    for index in range(600):
+        expected_unit = rng.choice(units)
+        expected_value = rng.choice([0.0, 1.0, 10.0, 1e-19, 3.6]) * rng.uniform(0.5, 2.0)
+        case = make_case(f"case-{index}").model_copy(
+            update={
+                "expected": EvalExpected(value=expected_value, unit=expected_unit),
+                "tolerance": EvalTolerance(abs=rng.choice([0.0, 0.1]), rel=rng.choice([0, 0.05])),
+            }
+        )
+        value = expected_value * rng.choice([1.0, 1.04, 1.06, 3.6, 1 / 3.6, -1.0])
+        value = rng.choice([value, value, value, float("nan"), float("inf")])
+        cases.append(case)
+        predictions.append(PhysicsSolution(reasoning="logo", value=value, unit=rng.choice(units)))
+
+    expected_results = [
+        reference_check_result(case, p.value, p.unit)
+        for case, p in zip(cases, predictions, strict=True)
+    ]
+
+    assert check_results_batch(cases, predictions) == expected_results
+    assert [
+        check_result(case, p.value, p.unit, expected=prepare_expected(case))
+        for case, p in zip(cases, predictions, strict=True)
+    ] == expected_results
+    assert any(expected_results) and not all(expected_results)
+
+
+def test_score_cases_matches_score_case() -> None:
+    cases = [make_case("a"), make_case("b"), make_case("c")]
+    predictions = [
+        PhysicsSolution(reasoning="logo v = 36 km/h", value=36.0, unit="km/h"),
+        PhysicsSolution(reasoning="curta", value=3.0, unit="m/s"),
+        PhysicsSolution(reasoning="unidade inválida", value=10.0, unit="furlong/fortnight/xyz"),
+    ]
+
+    batched = score_cases(cases, predictions, [prepare_expected(c) for c in cases], [0, 1, 0])
+
+    assert batched == [
+        score_case(case, prediction, sample_index=sample_index)
+        for case, prediction, sample_index in zip(cases, predictions, [0, 1, 0], strict=True)
+    ]
+    assert batched[0].predicted == f"{UnitQuantity('36.0 km/h')}"
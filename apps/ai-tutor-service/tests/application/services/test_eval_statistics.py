@@ -0,0 +1,33 @@
+import pytest
+
+from app.application.services.eval_statistics import mean_interval, pass_at_k, wilson_interval
+
+
+def test_pass_at_k_matches_combinatorial_definition() -> None:
+    # 1 - C(3, 2) / C(5, 2) = 1 - 3 / 10
+    assert pass_at_k(samples=5, passed=2, k=2) == pytest.approx(0.7)
+    assert pass_at_k(samples=5, passed=2, k=1) == pytest.approx(0.4)
+    assert pass_at_k(samples=5, passed=0, k=5) == 0.0
+    assert pass_at_k(samples=5, passed=1, k=5) == 1.0
+
+
+def test_pass_at_k_rejects_k_larger_than_samples() -> None:
+    with pytest.raises(ValueError):
+        pass_at_k(samples=2, passed=1, k=3)
+
+
+def test_wilson_interval_stays_inside_unit_range() -> None:
+    interval = wilson_interval(successes=10, trials=10)
+
+    assert interval.high == pytest.approx(1.0)
+    assert 0.69 < interval.low < 0.73
+    assert wilson_interval(successes=5, trials=10).low == pytest.approx(0.2366, abs=1e-3)
+
+
+def test_mean_interval_shrinks_with_more_cases() -> None:
+    narrow = mean_interval([0.0, 1.0] * 50)
+    wide = mean_interval([0.0, 1.0] * 5)
+
+    assert narrow.low < 0.5 < narrow.high
+    assert (narrow.high - narrow.low) < (wide.high - wide.low)
+    assert mean_interval([0.4]) == mean_interval([0.4, 0.4])
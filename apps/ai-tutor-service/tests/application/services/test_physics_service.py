@@ -2,7 +2,9 @@ import asyncio
 
 import pytest
 
-from app.application.services.physics_service import PhysicsService
+from app.application.services.physics_service import HedgeConfig, PhysicsService
+from app.core.deadline import DeadlineExceeded, remaining_s
+from app.core.service_metrics import SOLVE_REQUESTS
 from app.domain.models.physics import PhysicsQuestion, PhysicsSolution
 
 
@@ -24,3 +26,123 @@ async def test_solve_once_returns_solution():
 
     assert result.value == 42
     assert result.unit == "N"
+
+
+class DelayedSolver:
+    def __init__(self, delay: float, solution: PhysicsSolution | None = None) -> None:
+        self.delay = delay
+        self.solution = solution or PhysicsSolution(reasoning="r", value=42, unit="N")
+        self.calls = 0
+        self.cancelled = False
+
+    async def solve(self, question: PhysicsQuestion) -> PhysicsSolution:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.solution
+
+
+@pytest.mark.asyncio
+async def test_hedged_solve_returns_first_valid_and_cancels_rest():
+    slow = DelayedSolver(delay=5)
+    fast = DelayedSolver(delay=0.01, solution=PhysicsSolution(reasoning="r", value=7, unit="m"))
+    service = PhysicsService(solver=slow, hedge=HedgeConfig(attempts=2), hedge_solvers=[fast])
+
+    result = await service.solve_once(PhysicsQuestion(text="Enunciado qualquer"))
+    await asyncio.sleep(0)
+
+    assert result.value == 7
+    assert slow.cancelled is True
+
+
+@pytest.mark.asyncio
+async def test_hedged_solve_skips_invalid_solutions():
+    invalid = DelayedSolver(
+        delay=0.01, solution=PhysicsSolution(reasoning="r", value=1, unit="not_a_unit")
+    )
+    valid = DelayedSolver(delay=0.05)
+    service = PhysicsService(solver=invalid, hedge=HedgeConfig(attempts=2), hedge_solvers=[valid])
+
+    result = await service.solve_once(PhysicsQuestion(text="Enunciado qualquer"))
+
+    assert result.value == 42
+
+
+@pytest.mark.asyncio
+async def test_hedged_vote_waits_for_quorum():
+    outlier = DelayedSolver(delay=0.01, solution=PhysicsSolution(reasoning="r", value=1, unit="N"))
+    agree_a = DelayedSolver(delay=0.03, solution=PhysicsSolution(reasoning="r", value=10, unit="N"))
+    agree_b = DelayedSolver(
+        delay=0.05, solution=PhysicsSolution(reasoning="r", value=0.01, unit="kN")
+    )
+    service = PhysicsService(
+        solver=outlier,
+        hedge=HedgeConfig(attempts=3, strategy="vote", vote_quorum=2),
+        hedge_solvers=[agree_a, agree_b],
+    )
+
+    result = await service.solve_once(PhysicsQuestion(text="Enunciado qualquer"))
+
+    assert result.value == 10
+
+
+@pytest.mark.asyncio
+async def test_hedged_stagger_avoids_extra_attempts_when_first_is_fast():
+    fast = DelayedSolver(delay=0.01)
+    backup = DelayedSolver(delay=0.01)
+    service = PhysicsService(
+        solver=fast, hedge=HedgeConfig(attempts=2, stagger_ms=1000), hedge_solvers=[backup]
+    )
+
+    await service.solve_once(PhysicsQuestion(text="Enunciado qualquer"))
+
+    assert fast.calls == 1
+    assert backup.calls == 0
+
+
+class DeadlineAwareSolver:
+    def __init__(self) -> None:
+        self.remaining: float | None = None
+
+    async def solve(self, question: PhysicsQuestion) -> PhysicsSolution:
+        self.remaining = remaining_s()
+        return PhysicsSolution(reasoning="r", value=42, unit="N")
+
+
+@pytest.mark.asyncio
+async def test_solve_once_exposes_the_deadline_to_the_solver():
+    solver = DeadlineAwareSolver()
+
+    await PhysicsService(solver=solver).solve_once(PhysicsQuestion(text="x"), timeout_s=2)
+
+    assert solver.remaining is not None
+    assert 0 < solver.remaining <= 2
+
+
+@pytest.mark.asyncio
+async def test_solve_once_cancels_every_attempt_at_the_deadline():
+    first, second = DelayedSolver(delay=5), DelayedSolver(delay=5)
+    service = PhysicsService(solver=first, hedge=HedgeConfig(attempts=2), hedge_solvers=[second])
+    before = SOLVE_REQUESTS.value(("timeout",))
+
+    with pytest.raises(DeadlineExceeded):
+        await service.solve_once(PhysicsQuestion(text="x"), timeout_s=0.05)
+    await asyncio.sleep(0)
+
+    assert first.cancelled is True
+    assert second.cancelled is True
+    assert SOLVE_REQUESTS.value(("timeout",)) == before + 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_solve_waits_for_cancelled_attempts_to_finish():
+    slow = DelayedSolver(delay=5)
+    fast = DelayedSolver(delay=0.01)
+    service = PhysicsService(solver=slow, hedge=HedgeConfig(attempts=2), hedge_solvers=[fast])
+
+    await service.solve_once(PhysicsQuestion(text="Enunciado qualquer"))
+
+    assert slow.cancelled is True
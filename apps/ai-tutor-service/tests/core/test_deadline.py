@@ -0,0 +1,17 @@
+import pytest
+
+from app.core.deadline import DeadlineExceeded, check_deadline, deadline_scope, remaining_s
+
+
+def test_nested_scopes_only_shorten_the_deadline() -> None:
+    assert remaining_s() is None
+
+    with deadline_scope(1.0):
+        with deadline_scope(10.0):
+            remaining = remaining_s()
+            assert remaining is not None and remaining <= 1.0
+        with deadline_scope(0.0), pytest.raises(DeadlineExceeded):
+            check_deadline()
+        check_deadline()
+
+    assert remaining_s() is None
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.metrics import Counter, Histogram, MetricsRegistry
+from app.core.service_metrics import SOLVE_REQUESTS, SOLVES_IN_FLIGHT, track_solve
+
+
+def run_in_threads(target, threads: int = 4) -> None:
+    workers = [threading.Thread(target=target) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def test_counter_and_histogram_sum_their_thread_shards() -> None:
+    counter = Counter()
+    histogram = Histogram(bounds=(1, 10))
+
+    def record() -> None:
+        for _ in range(1000):
+            counter.inc(labels=("a",))
+            histogram.observe(5)
+
+    run_in_threads(record)
+    counter.inc(2, labels=("b",))
+
+    assert counter.values() == {("a",): 4000, ("b",): 2}
+    snapshot = histogram.snapshot()
+    assert snapshot.counts == (0, 4000, 0)
+    assert snapshot.total == 20_000
+
+
+def test_registry_renders_prometheus_text() -> None:
+    registry = MetricsRegistry()
+    requests = registry.counter("demo_requests_total", "Requests.", ["outcome"])
+    in_flight = registry.gauge("demo_in_flight", "In flight.")
+    latency = registry.histogram("demo_latency_seconds", "Latency.", bounds=(0.01, 0.1))
+    registry.register_collector(lambda: ["# TYPE demo_extra gauge", "demo_extra 1"])
+
+    requests.inc(labels=('say "hi"',))
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+    latency.observe(0.005)
+    latency.observe(0.0505)
+
+    assert registry.render().splitlines() == [
+        "# HELP demo_requests_total Requests.",
+        "# TYPE demo_requests_total counter",
+        'demo_requests_total{outcome="say \\"hi\\""} 1',
+        "# HELP demo_in_flight In flight.",
+        "# TYPE demo_in_flight gauge",
+        "demo_in_flight 1",
+        "# HELP demo_latency_seconds Latency.",
+        "# TYPE demo_latency_seconds histogram",
+        'demo_latency_seconds_bucket{le="0.01"} 1',
+        'demo_latency_seconds_bucket{le="0.1"} 2',
+        'demo_latency_seconds_bucket{le="+Inf"} 2',
+        "demo_latency_seconds_sum 0.0555",
+        "demo_latency_seconds_count 2",
+        "# TYPE demo_extra gauge",
+        "demo_extra 1",
+    ]
+    with pytest.raises(ValueError):
+        registry.gauge("demo_in_flight", "Again.")
+
+
+def test_snapshot_scaled_to_seconds_keeps_the_distribution() -> None:
+    histogram = Histogram(bounds=(10, 100))
+    histogram.observe(5)
+    histogram.observe(50)
+
+    seconds = histogram.snapshot().scaled(1e-3)
+
+    assert seconds.bounds == pytest.approx((0.01, 0.1))
+    assert seconds.counts == (1, 1, 0)
+    assert seconds.total == pytest.approx(0.055)
+
+
+def test_track_solve_counts_outcomes_and_in_flight() -> None:
+    before = {outcome: SOLVE_REQUESTS.value((outcome,)) for outcome in ("error", "cancelled")}
+
+    with pytest.raises(RuntimeError), track_solve():
+        assert SOLVES_IN_FLIGHT.value() == 1
+        raise RuntimeError("boom")
+    with pytest.raises(asyncio.CancelledError), track_solve():
+        raise asyncio.CancelledError
+
+    assert SOLVES_IN_FLIGHT.value() == 0
+    assert SOLVE_REQUESTS.value(("error",)) == before["error"] + 1
+    assert SOLVE_REQUESTS.value(("cancelled",)) == before["cancelled"] + 1
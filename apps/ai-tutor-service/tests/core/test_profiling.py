@@ -0,0 +1,66 @@
+import json
+
+from app.core.profiling import (
+    LM_CALL_PHASE,
+    SCORING_PHASE,
+    RunProfiler,
+    phase,
+    record_phase,
+    tool_phase,
+)
+from app.core.run_metrics import instrument_tool, record_lm_call
+
+
+def add(a: str, b: str) -> str:
+    """Add two numbers."""
+    return str(float(a) + float(b))
+
+
+def test_phases_are_ignored_without_an_active_profiler() -> None:
+    profiler = RunProfiler()
+
+    with phase(SCORING_PHASE):
+        pass
+    record_phase(LM_CALL_PHASE, 10.0)
+
+    assert profiler.timings.phases == {}
+
+
+def test_profiler_collects_lm_tool_and_custom_phases(tmp_path) -> None:
+    profiler = RunProfiler()
+    tool = instrument_tool(add)
+
+    with profiler.running():
+        record_lm_call(25.0)
+        record_lm_call(15.0)
+        tool("1", "2")
+        with phase(SCORING_PHASE):
+            sum(range(1000))
+
+    phases = profiler.timings.phases
+    assert phases[LM_CALL_PHASE].calls == 2
+    assert phases[LM_CALL_PHASE].total_ms == 40.0
+    assert phases[tool_phase("add")].calls == 1
+    assert phases[SCORING_PHASE].calls == 1
+    assert profiler.wall_ms > 0
+
+    table = profiler.phase_table()
+    assert table[1].startswith(LM_CALL_PHASE)
+    assert table[-1].startswith("wall clock")
+    assert "add" in profiler.top_functions(50)
+
+    phases_path = profiler.save(tmp_path / "profiles" / "trace.prof")
+    assert (tmp_path / "profiles" / "trace.prof").stat().st_size > 0
+    saved = json.loads(phases_path.read_text(encoding="utf-8"))
+    assert saved["phases"][LM_CALL_PHASE] == {"calls": 2, "total_ms": 40.0}
+
+
+def test_stop_is_idempotent_and_ends_phase_collection() -> None:
+    profiler = RunProfiler()
+    profiler.start()
+    profiler.stop()
+    profiler.stop()
+
+    record_phase(LM_CALL_PHASE, 5.0)
+
+    assert profiler.timings.phases == {}
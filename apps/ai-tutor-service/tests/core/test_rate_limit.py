@@ -0,0 +1,34 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.rate_limit import AsyncRateLimiter
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_out_acquisitions() -> None:
+    limiter = AsyncRateLimiter(per_minute=1200)  # one slot every 50 ms
+
+    started = time.perf_counter()
+    await asyncio.gather(*(limiter.acquire() for _ in range(4)))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed >= 0.14
+
+
+def test_rate_limiter_rejects_non_positive_rate() -> None:
+    with pytest.raises(ValueError):
+        AsyncRateLimiter(per_minute=0)
+
+
+def test_rate_limiter_shares_slots_between_threads_and_tasks() -> None:
+    limiter = AsyncRateLimiter(per_minute=1200)
+
+    started = time.perf_counter()
+    limiter.wait()
+    asyncio.run(limiter.acquire())
+    limiter.wait()
+    elapsed = time.perf_counter() - started
+
+    assert elapsed >= 0.09
@@ -0,0 +1,97 @@
+import inspect
+
+import pytest
+
+from app.core.pricing import ModelPrice, configure_prices, estimate_cost
+from app.core.run_metrics import (
+    collect_run_metrics,
+    instrument_tool,
+    record_iterations,
+    record_lm_call,
+    record_token_usage,
+    record_usage_entry,
+)
+from app.domain.models.usage import LMCallUsage
+
+
+def add(a: str, b: str) -> str:
+    """Add two numbers."""
+    return str(float(a) + float(b))
+
+
+def test_instrument_tool_keeps_tool_metadata_and_times_calls() -> None:
+    tool = instrument_tool(add)
+
+    with collect_run_metrics() as metrics:
+        assert tool("1", "2") == "3.0"
+        tool("1", "1")
+
+    assert tool.__name__ == "add"
+    assert tool.__doc__ == "Add two numbers."
+    assert list(inspect.signature(tool).parameters) == ["a", "b"]
+    assert metrics.tool_calls == {"add": 2}
+    assert metrics.tool_time_ms["add"] >= 0.0
+
+
+def test_recording_outside_a_collector_is_a_no_op() -> None:
+    record_lm_call(10.0)
+    record_iterations(3)
+    assert instrument_tool(add)("1", "2") == "3.0"
+
+
+def test_token_usage_accumulates_estimated_cost() -> None:
+    with collect_run_metrics() as metrics:
+        record_lm_call(5.0)
+        record_token_usage("gemini/gemini-2.0-flash", prompt_tokens=1000, completion_tokens=100)
+        record_token_usage("gemini/gemini-2.0-flash", prompt_tokens=1000, completion_tokens=100)
+
+    assert metrics.lm_calls == 1
+    assert metrics.prompt_tokens == 2000
+    assert metrics.completion_tokens == 200
+    assert metrics.estimated_cost_usd == pytest.approx(2 * (1000 * 0.10 + 100 * 0.40) / 1e6)
+
+
+def test_unknown_model_makes_cost_unknown() -> None:
+    assert estimate_cost("acme/unknown", 10, 10) is None
+
+    with collect_run_metrics() as metrics:
+        record_token_usage("acme/unknown", prompt_tokens=10, completion_tokens=10)
+        record_token_usage("openai/gpt-4o-mini", prompt_tokens=10, completion_tokens=10)
+
+    assert metrics.estimated_cost_usd is None
+
+
+def test_usage_entries_are_recorded_per_call_with_cached_tokens() -> None:
+    with collect_run_metrics() as metrics:
+        record_usage_entry(
+            "openai/gpt-4o-mini",
+            {
+                "prompt_tokens": 1000,
+                "completion_tokens": 50,
+                "prompt_tokens_details": {"cached_tokens": 800},
+            },
+        )
+        record_usage_entry(
+            "anthropic/claude",
+            {"prompt_tokens": 10, "completion_tokens": 5, "cache_read_input_tokens": 4},
+        )
+
+    first, second = metrics.lm_usage
+    assert isinstance(first, LMCallUsage)
+    assert (first.prompt_tokens, first.completion_tokens, first.cached_tokens) == (1000, 50, 800)
+    assert first.estimated_cost_usd == pytest.approx((200 * 0.15 + 800 * 0.075 + 50 * 0.60) / 1e6)
+    assert second.cached_tokens == 4
+    assert second.estimated_cost_usd is None
+    assert metrics.cached_tokens == 804
+    assert metrics.estimated_cost_usd is None
+
+
+def test_configured_prices_override_the_default_table() -> None:
+    try:
+        configure_prices({"acme/unknown": ModelPrice(1.0, 2.0)})
+        assert estimate_cost("acme/unknown", 1_000_000, 1_000_000) == pytest.approx(3.0)
+        assert estimate_cost("acme/unknown", 10, 0, cached_tokens=10) == pytest.approx(1e-5)
+        assert estimate_cost("gpt-4o", 1_000_000, 0) == pytest.approx(2.5)
+    finally:
+        configure_prices({})
+    assert estimate_cost("acme/unknown", 10, 10) is None
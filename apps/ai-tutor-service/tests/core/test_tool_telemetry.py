@@ -0,0 +1,107 @@
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import StatusCode
+
+from app.core.metrics import Histogram
+from app.core.observability_contract import AttrKey, SpanName
+from app.core.run_metrics import instrument_tool
+from app.core.tool_telemetry import (
+    TOOL_STATS,
+    format_tool_stats,
+    mark_tool_cache,
+    mark_tool_error,
+    set_tool_attribute,
+    tool_call,
+)
+from app.data.tools import utils
+from app.data.tools.physics_tools import evaluate_formula, solve_formula
+
+
+@pytest.fixture
+def exporter(monkeypatch: pytest.MonkeyPatch) -> InMemorySpanExporter:
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(trace, "get_tracer", provider.get_tracer)
+    TOOL_STATS.reset()
+    for cache in (utils.PARSED_FORMULAS, utils.SOLVED_FORMULAS, utils.LAMBDIFIED):
+        cache.clear()
+    yield exporter
+    TOOL_STATS.reset()
+
+
+def test_histogram_quantiles_interpolate_within_buckets() -> None:
+    histogram = Histogram(bounds=(10, 20, 40))
+    for value in (2, 4, 6, 8, 12, 14, 16, 18, 30, 50):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot.counts == (4, 4, 1, 1)
+    assert snapshot.count == 10
+    assert snapshot.mean == pytest.approx(16.0)
+    assert snapshot.quantile(0.2) == pytest.approx(5.0)
+    assert snapshot.quantile(0.6) == pytest.approx(15.0)
+    assert snapshot.quantile(1.0) == 40
+    assert Histogram().snapshot().quantile(0.5) is None
+
+
+def test_tool_call_records_span_attributes_and_stats(exporter: InMemorySpanExporter) -> None:
+    with tool_call("solve_formula"):
+        set_tool_attribute(AttrKey.TOOL_FORMULA_HASH, "abc")
+        mark_tool_cache(False)
+    with tool_call("solve_formula"):
+        mark_tool_cache(True)
+        mark_tool_error("NoSolution")
+
+    first, second = exporter.get_finished_spans()
+    assert first.name == SpanName.TOOL_CALL
+    assert first.attributes[AttrKey.TOOL_NAME] == "solve_formula"
+    assert first.attributes[AttrKey.TOOL_FORMULA_HASH] == "abc"
+    assert first.attributes[AttrKey.TOOL_CACHE_HIT] is False
+    assert first.status.status_code is StatusCode.UNSET
+    assert second.attributes[AttrKey.ERROR_TYPE] == "NoSolution"
+    assert second.status.status_code is StatusCode.ERROR
+
+    stats = TOOL_STATS.summary()["solve_formula"]
+    assert stats.calls == 2
+    assert stats.errors == {"NoSolution": 1}
+    assert (stats.cache_hits, stats.cache_misses) == (1, 1)
+    assert stats.error_rate == 0.5
+    assert format_tool_stats(TOOL_STATS.summary())[1].startswith("solve_formula")
+
+
+def test_tool_call_records_raised_exceptions(exporter: InMemorySpanExporter) -> None:
+    with pytest.raises(RuntimeError), tool_call("calculate"):
+        raise RuntimeError("boom")
+
+    (span,) = exporter.get_finished_spans()
+    assert span.attributes[AttrKey.ERROR_TYPE] == "RuntimeError"
+    assert TOOL_STATS.summary()["calculate"].errors == {"RuntimeError": 1}
+
+
+def test_marks_are_noops_outside_a_tool_call() -> None:
+    mark_tool_error("Ignored")
+    mark_tool_cache(True)
+    set_tool_attribute(AttrKey.TOOL_OPERATION, "add")
+
+
+def test_instrumented_tools_report_formula_cache_and_errors(
+    exporter: InMemorySpanExporter,
+) -> None:
+    evaluate = instrument_tool(evaluate_formula)
+    solve = instrument_tool(solve_formula)
+
+    evaluate("v = d / t", '{"d": "100 m", "t": "10 s"}')
+    evaluate("v = d / t", '{"d": "50 m", "t": "5 s"}')
+    solve("v = d / t", "d", "not json")
+
+    first, second, failed = exporter.get_finished_spans()
+    assert first.attributes[AttrKey.TOOL_CACHE_HIT] is False
+    assert second.attributes[AttrKey.TOOL_CACHE_HIT] is True
+    assert first.attributes[AttrKey.TOOL_FORMULA_HASH] == utils.formula_hash("v=d/t")
+    assert failed.attributes[AttrKey.ERROR_TYPE] == "ValueError"
+    assert TOOL_STATS.summary()["evaluate_formula"].cache_hits == 1
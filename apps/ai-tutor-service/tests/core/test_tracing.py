@@ -0,0 +1,76 @@
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import StatusCode
+
+from app.core.tracing import ErrorKeepingSampler, ErrorKeepingSpanProcessor
+
+
+def make_tracer(ratio: float, max_pending_traces: int = 1000):
+    exporter = InMemorySpanExporter()
+    processor = ErrorKeepingSpanProcessor(
+        SimpleSpanProcessor(exporter), max_pending_traces=max_pending_traces
+    )
+    provider = TracerProvider(sampler=ErrorKeepingSampler(ratio))
+    provider.add_span_processor(processor)
+    return provider.get_tracer(__name__), exporter, processor
+
+
+def test_unsampled_traces_without_errors_are_not_exported() -> None:
+    tracer, exporter, _ = make_tracer(ratio=0.0)
+
+    with tracer.start_as_current_span("root"), tracer.start_as_current_span("child"):
+        pass
+
+    assert exporter.get_finished_spans() == ()
+
+
+def test_unsampled_trace_with_an_error_is_exported_whole() -> None:
+    tracer, exporter, processor = make_tracer(ratio=0.0)
+
+    with tracer.start_as_current_span("root"):
+        with tracer.start_as_current_span("ok-child"):
+            pass
+        with pytest.raises(RuntimeError), tracer.start_as_current_span("failing-child"):
+            raise RuntimeError("boom")
+
+    spans = exporter.get_finished_spans()
+    assert [span.name for span in spans] == ["ok-child", "failing-child", "root"]
+    assert all(span.context.trace_flags.sampled for span in spans)
+    assert spans[1].status.status_code is StatusCode.ERROR
+    assert processor.kept_error_traces == 1
+
+
+def test_sampled_traces_are_exported_as_they_end() -> None:
+    tracer, exporter, _ = make_tracer(ratio=1.0)
+
+    with tracer.start_as_current_span("root"):
+        with tracer.start_as_current_span("child"):
+            pass
+        assert [span.name for span in exporter.get_finished_spans()] == ["child"]
+
+    assert len(exporter.get_finished_spans()) == 2
+
+
+def test_pending_trace_buffer_is_bounded() -> None:
+    tracer, exporter, processor = make_tracer(ratio=0.0, max_pending_traces=2)
+    roots = [tracer.start_span(f"root-{i}") for i in range(3)]
+    for root in roots:
+        # Children end while their roots are still open, so their traces stay pending.
+        tracer.start_span("child", context=trace.set_span_in_context(root)).end()
+
+    assert processor.dropped_traces == 1
+    for root in roots:
+        root.set_status(StatusCode.ERROR)
+        root.end()
+
+    # The dropped trace (root-0) only exports its root span.
+    assert sorted(span.name for span in exporter.get_finished_spans()) == [
+        "child",
+        "child",
+        "root-0",
+        "root-1",
+        "root-2",
+    ]
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import time
+
+import dspy
+import pytest
+from dspy.utils import DummyLM
+
+from app.core.deadline import DeadlineExceeded, deadline_scope
+from app.data.agents.physics_agent import PhysicsAgent
+from app.domain.models.physics import PhysicsQuestion
+
+
+class OverrunningLM(DummyLM):
+    """Answers with a tool call, taking ``delay_s`` per call (blocking, so nothing
+    cancels it)."""
+
+    def __init__(self, delay_s: float) -> None:
+        step = {
+            "next_thought": "Multiply.",
+            "next_tool_name": "calculate",
+            "next_tool_args": {"operation": "multiply", "a": "2 m", "b": "3 s"},
+        }
+        super().__init__([step, step, step])
+        self.delay_s = delay_s
+        self.calls = 0
+
+    def __call__(self, prompt=None, messages=None, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay_s)
+        return super().__call__(prompt=prompt, messages=messages, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_solve_stops_before_the_next_step_once_the_deadline_passed() -> None:
+    lm = OverrunningLM(delay_s=0.1)
+    agent = PhysicsAgent(lm=lm)
+
+    with (
+        dspy.context(adapter=dspy.ChatAdapter()),
+        deadline_scope(0.05),
+        pytest.raises(DeadlineExceeded),
+    ):
+        await agent.solve(PhysicsQuestion(text="Quanto é 2 m vezes 3 s?"))
+
+    assert lm.calls == 1
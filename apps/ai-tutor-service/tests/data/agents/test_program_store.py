@@ -0,0 +1,60 @@
+import pytest
+
+from app.data.agents.physics_agent import PhysicsAgent
+from app.data.agents.program_store import BASE_VERSION, ProgramStore, ProgramUsageStats
+
+
+def test_save_and_list_program_versions(tmp_path):
+    store = ProgramStore(root=tmp_path)
+    agent = PhysicsAgent()
+
+    saved = store.save(agent.program, version="v1")
+
+    assert store.program_path("v1").exists()
+    assert [v.version for v in store.list_versions()] == ["v1"]
+    assert saved.prompt_tokens > 0
+
+
+def test_resolve_latest_falls_back_to_base(tmp_path):
+    store = ProgramStore(root=tmp_path)
+
+    assert store.resolve("latest") == BASE_VERSION
+
+
+def test_resolve_unknown_version_raises(tmp_path):
+    with pytest.raises(KeyError):
+        ProgramStore(root=tmp_path).resolve("missing")
+
+
+def test_load_program_swaps_version(tmp_path):
+    store = ProgramStore(root=tmp_path)
+    agent = PhysicsAgent()
+    store.save(agent.program, version="v1")
+
+    agent.load_program("v1", store.program_path("v1"))
+
+    assert agent.program_version == "v1"
+    assert "v1" in agent.usage_stats
+
+
+def test_usage_stats_snapshot():
+    stats = ProgramUsageStats()
+    for latency in (100.0, 200.0, 300.0):
+        stats.record(latency_ms=latency, trajectory_tokens=10)
+
+    snapshot = stats.snapshot()
+
+    assert snapshot.solves == 3
+    assert snapshot.avg_latency_ms == pytest.approx(200.0)
+    assert snapshot.p90_latency_ms == pytest.approx(300.0)
+    assert snapshot.avg_trajectory_tokens == pytest.approx(10.0)
+
+
+@pytest.mark.parametrize("version", ["..", "../escape", "/tmp/abs", "a/b", ".hidden"])
+def test_invalid_versions_are_rejected(tmp_path, version):
+    store = ProgramStore(root=tmp_path)
+
+    with pytest.raises(ValueError):
+        store.resolve(version)
+    with pytest.raises(ValueError):
+        store.save(PhysicsAgent().program, version=version)
@@ -0,0 +1,101 @@
+import json
+
+from app.data.agents.trajectory import (
+    TrajectoryCompactionConfig,
+    compact_quantity_text,
+    compact_trajectory,
+    track_compaction,
+)
+
+
+def _step(index: int, thought: str, tool: str, observation: str) -> dict[str, object]:
+    return {
+        f"thought_{index}": thought,
+        f"tool_name_{index}": tool,
+        f"tool_args_{index}": {"formula": "E = h * f"},
+        f"observation_{index}": observation,
+    }
+
+
+class TestCompactQuantityText:
+    def test_reduces_cancelling_units(self):
+        assert (
+            compact_quantity_text("2.4000000000000004 electron_volt * hertz * second") == "2.4 eV"
+        )
+
+    def test_prefers_named_si_unit(self):
+        assert compact_quantity_text("98.0 kilogram * meter / second ** 2") == "98 N"
+
+    def test_keeps_simple_ratio_units(self):
+        assert compact_quantity_text("50.0 kilometer / hour") == "50 km/h"
+
+    def test_leaves_non_quantities_untouched(self):
+        assert compact_quantity_text("Completed.") == "Completed."
+
+
+class TestCompactTrajectory:
+    def test_does_not_mutate_original(self):
+        trajectory = _step(0, "t", "evaluate_formula", "98.0 kilogram * meter / second ** 2")
+        original = dict(trajectory)
+
+        compacted = compact_trajectory(trajectory)
+
+        assert trajectory == original
+        assert compacted["observation_0"] == "98 N"
+
+    def test_normalizes_json_lists_of_quantities(self):
+        trajectory = _step(
+            0,
+            "t",
+            "solve_formula",
+            json.dumps(["-10.000000000000036 joule ** 0.5 / kilogram ** 0.5"]),
+        )
+
+        compacted = compact_trajectory(trajectory)
+
+        assert json.loads(compacted["observation_0"]) == ["-10 m/s"]
+
+    def test_drops_failed_step_after_later_success(self):
+        trajectory = {
+            **_step(0, "try", "evaluate_formula", "Error parsing formula: bad"),
+            **_step(1, "retry", "evaluate_formula", "5000.0 meter"),
+        }
+
+        compacted = compact_trajectory(trajectory)
+
+        assert "observation_0" not in compacted
+        assert compacted["observation_1"] == "5000 m"
+
+    def test_keeps_trailing_failed_step(self):
+        trajectory = {
+            **_step(0, "ok", "convert_unit", "5000.0 meter"),
+            **_step(1, "oops", "evaluate_formula", "Error: incompatible units"),
+        }
+
+        compacted = compact_trajectory(trajectory)
+
+        assert compacted["observation_1"] == "Error: incompatible units"
+
+    def test_truncates_old_steps_only(self):
+        config = TrajectoryCompactionConfig(keep_recent_steps=1, max_thought_chars=10)
+        trajectory = {
+            **_step(0, "x" * 50, "convert_unit", "5000.0 meter"),
+            **_step(1, "y" * 50, "convert_unit", "1 meter"),
+        }
+
+        compacted = compact_trajectory(trajectory, config)
+
+        assert len(compacted["thought_0"]) == 10
+        assert compacted["thought_1"] == "y" * 50
+
+    def test_tracks_tokens_saved(self):
+        trajectory = {
+            **_step(0, "try", "evaluate_formula", "Error parsing formula: " + "x" * 200),
+            **_step(1, "retry", "evaluate_formula", "2400000000000000.0 electron_volt"),
+        }
+
+        with track_compaction() as stats:
+            compact_trajectory(trajectory)
+
+        assert stats.calls == 1
+        assert stats.tokens_saved > 0
@@ -0,0 +1,88 @@
+import json
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class LatencyServer:
+    """Local OpenAI-compatible stand-in that answers after injected delays."""
+
+    def __init__(self, delays: list[float], content: str) -> None:
+        self.delays = list(delays)
+        self.content = content
+        self.requests = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802 - http.server API
+                length = int(self.headers.get("Content-Length", 0))
+                self.rfile.read(length)
+                index = server.requests
+                server.requests += 1
+                delay = server.delays[index] if index < len(server.delays) else 0.0
+                time.sleep(delay)
+
+                body = json.dumps(
+                    {
+                        "id": f"chatcmpl-{index}",
+                        "object": "chat.completion",
+                        "created": 0,
+                        "model": "stand-in",
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": server.content},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+                    }
+                ).encode()
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args) -> None:  # noqa: A002
+                return None
+
+        return Handler
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def latency_server() -> Iterator:
+    servers: list[LatencyServer] = []
+
+    def factory(delays: list[float], content: str = "ok") -> LatencyServer:
+        server = LatencyServer(delays, content)
+        server.start()
+        servers.append(server)
+        return server
+
+    yield factory
+
+    for server in servers:
+        server.stop()
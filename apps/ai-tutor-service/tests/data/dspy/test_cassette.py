@@ -0,0 +1,114 @@
+import gzip
+
+import dspy
+import pytest
+
+from app.data.dspy.cassette import (
+    CassetteMissError,
+    CassetteStore,
+    cassette_key,
+    compact_response,
+)
+from app.data.dspy.cassette_lm import CassetteLM
+
+MESSAGES = [{"role": "user", "content": "Qual a força?"}]
+
+
+def _response(content: str) -> dict:
+    return {
+        "id": "chatcmpl-1",
+        "created": 123,
+        "model": "gemini/gemini-flash-lite-latest",
+        "object": "chat.completion",
+        "system_fingerprint": None,
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content, "tool_calls": None},
+            }
+        ],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+    }
+
+
+class TestCassetteKey:
+    def test_is_stable_across_kwarg_order(self):
+        a = cassette_key("m", None, MESSAGES, {"temperature": 0.0, "n": 1})
+        b = cassette_key("m", None, MESSAGES, {"n": 1, "temperature": 0.0})
+
+        assert a == b
+
+    def test_ignores_credentials_and_transport_kwargs(self):
+        a = cassette_key("m", None, MESSAGES, {"api_key": "x", "num_retries": 1})
+        b = cassette_key("m", None, MESSAGES, {"api_key": "y", "api_base": "http://other"})
+
+        assert a == b
+
+    def test_depends_on_model_and_messages(self):
+        base = cassette_key("m", None, MESSAGES, {})
+
+        assert cassette_key("other", None, MESSAGES, {}) != base
+        assert cassette_key("m", None, [{"role": "user", "content": "?"}], {}) != base
+
+    def test_repeated_samples_get_their_own_keys(self):
+        first = cassette_key("m", None, MESSAGES, {})
+
+        assert cassette_key("m", None, MESSAGES, {}, sample_index=0) == first
+        assert cassette_key("m", None, MESSAGES, {}, sample_index=1) != first
+        assert cassette_key("m", None, MESSAGES, {}, sample_index=1) != cassette_key(
+            "m", None, MESSAGES, {}, sample_index=2
+        )
+
+
+class TestCassetteStore:
+    def test_round_trips_entries_through_disk(self, tmp_path):
+        path = tmp_path / "cassette.jsonl.gz"
+        store = CassetteStore(path)
+        store.put("k1", compact_response(_response("a")))
+        store.put("k2", compact_response(_response("b")))
+
+        reloaded = CassetteStore(path)
+
+        assert len(reloaded) == 2
+        assert reloaded.get("k2")["choices"][0]["message"]["content"] == "b"
+
+    def test_is_gzip_compressed(self, tmp_path):
+        path = tmp_path / "cassette.jsonl.gz"
+        CassetteStore(path).put("k1", compact_response(_response("a")))
+
+        with gzip.open(path, "rt", encoding="utf-8") as cassette:
+            assert '"key":"k1"' in cassette.read()
+
+    def test_missing_key_raises(self, tmp_path):
+        store = CassetteStore(tmp_path / "cassette.jsonl.gz")
+
+        with pytest.raises(CassetteMissError):
+            store.get("missing")
+
+    def test_compact_response_drops_provider_noise(self):
+        compacted = compact_response(_response("a"))
+
+        assert set(compacted) == {"model", "choices", "usage"}
+        assert compacted["choices"][0]["message"] == {"role": "assistant", "content": "a"}
+
+
+def test_predict_replays_what_it_recorded_without_the_provider(tmp_path, latency_server):
+    server = latency_server([0.0], content="[[ ## answer ## ]]\n20 N\n\n[[ ## completed ## ]]")
+    path = tmp_path / "cassette.jsonl.gz"
+    provider = dspy.LM("openai/stand-in", api_key="test", api_base=server.url, cache=False)
+    predict = dspy.Predict("question -> answer")
+    question = "Qual a força sobre 2 kg a 10 m/s^2?"
+
+    recorder = CassetteLM(CassetteStore(path), mode="record", model=provider.model, inner=provider)
+    with dspy.context(lm=recorder, adapter=dspy.ChatAdapter()):
+        recorded = predict(question=question)
+
+    replayer = CassetteLM(CassetteStore(path), mode="replay", model=provider.model)
+    with dspy.context(lm=replayer, adapter=dspy.ChatAdapter()):
+        replayed = predict(question=question)
+        with pytest.raises(CassetteMissError):
+            predict(question="Outra pergunta?")
+
+    assert recorded.answer == replayed.answer == "20 N"
+    assert server.requests == 1
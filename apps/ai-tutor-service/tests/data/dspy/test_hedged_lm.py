@@ -0,0 +1,28 @@
+import time
+
+import pytest
+
+from app.data.dspy.hedged_lm import HedgedLM
+from app.data.dspy.hedging import LatencyTracker
+
+
+@pytest.mark.asyncio
+async def test_hedged_lm_takes_secondary_when_primary_is_slow(latency_server):
+    primary = latency_server([2.0], content="primary")
+    secondary = latency_server([0.0], content="secondary")
+    lm = HedgedLM(
+        "openai/stand-in",
+        api_key="test",
+        api_base=primary.url,
+        secondary_api_base=secondary.url,
+        tracker=LatencyTracker(min_samples=1_000, initial_delay_s=0.05),
+        cache=False,
+        num_retries=0,
+    )
+
+    started = time.perf_counter()
+    outputs = await lm.acall(messages=[{"role": "user", "content": "hi"}])
+
+    assert outputs == ["secondary"]
+    assert time.perf_counter() - started < 1.0
+    assert lm.tracker.backup_wins == 1
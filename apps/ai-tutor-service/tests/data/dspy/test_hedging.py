@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.data.dspy.hedging import LatencyTracker, hedged_call, hedged_call_sync
+
+
+def _tracker(delay_s: float) -> LatencyTracker:
+    return LatencyTracker(min_samples=1_000, initial_delay_s=delay_s)
+
+
+class TestLatencyTracker:
+    def test_uses_initial_delay_until_enough_samples(self):
+        tracker = LatencyTracker(min_samples=3, initial_delay_s=7.0)
+        tracker.record(0.1)
+
+        assert tracker.hedge_delay() == 7.0
+
+    def test_uses_percentile_of_window(self):
+        tracker = LatencyTracker(percentile=0.9, min_samples=10, min_delay_s=0.0)
+        for ms in range(1, 11):
+            tracker.record(ms / 1000)
+
+        assert tracker.hedge_delay() == pytest.approx(0.009)
+
+    def test_delay_is_clamped_to_minimum(self):
+        tracker = LatencyTracker(min_samples=1, min_delay_s=0.5)
+        tracker.record(0.01)
+
+        assert tracker.hedge_delay() == 0.5
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged(latency_server):
+    primary = latency_server([0.0])
+    secondary = latency_server([0.0])
+    tracker = _tracker(1.0)
+
+    async with httpx.AsyncClient() as client:
+        response = await hedged_call(
+            lambda: client.post(f"{primary.url}/chat/completions", json={}),
+            lambda: client.post(f"{secondary.url}/chat/completions", json={}),
+            tracker,
+        )
+
+    assert response.status_code == 200
+    assert tracker.hedged_calls == 0
+    assert secondary.requests == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_to_secondary(latency_server):
+    primary = latency_server([2.0], content="primary")
+    secondary = latency_server([0.0], content="secondary")
+    tracker = _tracker(0.05)
+
+    started = time.perf_counter()
+    async with httpx.AsyncClient() as client:
+        response = await hedged_call(
+            lambda: client.post(f"{primary.url}/chat/completions", json={}),
+            lambda: client.post(f"{secondary.url}/chat/completions", json={}),
+            tracker,
+        )
+    elapsed = time.perf_counter() - started
+
+    assert response.json()["choices"][0]["message"]["content"] == "secondary"
+    assert elapsed < 1.0
+    assert tracker.hedged_calls == 1
+    assert tracker.backup_wins == 1
+
+
+@pytest.mark.asyncio
+async def test_backup_failure_falls_back_to_primary():
+    tracker = _tracker(0.01)
+
+    async def slow_primary() -> str:
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    async def failing_backup() -> str:
+        raise RuntimeError("provider down")
+
+    assert await hedged_call(slow_primary, failing_backup, tracker) == "primary"
+
+
+def test_sync_slow_primary_is_hedged(latency_server):
+    primary = latency_server([2.0], content="primary")
+    secondary = latency_server([0.0], content="secondary")
+    tracker = _tracker(0.05)
+
+    started = time.perf_counter()
+    response = hedged_call_sync(
+        lambda: httpx.post(f"{primary.url}/chat/completions", json={}),
+        lambda: httpx.post(f"{secondary.url}/chat/completions", json={}),
+        tracker,
+    )
+
+    assert response.json()["choices"][0]["message"]["content"] == "secondary"
+    assert time.perf_counter() - started < 1.0
+
+
+@pytest.mark.asyncio
+async def test_failed_calls_do_not_feed_the_latency_window():
+    tracker = LatencyTracker(min_samples=1, min_delay_s=0.0, initial_delay_s=7.0)
+
+    async def throttled() -> str:
+        raise RuntimeError("429 Too Many Requests")
+
+    def throttled_sync() -> str:
+        raise RuntimeError("429 Too Many Requests")
+
+    with pytest.raises(RuntimeError):
+        await hedged_call(throttled, throttled, tracker)
+    with pytest.raises(RuntimeError):
+        hedged_call_sync(throttled_sync, throttled_sync, tracker)
+
+    assert tracker.hedge_delay() == 7.0
+    assert tracker.calls == 2
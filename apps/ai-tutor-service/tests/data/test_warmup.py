@@ -0,0 +1,67 @@
+import json
+from pathlib import Path
+
+from app.application.services.eval_service import iter_cases
+from app.core.tool_telemetry import TOOL_STATS, tool_call
+from app.data.tools import utils
+from app.data.tools.physics_tools import evaluate_formula
+from app.data.warmup import WARMUP_FORMULAS, quantities_from_cases, run_warmup, tool_self_test
+
+DATASET = Path(__file__).parents[2] / "evals/physics/fuvest_descriptive_dev.jsonl"
+
+
+class FailingAgent:
+    def warm_up(self) -> None:
+        raise RuntimeError("no adapter")
+
+
+def test_tool_self_test_passes() -> None:
+    assert tool_self_test() == []
+
+
+def test_quantities_from_cases_takes_units_of_the_dataset() -> None:
+    quantities = quantities_from_cases(iter_cases(DATASET))
+
+    assert "1 N" in quantities
+    assert len(quantities) == len(set(quantities))
+
+
+def test_run_warmup_reports_steps_and_keeps_agent_errors_as_warnings() -> None:
+    report = run_warmup(quantities=["1 N", "not a unit"], agents=[FailingAgent()])
+
+    assert report.ok
+    assert list(report.steps_ms) == [
+        "imports",
+        "quantities",
+        "formulas",
+        "tool_self_test",
+        "agents",
+    ]
+    assert "agent warm-up: RuntimeError: no adapter" in report.warnings
+
+
+def test_primed_cache_entries_are_not_reported_as_hits() -> None:
+    cache: utils.LRUCache[int] = utils.LRUCache(maxsize=4)
+    with utils.priming_caches():
+        assert cache.get_or_compute("k", lambda: 1) == (1, False)
+        assert cache.get_or_compute("k", lambda: 2) == (1, False)
+
+    assert cache.get_or_compute("k", lambda: 3) == (1, False)
+    assert cache.get_or_compute("k", lambda: 4) == (1, True)
+
+
+def test_run_warmup_leaves_tool_statistics_and_hit_rates_alone() -> None:
+    TOOL_STATS.reset()
+    for cache in (utils.PARSED_FORMULAS, utils.SOLVED_FORMULAS, utils.LAMBDIFIED):
+        cache.clear()
+
+    run_warmup()
+    assert TOOL_STATS.summary() == {}
+
+    formula, variables, _ = WARMUP_FORMULAS[0]
+    with tool_call("evaluate_formula"):
+        evaluate_formula(formula, json.dumps(variables))
+    stats = TOOL_STATS.summary()["evaluate_formula"]
+    TOOL_STATS.reset()
+
+    assert (stats.cache_hits, stats.cache_misses) == (0, 1)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+
+import pytest
+
+from app.application.services.eval_service import summarize
+from app.domain.models.eval import EvalCaseScore
+from app.domain.models.physics import PhysicsQuestion
+from app.runner.artifact_store import ArtifactQuery, ArtifactStore, load_eval_artifact
+from app.runner.run_artifact import EvalRunArtifact, RunArtifact, RunError
+
+
+def make_run(trace_id: str, day: int, llm_name: str, error: str | None = None) -> RunArtifact:
+    return RunArtifact(
+        trace_id=trace_id,
+        started_at=datetime(2026, 3, day, 12, 0, tzinfo=UTC),
+        finished_at=datetime(2026, 3, day, 12, 0, 2, tzinfo=UTC),
+        duration_ms=2000,
+        agent="physics_descriptive",
+        llm_name=llm_name,
+        input=PhysicsQuestion(text="Q?"),
+        error=RunError(type=error, message="boom") if error else None,
+    )
+
+
+def make_eval(trace_id: str, failed_case: bool) -> EvalRunArtifact:
+    score = EvalCaseScore(
+        case_id="a",
+        result_ok=False,
+        reasoning_score=0.0,
+        total_score=0.0,
+        passed=False,
+        error="RuntimeError: boom" if failed_case else None,
+    )
+    return EvalRunArtifact(
+        trace_id=trace_id,
+        started_at=datetime(2026, 3, 2, 9, 0, tzinfo=UTC),
+        finished_at=datetime(2026, 3, 2, 9, 1, tzinfo=UTC),
+        duration_ms=60_000,
+        llm_name="openai/gpt",
+        dataset_path="evals/physics/dev.jsonl",
+        run_summary=summarize([score]),
+    )
+
+
+def test_put_rejects_a_second_artifact_with_the_same_trace_id(tmp_path) -> None:
+    store = ArtifactStore(tmp_path)
+    first = make_run("run-1", day=1, llm_name="openai/gpt")
+    store.put(first)
+    segment = tmp_path / "segments" / "2026-03-01.seg"
+    size = segment.stat().st_size
+
+    with pytest.raises(ValueError, match="run-1"):
+        store.put(make_run("run-1", day=1, llm_name="other/model", error="RuntimeError"))
+
+    assert store.get("run-1") == first
+    assert [entry.llm_name for entry in store.query()] == ["openai/gpt"]
+    assert segment.stat().st_size == size
+
+
+def test_put_and_get_round_trip(tmp_path) -> None:
+    store = ArtifactStore(tmp_path)
+    run = make_run("run-1", day=1, llm_name="openai/gpt")
+    evaluation = make_eval("eval-1", failed_case=False)
+
+    store.put(run)
+    store.put(evaluation)
+
+    assert store.get("run-1") == run
+    assert store.get("eval-1") == evaluation
+    assert sorted(p.name for p in (tmp_path / "segments").iterdir()) == [
+        "2026-03-01.seg",
+        "2026-03-02.seg",
+    ]
+
+
+def test_query_filters_on_indexed_columns(tmp_path) -> None:
+    store = ArtifactStore(tmp_path)
+    store.put(make_run("ok-x", day=1, llm_name="x"))
+    store.put(make_run("fail-x", day=1, llm_name="x", error="TimeoutError"))
+    store.put(make_run("fail-y", day=1, llm_name="y", error="TimeoutError"))
+    store.put(make_run("fail-x-later", day=2, llm_name="x", error="ValueError"))
+    store.put(make_eval("eval-failed", failed_case=True))
+
+    yesterday_on_x = ArtifactQuery(
+        since=date(2026, 3, 1), until=date(2026, 3, 1), llm_name="x", failed=True
+    )
+    assert [e.trace_id for e in store.query(yesterday_on_x)] == ["fail-x"]
+
+    failed_evals = store.query(ArtifactQuery(kind="eval", failed=True))
+    assert [(e.trace_id, e.error_type) for e in failed_evals] == [
+        ("eval-failed", "EvalCaseExecutionError")
+    ]
+    assert failed_evals[0].pass_rate == 0.0
+
+    newest = store.query(ArtifactQuery(kind="run", newest_first=True, limit=1))
+    assert [e.trace_id for e in newest] == ["fail-x-later"]
+
+
+def test_load_eval_artifact_accepts_trace_id_or_legacy_json(tmp_path) -> None:
+    store = ArtifactStore(tmp_path / "store")
+    evaluation = make_eval("eval-1", failed_case=False)
+    store.put(evaluation)
+    store.put(make_run("run-1", day=1, llm_name="x"))
+    legacy = tmp_path / "eval-legacy.json"
+    legacy.write_text(evaluation.model_dump_json(indent=2), encoding="utf-8")
+
+    assert load_eval_artifact(store, "eval-1") == evaluation
+    assert load_eval_artifact(store, str(legacy)) == evaluation
+    with pytest.raises(ValueError, match="not an eval run artifact"):
+        load_eval_artifact(store, "run-1")
+    with pytest.raises(KeyError):
+        load_eval_artifact(store, "missing")
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from app.runner.batch import BatchItem, iter_batch_items
+from app.runner.run_artifact import RunError
+
+
+def test_iter_batch_items_parses_lines_and_keeps_bad_ones_in_place() -> None:
+    lines = [
+        '{"id": "q1", "question": "Quanto vale 2 + 2?"}\n',
+        "\n",
+        "not json\n",
+        '{"text": "Velocidade?", "reference_data": {"g": 10}}\n',
+    ]
+
+    items = list(iter_batch_items(lines))
+
+    assert [index for index, _ in items] == [0, 1, 2]
+    assert items[0][1] == BatchItem(id="q1", question="Quanto vale 2 + 2?")
+    assert isinstance(items[1][1], RunError)
+    assert items[1][1].type == "InvalidBatchItem"
+    third = items[2][1]
+    assert isinstance(third, BatchItem)
+    assert third.question == "Velocidade?"
+    assert third.reference_data == {"g": 10}
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+from app.domain.models.eval import EvalCase
+from app.domain.models.physics import PhysicsSolution
+from app.runner.eval_cache import FileEvalCache
+
+
+def make_case(case_id: str, question_text: str = "Pergunta", expected: float = 10.0) -> EvalCase:
+    return EvalCase.model_validate(
+        {
+            "id": case_id,
+            "source": {"exam": "fuvest", "year": 2024, "phase": 2, "question": "F00a"},
+            "subject": "physics",
+            "topics": ["kinematics"],
+            "difficulty": "easy",
+            "split": "dev",
+            "question_text": question_text,
+            "expected": {"value": expected, "unit": "m/s"},
+            "tolerance": {"abs": 0.1, "rel": 0.01},
+            "reasoning_rubric": ["criterio"],
+        }
+    )
+
+
+SOLUTION = PhysicsSolution(reasoning="logo v = 10 m/s", value=10.0, unit="m/s")
+
+
+def make_cache(root: Path, llm_name: str = "openai/gpt", program: str = "p1") -> FileEvalCache:
+    return FileEvalCache(root, llm_name=llm_name, program_fingerprint=program)
+
+
+def test_cache_round_trips_across_runs_and_ignores_scoring_fields(tmp_path: Path) -> None:
+    make_cache(tmp_path).put(make_case("a"), SOLUTION)
+
+    cache = make_cache(tmp_path)
+    assert cache.get(make_case("a", expected=99.0)) == SOLUTION
+    assert cache.report().hits == 1
+    assert cache.report().misses == []
+
+
+def test_cache_reports_new_cases_as_misses(tmp_path: Path) -> None:
+    make_cache(tmp_path).put(make_case("same"), SOLUTION)
+
+    cache = make_cache(tmp_path)
+    assert cache.get(make_case("new")) is None
+    assert cache.get(make_case("same")) == SOLUTION
+
+    report = cache.report()
+    assert report.hits == 1
+    assert [(m.case_id, m.reason) for m in report.misses] == [("new", "new_case")]
+
+
+def test_cache_miss_reasons(tmp_path: Path) -> None:
+    make_cache(tmp_path).put(make_case("a"), SOLUTION)
+
+    content = make_cache(tmp_path)
+    content.get(make_case("a", question_text="Nova"))
+    program = make_cache(tmp_path, program="p2")
+    program.get(make_case("a"))
+
+    assert content.report().misses[0].reason == "content_changed"
+    assert program.report().misses[0].reason == "program_changed"
+
+
+def test_cache_miss_reasons_are_per_model_and_sample(tmp_path: Path) -> None:
+    # A matrix run sharing one cache root: the other model's entry, written last, must
+    # not stand in for this model's one.
+    make_cache(tmp_path, llm_name="openai/gpt").put(make_case("a"), SOLUTION)
+    make_cache(tmp_path, llm_name="gemini/flash").put(make_case("a", "Nova"), SOLUTION)
+
+    gpt = make_cache(tmp_path, llm_name="openai/gpt")
+    gpt.get(make_case("a", "Nova"))
+    gpt.get(make_case("a"), sample_index=1)
+    fresh = make_cache(tmp_path, llm_name="openai/other")
+    fresh.get(make_case("a"))
+
+    assert [m.reason for m in gpt.report().misses] == ["content_changed", "new_case"]
+    assert [m.reason for m in fresh.report().misses] == ["new_case"]
@@ -0,0 +1,41 @@
+from app.domain.models.eval import EvalCaseScore
+from app.runner.eval_checkpoint import EvalCheckpoint
+
+
+def _score(case_id: str, passed: bool = True) -> EvalCaseScore:
+    return EvalCaseScore(
+        case_id=case_id,
+        result_ok=passed,
+        reasoning_score=1.0,
+        total_score=1.0 if passed else 0.6,
+        passed=passed,
+    )
+
+
+def test_checkpoint_round_trips_case_scores(tmp_path) -> None:
+    checkpoint = EvalCheckpoint(tmp_path / "evals" / "run.checkpoint.jsonl")
+    checkpoint.append(_score("a"))
+    checkpoint.append(_score("b", passed=False))
+
+    completed = checkpoint.load()
+
+    assert list(completed) == ["a", "b"]
+    assert completed["b"].passed is False
+
+
+def test_checkpoint_ignores_torn_last_line(tmp_path) -> None:
+    path = tmp_path / "run.checkpoint.jsonl"
+    checkpoint = EvalCheckpoint(path)
+    checkpoint.append(_score("a"))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"case_id": "b", "result_')
+
+    assert list(checkpoint.load()) == ["a"]
+
+
+def test_checkpoint_keys_repeated_samples_separately(tmp_path) -> None:
+    checkpoint = EvalCheckpoint(tmp_path / "run.checkpoint.jsonl")
+    checkpoint.append(_score("a"))
+    checkpoint.append(_score("a").model_copy(update={"sample_index": 1}))
+
+    assert list(checkpoint.load()) == ["a", "a#1"]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import pytest
+
+from app.application.services.eval_service import summarize
+from app.domain.models.eval import EvalCaseMetrics, EvalCaseScore
+from app.runner.artifact_store import ArtifactIndexEntry
+from app.runner.eval_compare import diff_eval_runs, format_trend
+from app.runner.run_artifact import EvalRunArtifact
+
+
+def make_score(
+    case_id: str, passed: bool, latency_ms: float = 1000.0, tokens: int = 100
+) -> EvalCaseScore:
+    return EvalCaseScore(
+        case_id=case_id,
+        result_ok=passed,
+        reasoning_score=1.0 if passed else 0.0,
+        total_score=1.0 if passed else 0.0,
+        passed=passed,
+        metrics=EvalCaseMetrics(latency_ms=latency_ms, prompt_tokens=tokens),
+    )
+
+
+def make_run(trace_id: str, scores: list[EvalCaseScore]) -> EvalRunArtifact:
+    return EvalRunArtifact(
+        trace_id=trace_id,
+        started_at=datetime(2026, 3, 1, 12, 0, tzinfo=UTC),
+        finished_at=datetime(2026, 3, 1, 12, 1, tzinfo=UTC),
+        duration_ms=60_000,
+        dataset_path="evals/physics/dev.jsonl",
+        run_summary=summarize(scores),
+    )
+
+
+def test_diff_reports_flips_and_deltas() -> None:
+    baseline = make_run(
+        "base",
+        [make_score("a", True), make_score("b", False), make_score("c", True)],
+    )
+    candidate = make_run(
+        "cand",
+        [
+            make_score("a", False, latency_ms=1500.0, tokens=150),
+            make_score("b", True),
+            make_score("c", True),
+            make_score("d", True),
+        ],
+    )
+
+    diff = diff_eval_runs(baseline, candidate)
+
+    assert diff.common_cases == 3
+    assert diff.regressions == ["a"]
+    assert diff.fixes == ["b"]
+    assert diff.only_in_candidate == ["d"]
+    assert [case.result_key for case in diff.changed_cases] == ["a", "b"]
+    regression = diff.changed_cases[0]
+    assert regression.flip == "pass_to_fail"
+    assert regression.score_delta == pytest.approx(-1.0)
+    assert regression.latency_delta_ms == pytest.approx(500.0)
+    assert regression.token_delta == 50
+    assert diff.pass_rate_delta == pytest.approx(0.75 - 2 / 3)
+    assert diff.token_delta == 150
+
+
+def test_diff_does_not_list_cases_with_only_latency_or_token_noise() -> None:
+    baseline = make_run("base", [make_score("a", True), make_score("b", False)])
+    candidate = make_run(
+        "cand",
+        [
+            make_score("a", True, latency_ms=1150.0, tokens=110),
+            make_score("b", False, latency_ms=900.0, tokens=95),
+        ],
+    )
+
+    assert diff_eval_runs(baseline, candidate).changed_cases == []
+    assert [
+        case.result_key
+        for case in diff_eval_runs(baseline, candidate, noise_ratio=0.1).changed_cases
+    ] == ["a"]
+
+
+def test_diff_ignores_latency_of_cached_results() -> None:
+    cached = make_score("a", True)
+    cached.metrics = EvalCaseMetrics(cached=True)
+
+    diff = diff_eval_runs(make_run("base", [make_score("a", True)]), make_run("cand", [cached]))
+
+    assert diff.changed_cases == []
+
+
+def test_format_trend_renders_one_row_per_run() -> None:
+    entries = [
+        ArtifactIndexEntry(
+            trace_id=f"trace-{i}",
+            kind="eval",
+            started_at=datetime(2026, 3, i, tzinfo=UTC),
+            duration_ms=1,
+            llm_name="openai/gpt",
+            pass_rate=pass_rate,
+            latency_p90_ms=1234.4 if i == 1 else None,
+        )
+        for i, pass_rate in ((1, 0.5), (2, 1.0))
+    ]
+
+    header, first, second = format_trend(entries, bar_width=10)
+
+    assert "pass_rate" in header
+    assert first.startswith("2026-03-01T00:00:00") and "0.500" in first and "1234" in first
+    assert first.endswith("#####")
+    assert second.endswith("##########")
@@ -0,0 +1,34 @@
+from app.application.services.eval_service import summarize
+from app.domain.models.eval import EvalCaseMetrics, EvalCaseScore
+from app.runner.eval_matrix import compare_models
+
+
+def make_score(case_id: str, passed: bool, error: str | None = None) -> EvalCaseScore:
+    return EvalCaseScore(
+        case_id=case_id,
+        result_ok=passed,
+        reasoning_score=1.0,
+        total_score=1.0 if passed else 0.6,
+        passed=passed,
+        error=error,
+        metrics=EvalCaseMetrics(latency_ms=100.0, prompt_tokens=50, completion_tokens=10),
+    )
+
+
+def test_compare_models_ranks_by_pass_rate() -> None:
+    summaries = {
+        "openai/gpt-4o-mini": summarize([make_score("a", False), make_score("b", True)]),
+        "gemini/gemini-2.0-flash": summarize([make_score("a", True), make_score("b", True)]),
+        "acme/broken": summarize([make_score("a", False, error="boom"), make_score("b", False)]),
+    }
+
+    rows = compare_models(summaries)
+
+    assert [row.model for row in rows] == [
+        "gemini/gemini-2.0-flash",
+        "openai/gpt-4o-mini",
+        "acme/broken",
+    ]
+    assert rows[0].total_tokens == 120
+    assert rows[0].latency_p90_ms == 100.0
+    assert rows[2].error_cases == 1
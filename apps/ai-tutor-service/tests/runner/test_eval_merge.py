@@ -0,0 +1,104 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from app.application.services.eval_service import summarize
+from app.domain.models.eval import EvalCaseScore
+from app.runner.eval_merge import merge_shard_artifacts, missing_shards
+from app.runner.run_artifact import EvalRunArtifact
+
+
+def make_score(case_id: str, passed: bool, sample_index: int = 0) -> EvalCaseScore:
+    return EvalCaseScore(
+        case_id=case_id,
+        sample_index=sample_index,
+        result_ok=passed,
+        reasoning_score=1.0 if passed else 0.0,
+        total_score=1.0 if passed else 0.0,
+        passed=passed,
+    )
+
+
+def make_shard(
+    spec: str,
+    scores: list[EvalCaseScore],
+    start_minute: int,
+    llm_name: str = "openai/gpt",
+    program_version: str = "v2",
+) -> EvalRunArtifact:
+    return EvalRunArtifact(
+        trace_id=f"trace-{spec[0]}",
+        started_at=datetime(2026, 1, 1, 12, start_minute, tzinfo=UTC),
+        finished_at=datetime(2026, 1, 1, 12, start_minute + 1, tzinfo=UTC),
+        duration_ms=60_000,
+        llm_name=llm_name,
+        program_version=program_version,
+        dataset_path="evals/physics/dev.jsonl",
+        shard=spec,
+        parent_trace_id="parent",
+        run_summary=summarize(scores),
+    )
+
+
+def test_merge_recomputes_aggregates_over_all_cases() -> None:
+    shards = [
+        make_shard("2/2", [make_score("c", False)], start_minute=2),
+        make_shard("1/2", [make_score("a", True), make_score("b", True)], start_minute=0),
+    ]
+
+    merged = merge_shard_artifacts(shards, trace_id="merged")
+
+    assert merged.run_summary.total_cases == 3
+    assert merged.run_summary.pass_rate == pytest.approx(2 / 3)
+    assert [c.case_id for c in merged.run_summary.case_results] == ["a", "b", "c"]
+    assert merged.shard_trace_ids == ["trace-1", "trace-2"]
+    assert merged.parent_trace_id == "parent"
+    assert (merged.llm_name, merged.program_version) == ("openai/gpt", "v2")
+    assert merged.duration_ms == 180_000
+    assert missing_shards(shards) == []
+
+
+def test_merge_rejects_overlapping_shards() -> None:
+    shards = [
+        make_shard("1/2", [make_score("a", True)], start_minute=0),
+        make_shard("2/2", [make_score("a", True)], start_minute=0),
+    ]
+
+    with pytest.raises(ValueError, match="overlap"):
+        merge_shard_artifacts(shards, trace_id="merged")
+
+
+def test_merge_orders_results_by_case_and_sample() -> None:
+    shards = [
+        make_shard("1/2", [make_score("b", True, 1), make_score("a", True, 1)], start_minute=0),
+        make_shard("2/2", [make_score("b", True, 0), make_score("a", False, 0)], start_minute=0),
+    ]
+
+    merged = merge_shard_artifacts(shards, trace_id="merged")
+
+    assert [(c.case_id, c.sample_index) for c in merged.run_summary.case_results] == [
+        ("a", 0),
+        ("a", 1),
+        ("b", 0),
+        ("b", 1),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("other", "message"),
+    [({"llm_name": "gemini/flash"}, "models"), ({"program_version": "v3"}, "programs")],
+)
+def test_merge_rejects_shards_of_different_runs(other: dict[str, str], message: str) -> None:
+    shards = [
+        make_shard("1/2", [make_score("a", True)], start_minute=0),
+        make_shard("2/2", [make_score("b", True)], start_minute=0, **other),
+    ]
+
+    with pytest.raises(ValueError, match=message):
+        merge_shard_artifacts(shards, trace_id="merged")
+
+
+def test_missing_shards_lists_absent_specs() -> None:
+    shards = [make_shard("2/3", [make_score("a", True)], start_minute=0)]
+
+    assert missing_shards(shards) == ["1/3", "3/3"]
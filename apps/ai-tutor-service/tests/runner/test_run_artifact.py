@@ -2,7 +2,11 @@ from __future__ import annotations
 
 from datetime import UTC, datetime
 
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+
 from app.domain.models.physics import PhysicsQuestion, PhysicsSolution
+from app.runner.artifact import artifact_trace_id
 from app.runner.run_artifact import RunArtifact
 
 
@@ -27,3 +31,16 @@ def test_run_artifact_serializes_to_json() -> None:
     assert '"format_version":"run_artifact.v1"' in json_str
     assert '"trace_id":"trace-123"' in json_str
     assert '"agent":"physics_descriptive"' in json_str
+
+
+def test_artifact_trace_id_is_the_span_trace_id() -> None:
+    with TracerProvider().get_tracer(__name__).start_as_current_span("s") as span:
+        assert artifact_trace_id(span) == format(span.get_span_context().trace_id, "032x")
+
+
+def test_artifact_trace_id_is_unique_without_tracing() -> None:
+    tracer = trace.NoOpTracer()
+    with tracer.start_as_current_span("a") as first, tracer.start_as_current_span("b") as second:
+        ids = {artifact_trace_id(first), artifact_trace_id(second)}
+    assert len(ids) == 2
+    assert "0" * 32 not in ids
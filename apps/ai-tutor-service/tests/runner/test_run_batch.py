@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+
+from app.core.settings import get_runtime_settings
+from app.data.dspy import dspy_config
+from app.runner import run_batch as run_batch_module
+from app.runner.artifact_store import ArtifactStore
+from app.runner.batch import BatchResult
+
+
+def test_run_batch_with_a_cassette_writes_an_artifact_and_result_per_item(
+    tmp_path, monkeypatch, capsys
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    # Replaying needs none of the secrets.
+    for name in ("LLM_API_KEY", "PHOENIX_COLLECTOR_ENDPOINT", "TUTOR_API_KEY"):
+        monkeypatch.delenv(name, raising=False)
+    get_runtime_settings.cache_clear()
+    monkeypatch.setattr(dspy_config, "_configured", False)
+    monkeypatch.setattr(run_batch_module, "init_observability", lambda: None)
+    monkeypatch.setattr(run_batch_module, "default_artifacts_dir", lambda: tmp_path / "runs")
+    input_path = tmp_path / "items.jsonl"
+    input_path.write_text(
+        "".join(
+            json.dumps({"id": item_id, "question": f"Pergunta {item_id}?"}) + "\n"
+            for item_id in ("q1", "q2")
+        ),
+        encoding="utf-8",
+    )
+
+    # Nothing recorded: every item misses the cassette, and each must still get its
+    # artifact and NDJSON line (copying the cassette LM per item must not fail).
+    result = run_batch_module.run_batch(
+        agent="physics_descriptive",
+        input_path=input_path,
+        offline=False,
+        concurrency=2,
+        cassette=tmp_path / "empty.jsonl.gz",
+        cassette_mode="replay",
+    )
+    get_runtime_settings.cache_clear()
+
+    results = [
+        BatchResult.model_validate_json(line) for line in capsys.readouterr().out.splitlines()
+    ]
+    assert result == 1
+    assert sorted((r.index, r.id) for r in results) == [(0, "q1"), (1, "q2")]
+    assert all(not r.ok and r.error is not None and r.trace_id for r in results)
+    # Tracing is not set up here; each item must still get its own artifact id.
+    assert len({r.trace_id for r in results}) == 2
+    stored = ArtifactStore(tmp_path / "runs").query()
+    assert sorted(entry.trace_id for entry in stored) == sorted(r.trace_id for r in results)
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+from datetime import UTC, datetime
 from pathlib import Path
 from types import SimpleNamespace
 
-from app.domain.models.eval import EvalCaseScore, EvalRunSummary
+from app.domain.models.eval import EvalCacheReport, EvalCaseScore, EvalRunSummary
 from app.runner import run_eval as run_eval_module
+from app.runner.artifact_store import ArtifactStore
+from app.runner.run_artifact import EvalRunArtifact
 
 
 class _FakeSpan:
@@ -20,7 +23,7 @@ class _FakeSpan:
         return None
 
     def get_span_context(self):
-        return SimpleNamespace(trace_id=123)
+        return SimpleNamespace(trace_id=123, is_valid=True)
 
     def set_attribute(self, key, value) -> None:
         self.attributes[str(key)] = value
@@ -84,12 +87,14 @@ def test_run_eval_returns_error_when_case_level_errors_exist(tmp_path, monkeypat
 
     monkeypatch.setattr(run_eval_module, "init_observability", lambda: None)
     monkeypatch.setattr(run_eval_module.trace, "get_tracer", lambda _name: _FakeTracer(span))
-    monkeypatch.setattr(run_eval_module, "load_cases", lambda dataset_path, max_cases: [object()])
-    monkeypatch.setattr(run_eval_module, "setup_llm", lambda offline: "gemini/gemini-2.0-flash")
+    monkeypatch.setattr(run_eval_module, "load_cases", lambda dataset_path, **_: [object()])
+    monkeypatch.setattr(
+        run_eval_module, "setup_llm", lambda offline, **_: "gemini/gemini-2.0-flash"
+    )
     monkeypatch.setattr(run_eval_module, "default_artifacts_dir", lambda: Path(tmp_path))
 
     class _FakeEvalService:
-        def __init__(self, cases, solver) -> None:
+        def __init__(self, cases, solver, **_options) -> None:
             self._cases = cases
             self._solver = solver
 
@@ -97,7 +102,8 @@ def test_run_eval_returns_error_when_case_level_errors_exist(tmp_path, monkeypat
             return await asyncio.to_thread(_summary_with_errors, error_cases=1)
 
     monkeypatch.setattr(run_eval_module, "EvalService", _FakeEvalService)
-    monkeypatch.setattr(run_eval_module, "PhysicsAgent", lambda: object())
+    monkeypatch.setattr(run_eval_module, "PhysicsAgent", lambda **_: object())
+    monkeypatch.setattr(run_eval_module, "load_configured_program", lambda agents, offline: "base")
 
     result = run_eval_module.run_eval(
         dataset=str(dataset_path),
@@ -118,20 +124,23 @@ def test_run_eval_returns_ok_when_no_case_level_errors(tmp_path, monkeypatch) ->
 
     monkeypatch.setattr(run_eval_module, "init_observability", lambda: None)
     monkeypatch.setattr(run_eval_module.trace, "get_tracer", lambda _name: _FakeTracer(span))
-    monkeypatch.setattr(run_eval_module, "load_cases", lambda dataset_path, max_cases: [object()])
-    monkeypatch.setattr(run_eval_module, "setup_llm", lambda offline: "gemini/gemini-2.0-flash")
+    monkeypatch.setattr(run_eval_module, "load_cases", lambda dataset_path, **_: [object()])
+    monkeypatch.setattr(
+        run_eval_module, "setup_llm", lambda offline, **_: "gemini/gemini-2.0-flash"
+    )
     monkeypatch.setattr(run_eval_module, "default_artifacts_dir", lambda: Path(tmp_path))
 
     class _FakeEvalService:
-        def __init__(self, cases, solver) -> None:
+        def __init__(self, cases, solver, **_options) -> None:
             self._cases = cases
             self._solver = solver
 
         async def run(self) -> EvalRunSummary:
             return await asyncio.to_thread(_summary_with_errors, error_cases=0)
-    
+
     monkeypatch.setattr(run_eval_module, "EvalService", _FakeEvalService)
-    monkeypatch.setattr(run_eval_module, "PhysicsAgent", lambda: object())
+    monkeypatch.setattr(run_eval_module, "PhysicsAgent", lambda **_: object())
+    monkeypatch.setattr(run_eval_module, "load_configured_program", lambda agents, offline: "base")
 
     result = run_eval_module.run_eval(
         dataset=str(dataset_path),
@@ -142,3 +151,69 @@ def test_run_eval_returns_ok_when_no_case_level_errors(tmp_path, monkeypatch) ->
 
     assert result == 0
     assert span.attributes["eval.error_cases"] == 0
+
+
+def test_run_eval_resume_without_checkpoint_fails(tmp_path, monkeypatch) -> None:
+    span = _FakeSpan()
+    span.record_exception = lambda _exc: None  # type: ignore[method-assign]
+
+    monkeypatch.setattr(run_eval_module, "init_observability", lambda: None)
+    monkeypatch.setattr(run_eval_module.trace, "get_tracer", lambda _name: _FakeTracer(span))
+    monkeypatch.setattr(
+        run_eval_module, "setup_llm", lambda offline, **_: "gemini/gemini-2.0-flash"
+    )
+    monkeypatch.setattr(run_eval_module, "default_artifacts_dir", lambda: Path(tmp_path))
+
+    result = run_eval_module.run_eval(
+        dataset=str(tmp_path / "dataset.jsonl"),
+        max_cases=None,
+        offline=False,
+        print_output=False,
+        resume="missing-trace",
+    )
+
+    assert result == 1
+    assert span.attributes["error.type"] == "FileNotFoundError"
+
+
+def test_rescore_eval_keeps_only_what_describes_the_predictions(tmp_path, monkeypatch) -> None:
+    span = _FakeSpan()
+    dataset_path = tmp_path / "dataset.jsonl"
+    dataset_path.write_text("", encoding="utf-8")
+    monkeypatch.setattr(run_eval_module, "init_observability", lambda: None)
+    monkeypatch.setattr(run_eval_module.trace, "get_tracer", lambda _name: _FakeTracer(span))
+    monkeypatch.setattr(run_eval_module, "default_artifacts_dir", lambda: Path(tmp_path))
+    store = ArtifactStore(tmp_path)
+    store.put(
+        EvalRunArtifact(
+            trace_id="previous",
+            started_at=datetime(2026, 3, 1, 9, 0, tzinfo=UTC),
+            finished_at=datetime(2026, 3, 1, 9, 1, tzinfo=UTC),
+            duration_ms=60_000,
+            llm_name="openai/gpt",
+            program_version="v2",
+            dataset_path=str(dataset_path),
+            resumed_from="older",
+            shard="1/2",
+            parent_trace_id="parent",
+            shard_trace_ids=["s1", "s2"],
+            cache_report=EvalCacheReport(hits=3),
+            profile_path="profiles/previous.prof",
+            run_summary=_summary_with_errors(error_cases=0),
+        )
+    )
+
+    result = run_eval_module.rescore_eval(artifact_ref="previous", dataset=None, print_output=False)
+
+    assert result == 0
+    rescored = store.get(format(123, "032x"))
+    assert isinstance(rescored, EvalRunArtifact)
+    assert (rescored.llm_name, rescored.program_version, rescored.rescored_from) == (
+        "openai/gpt",
+        "v2",
+        "previous",
+    )
+    assert rescored.cache_report is None
+    assert rescored.profile_path is None
+    assert (rescored.resumed_from, rescored.shard, rescored.parent_trace_id) == (None,) * 3
+    assert rescored.shard_trace_ids == []